@@ -0,0 +1,182 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Forced-alignment tokens held as parallel arrays.
+
+A long file yields hundreds of thousands of aligned tokens. Keeping them as
+NumPy start/end arrays plus one text buffer (instead of an object per token)
+keeps chunk merging and sentence building cheap; JSON-ready dicts are only
+built at the protocol edge.
+"""
+
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Set
+
+import numpy as np
+
+SEGMENT_PUNCT = set("，。！？；：、,.!?;:…")
+
+
+def _float(value: Any, default: float) -> float:
+    try:
+        return float(value)
+    except Exception:
+        return default
+
+
+def _norm_char(ch: str) -> str:
+    if "A" <= ch <= "Z":
+        return ch.lower()
+    return ch
+
+
+class Alignment:
+    """Aligned tokens; token ``i`` spans ``starts[i]``..``ends[i]`` seconds and
+    its text is ``text[offsets[i]:offsets[i + 1]]``."""
+
+    __slots__ = ("starts", "ends", "offsets", "text")
+
+    def __init__(
+        self, starts: np.ndarray, ends: np.ndarray, offsets: np.ndarray, text: str
+    ) -> None:
+        self.starts = starts
+        self.ends = ends
+        self.offsets = offsets
+        self.text = text
+
+    @classmethod
+    def empty(cls) -> "Alignment":
+        return cls(
+            np.zeros(0, dtype=np.float64),
+            np.zeros(0, dtype=np.float64),
+            np.zeros(1, dtype=np.int64),
+            "",
+        )
+
+    @classmethod
+    def from_items(cls, items: Optional[Iterable[Any]]) -> "Alignment":
+        """Build from aligner output: dicts or objects with start/end times and text."""
+        starts: List[float] = []
+        ends: List[float] = []
+        texts: List[str] = []
+        for item in items or []:
+            if isinstance(item, dict):
+                start = item.get("start_time", item.get("start", 0.0))
+                end = item.get("end_time", item.get("end", start))
+                text = item.get("text", "")
+            else:
+                start = getattr(item, "start_time", getattr(item, "start", 0.0))
+                end = getattr(item, "end_time", getattr(item, "end", start))
+                text = getattr(item, "text", "")
+            start_value = _float(start, 0.0)
+            starts.append(start_value)
+            ends.append(_float(end, start_value))
+            texts.append(str(text or ""))
+        offsets = np.zeros(len(texts) + 1, dtype=np.int64)
+        np.cumsum([len(text) for text in texts], out=offsets[1:])
+        return cls(
+            np.asarray(starts, dtype=np.float64),
+            np.asarray(ends, dtype=np.float64),
+            offsets,
+            "".join(texts),
+        )
+
+    @classmethod
+    def concat(cls, parts: Sequence["Alignment"]) -> "Alignment":
+        parts = [part for part in parts if len(part)]
+        if not parts:
+            return cls.empty()
+        if len(parts) == 1:
+            return parts[0]
+        offsets = [parts[0].offsets]
+        base = int(parts[0].offsets[-1])
+        for part in parts[1:]:
+            offsets.append(part.offsets[1:] + base)
+            base += int(part.offsets[-1])
+        return cls(
+            np.concatenate([part.starts for part in parts]),
+            np.concatenate([part.ends for part in parts]),
+            np.concatenate(offsets),
+            "".join(part.text for part in parts),
+        )
+
+    def __len__(self) -> int:
+        return len(self.starts)
+
+    def token(self, index: int) -> str:
+        return self.text[self.offsets[index] : self.offsets[index + 1]]
+
+    def shifted(self, seconds: float) -> "Alignment":
+        if not seconds:
+            return self
+        return Alignment(self.starts + seconds, self.ends + seconds, self.offsets, self.text)
+
+    def to_items(self) -> List[Dict[str, Any]]:
+        """Raw aligner-style items, as stored in checkpoints."""
+        return [
+            {"start_time": start, "end_time": end, "text": self.token(i)}
+            for i, (start, end) in enumerate(zip(self.starts.tolist(), self.ends.tolist()))
+        ]
+
+    def to_list(self) -> List[Dict[str, Any]]:
+        """Protocol items with ``start``/``end``/``text``/``time_stamps``."""
+        return [
+            {"start": start, "end": end, "text": self.token(i), "time_stamps": [start, end]}
+            for i, (start, end) in enumerate(zip(self.starts.tolist(), self.ends.tolist()))
+        ]
+
+    def _boundary_tokens(self, asr_text: str) -> Set[int]:
+        """Tokens whose last character is followed by punctuation in ``asr_text``."""
+        asr_clean: List[str] = []
+        punct_positions = set()
+        for ch in asr_text:
+            if ch.isspace():
+                continue
+            if ch in SEGMENT_PUNCT:
+                if asr_clean:
+                    punct_positions.add(len(asr_clean) - 1)
+                continue
+            asr_clean.append(_norm_char(ch))
+
+        kept = [
+            pos
+            for pos, ch in enumerate(self.text)
+            if not ch.isspace() and ch not in SEGMENT_PUNCT
+        ]
+        char_token = np.searchsorted(self.offsets, kept, side="right") - 1
+
+        boundaries: Set[int] = set()
+        asr_idx = 0
+        for pos, token_idx in zip(kept, char_token.tolist()):
+            ch = _norm_char(self.text[pos])
+            while asr_idx < len(asr_clean) and asr_clean[asr_idx] != ch:
+                asr_idx += 1
+            if asr_idx >= len(asr_clean):
+                break
+            if asr_idx in punct_positions:
+                boundaries.add(token_idx)
+            asr_idx += 1
+        return boundaries
+
+    def sentence_segments(self, asr_text: str) -> List[Dict[str, Any]]:
+        """Group tokens into sentences at the punctuation of ``asr_text``."""
+        count = len(self)
+        if not count:
+            return []
+        ends = sorted(self._boundary_tokens(asr_text))
+        if not ends or ends[-1] != count - 1:
+            ends.append(count - 1)
+        starts = self.starts.tolist()
+        stops = self.ends.tolist()
+        offsets = self.offsets.tolist()
+        segments: List[Dict[str, Any]] = []
+        first = 0
+        for last in ends:
+            text = self.text[offsets[first] : offsets[last + 1]].strip()
+            if text:
+                start, end = starts[first], stops[last]
+                segments.append(
+                    {"start": start, "end": end, "text": text, "time_stamps": [start, end]}
+                )
+            first = last + 1
+        return segments
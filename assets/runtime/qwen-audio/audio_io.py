@@ -0,0 +1,507 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Audio decoding helpers shared by the STT backends.
+
+Everything here works on mono float32 NumPy buffers at the model sample rate so
+the models can be fed sample slices directly instead of re-decoding files.
+libsndfile reads the formats it knows in-process; any other container is
+streamed as raw PCM through an ffmpeg pipe.
+"""
+
+import math
+import os
+import queue
+import re
+import shutil
+import subprocess
+import threading
+from contextlib import contextmanager
+from typing import Any, BinaryIO, Callable, Iterable, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+ASR_SAMPLE_RATE = 16000
+DEFAULT_BLOCK_FRAMES = 65536
+# Decoded blocks an ffmpeg pipe may run ahead of the consumer.
+FFMPEG_PREFETCH_BLOCKS = 4
+
+
+def to_mono_float32(data: np.ndarray) -> np.ndarray:
+    """Downmix ``(frames, channels)`` audio to a 1-D float32 buffer."""
+    data = np.asarray(data)
+    if data.ndim > 1:
+        data = data.mean(axis=1, dtype=np.float32) if data.shape[1] > 1 else data[:, 0]
+    return data.astype(np.float32, copy=False)
+
+
+def _design_lowpass(sr_in: int, sr_out: int) -> np.ndarray:
+    # Hann-windowed sinc with the cutoff just below the output Nyquist rate.
+    cutoff = 0.5 * sr_out / float(sr_in) * 0.95
+    half = int(math.ceil(8.0 * sr_in / float(sr_out)))
+    n = np.arange(-half, half + 1, dtype=np.float64)
+    taps = 2.0 * cutoff * np.sinc(2.0 * cutoff * n) * np.hanning(2 * half + 1)
+    return (taps / taps.sum()).astype(np.float32)
+
+
+class Resampler:
+    """Streaming band-limited resampler.
+
+    Input is low-pass filtered (when downsampling) and then linearly
+    interpolated at the output instants. Feeding a signal in blocks produces
+    exactly the same samples as feeding it in one call, so windows read from a
+    stream line up without seams.
+    """
+
+    def __init__(self, sr_in: int, sr_out: int) -> None:
+        self.sr_in = int(sr_in)
+        self.sr_out = int(sr_out)
+        self._step = self.sr_in / float(self.sr_out)
+        self._taps: Optional[np.ndarray] = None
+        self._half = 0
+        if self.sr_out < self.sr_in:
+            self._taps = _design_lowpass(self.sr_in, self.sr_out)
+            self._half = (len(self._taps) - 1) // 2
+        self._history = np.zeros(2 * self._half, dtype=np.float32)
+        self._filtered = np.zeros(0, dtype=np.float32)
+        # Input sample index of self._filtered[0].
+        self._filtered_start = -self._half
+        self._consumed = 0
+        self._next_out = 0
+        self._flushed = False
+
+    @property
+    def passthrough(self) -> bool:
+        return self.sr_in == self.sr_out
+
+    def process(self, block: np.ndarray) -> np.ndarray:
+        block = np.asarray(block, dtype=np.float32)
+        if self.passthrough:
+            return block
+        if self._flushed:
+            raise RuntimeError("resampler already flushed")
+        self._consumed += len(block)
+        self._append_filtered(block)
+        # The interpolation needs the sample after each output instant.
+        return self._emit(self._filtered_start + len(self._filtered) - 2)
+
+    def flush(self) -> np.ndarray:
+        if self.passthrough or self._flushed:
+            return np.zeros(0, dtype=np.float32)
+        self._flushed = True
+        if self._half:
+            self._append_filtered(np.zeros(self._half, dtype=np.float32))
+        return self._emit(self._consumed - 1)
+
+    def _append_filtered(self, block: np.ndarray) -> None:
+        if self._taps is None:
+            filtered = block
+        else:
+            padded = np.concatenate([self._history, block])
+            filtered = np.convolve(padded, self._taps, mode="valid").astype(
+                np.float32, copy=False
+            )
+            self._history = padded[len(padded) - 2 * self._half :]
+        self._filtered = np.concatenate([self._filtered, filtered])
+
+    def _emit(self, last_instant: float) -> np.ndarray:
+        if last_instant < 0 or not len(self._filtered):
+            return np.zeros(0, dtype=np.float32)
+        end = int(math.floor(last_instant / self._step)) + 1
+        if end <= self._next_out:
+            return np.zeros(0, dtype=np.float32)
+
+        positions = np.arange(self._next_out, end, dtype=np.float64) * self._step
+        positions -= self._filtered_start
+        lower = np.floor(positions).astype(np.int64)
+        frac = (positions - lower).astype(np.float32)
+        upper = np.minimum(lower + 1, len(self._filtered) - 1)
+        out = self._filtered[lower] * (1.0 - frac) + self._filtered[upper] * frac
+        self._next_out = end
+
+        drop = int(math.floor(end * self._step)) - self._filtered_start
+        drop = max(0, min(drop, len(self._filtered) - 1))
+        if drop:
+            self._filtered = self._filtered[drop:]
+            self._filtered_start += drop
+        return out.astype(np.float32, copy=False)
+
+
+def resample(samples: np.ndarray, sr_in: int, sr_out: int) -> np.ndarray:
+    resampler = Resampler(sr_in, sr_out)
+    if resampler.passthrough:
+        return np.asarray(samples, dtype=np.float32)
+    return np.concatenate([resampler.process(samples), resampler.flush()])
+
+
+def resampled_length(frames: int, sr_in: int, sr_out: int) -> int:
+    """Number of samples :class:`Resampler` produces for ``frames`` inputs."""
+    if frames <= 0:
+        return 0
+    if sr_in == sr_out:
+        return frames
+    return int(math.floor((frames - 1) * sr_out / float(sr_in))) + 1
+
+
+class StreamingAudioReader:
+    """Read an audio file block by block as mono float32 at ``sample_rate``.
+
+    Only one block of the source file is decoded at a time, so memory use does
+    not depend on the length of the recording. With an ``opener`` the file is
+    read through the binary file objects it returns instead of by path (e.g.
+    a download still in progress).
+    """
+
+    def __init__(
+        self,
+        path: str,
+        sample_rate: int = ASR_SAMPLE_RATE,
+        block_frames: int = DEFAULT_BLOCK_FRAMES,
+        opener: Optional[Callable[[], BinaryIO]] = None,
+    ) -> None:
+        self.path = path
+        self._opener = opener
+        with self._open() as src:
+            samplerate, frames = src.samplerate, src.frames
+        self.sample_rate = int(sample_rate)
+        self.native_rate = int(samplerate)
+        self.source_rate = self.native_rate
+        self.frames = int(frames)
+        self.block_frames = int(block_frames)
+        self.total_samples = resampled_length(
+            self.frames, self.native_rate, self.sample_rate
+        )
+        self.duration = self.frames / float(self.native_rate) if self.native_rate else 0.0
+
+    @contextmanager
+    def _open(self) -> Iterator[Any]:
+        import soundfile as sf  # type: ignore
+
+        if self._opener is None:
+            with sf.SoundFile(self.path) as src:
+                yield src
+            return
+        # soundfile leaves file objects open; close ours with the sound file.
+        with self._opener() as raw, sf.SoundFile(raw) as src:
+            yield src
+
+    def read_segment(self, start: int, count: int) -> np.ndarray:
+        """Decode ``count`` samples from sample ``start`` without reading the rest."""
+        ratio = self.native_rate / float(self.sample_rate)
+        first = min(self.frames, int(start * ratio))
+        frames = min(self.frames - first, int(math.ceil(count * ratio)) + 1)
+        if frames <= 0:
+            return np.zeros(0, dtype=np.float32)
+        with self._open() as src:
+            src.seek(first)
+            data = src.read(frames, dtype="float32", always_2d=True)
+        return resample(to_mono_float32(data), self.native_rate, self.sample_rate)[:count]
+
+    def blocks(self) -> Iterator[np.ndarray]:
+        resampler = Resampler(self.native_rate, self.sample_rate)
+        with self._open() as src:
+            for block in src.blocks(
+                blocksize=self.block_frames, dtype="float32", always_2d=True
+            ):
+                out = resampler.process(to_mono_float32(block))
+                if len(out):
+                    yield out
+        tail = resampler.flush()
+        if len(tail):
+            yield tail
+
+
+def ffmpeg_binary() -> Optional[str]:
+    """ffmpeg executable: QWEN_ASR_FFMPEG, then FFMPEG_PATH, then PATH."""
+    for name in ("QWEN_ASR_FFMPEG", "FFMPEG_PATH"):
+        value = os.environ.get(name, "").strip()
+        if value:
+            return value
+    return shutil.which("ffmpeg")
+
+
+_DURATION_RE = re.compile(r"Duration:\s*(\d+):(\d+):(\d+(?:\.\d+)?)")
+_AUDIO_RATE_RE = re.compile(r"Stream #.*?Audio:.*?(\d+) Hz")
+
+
+def _ffmpeg_probe(ffmpeg: str, path: str) -> Tuple[Optional[float], int]:
+    """``(duration or None, native rate)`` from the banner ``ffmpeg -i`` prints."""
+    # Without an output ffmpeg only describes the input (and exits non-zero).
+    proc = subprocess.run(
+        [ffmpeg, "-hide_banner", "-nostdin", "-i", path],
+        stdin=subprocess.DEVNULL,
+        capture_output=True,
+        timeout=60,
+    )
+    banner = proc.stderr.decode("utf-8", errors="replace")
+    rate = _AUDIO_RATE_RE.search(banner)
+    if rate is None:
+        detail = banner.strip().splitlines()[-1:] or ["no output"]
+        raise RuntimeError(f"ffmpeg found no audio stream in {path}: {detail[0]}")
+    duration = None
+    found = _DURATION_RE.search(banner)
+    if found is not None:
+        hours, minutes, seconds = found.groups()
+        duration = int(hours) * 3600 + int(minutes) * 60 + float(seconds)
+    return duration, int(rate.group(1))
+
+
+class FFmpegAudioReader:
+    """:class:`StreamingAudioReader` for containers libsndfile cannot open.
+
+    ffmpeg decodes, downmixes and resamples to ``sample_rate`` and writes raw
+    float32 PCM to a pipe; nothing is written to disk. A reader thread keeps
+    up to ``FFMPEG_PREFETCH_BLOCKS`` blocks decoded ahead of the consumer, so
+    decoding overlaps inference while memory stays bounded.
+
+    Streams that do not record their length (e.g. browser WebM) report a
+    ``total_samples`` and ``duration`` of 0.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        sample_rate: int = ASR_SAMPLE_RATE,
+        block_frames: int = DEFAULT_BLOCK_FRAMES,
+        ffmpeg: Optional[str] = None,
+    ) -> None:
+        ffmpeg = ffmpeg or ffmpeg_binary()
+        if not ffmpeg:
+            raise RuntimeError(f"ffmpeg is required to decode {path}")
+        duration, native_rate = _ffmpeg_probe(ffmpeg, path)
+        self.ffmpeg = ffmpeg
+        self.path = path
+        self.sample_rate = int(sample_rate)
+        self.native_rate = native_rate
+        self.source_rate = native_rate
+        self.frames = int(round((duration or 0.0) * native_rate))
+        self.block_frames = int(block_frames)
+        self.total_samples = resampled_length(
+            self.frames, self.native_rate, self.sample_rate
+        )
+        self.duration = duration or 0.0
+
+    def _command(
+        self, start_sec: Optional[float] = None, length_sec: Optional[float] = None
+    ) -> List[str]:
+        cmd = [self.ffmpeg, "-hide_banner", "-nostdin", "-v", "error"]
+        if start_sec is not None:
+            cmd += ["-ss", f"{start_sec:.6f}"]
+        cmd += ["-i", self.path, "-vn"]
+        if length_sec is not None:
+            cmd += ["-t", f"{length_sec:.6f}"]
+        cmd += ["-f", "f32le", "-acodec", "pcm_f32le", "-ac", "1"]
+        cmd += ["-ar", str(self.sample_rate), "-"]
+        return cmd
+
+    def read_segment(self, start: int, count: int) -> np.ndarray:
+        """Decode ``count`` samples from sample ``start`` by seeking in ffmpeg."""
+        if count <= 0:
+            return np.zeros(0, dtype=np.float32)
+        proc = subprocess.run(
+            self._command(start / float(self.sample_rate), count / float(self.sample_rate)),
+            stdin=subprocess.DEVNULL,
+            capture_output=True,
+        )
+        if proc.returncode != 0:
+            raise RuntimeError(
+                f"ffmpeg failed to decode {self.path}: {_ffmpeg_error(proc.stderr)}"
+            )
+        data = proc.stdout[: len(proc.stdout) // 4 * 4]
+        return np.frombuffer(data, dtype="<f4").astype(np.float32)[:count]
+
+    def blocks(self) -> Iterator[np.ndarray]:
+        block_bytes = self.block_frames * 4
+        proc = subprocess.Popen(
+            self._command(),
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+        )
+        pending: "queue.Queue[Optional[bytes]]" = queue.Queue(maxsize=FFMPEG_PREFETCH_BLOCKS)
+
+        def _pump() -> None:
+            try:
+                assert proc.stdout is not None
+                while True:
+                    data = proc.stdout.read(block_bytes)
+                    if not data:
+                        break
+                    pending.put(data)
+            finally:
+                pending.put(None)
+
+        pump = threading.Thread(target=_pump, name="ffmpeg-pcm", daemon=True)
+        pump.start()
+        finished = False
+        try:
+            carry = b""
+            while True:
+                data = pending.get()
+                if data is None:
+                    break
+                data = carry + data
+                usable = len(data) // 4 * 4
+                carry = data[usable:]
+                if usable:
+                    yield np.frombuffer(data[:usable], dtype="<f4").astype(np.float32)
+            finished = True
+        finally:
+            if not finished and proc.poll() is None:
+                # The consumer stopped early; do not decode the rest.
+                proc.kill()
+            # Unblock the pump if it is waiting on a full queue.
+            while pump.is_alive():
+                try:
+                    pending.get(timeout=0.1)
+                except queue.Empty:
+                    pass
+            proc.wait()
+            stderr = proc.stderr.read() if proc.stderr is not None else b""
+            for stream in (proc.stdout, proc.stderr):
+                if stream is not None:
+                    stream.close()
+        if proc.returncode != 0:
+            raise RuntimeError(
+                f"ffmpeg failed to decode {self.path}: {_ffmpeg_error(stderr)}"
+            )
+
+
+def _ffmpeg_error(stderr: bytes) -> str:
+    lines = stderr.decode("utf-8", errors="replace").strip().splitlines()
+    return lines[-1] if lines else "no output"
+
+
+def libsndfile_can_read(path: str) -> bool:
+    """Whether soundfile opens ``path`` itself, without ffmpeg."""
+    import soundfile as sf  # type: ignore
+
+    try:
+        sf.info(path)
+    except Exception:
+        return False
+    return True
+
+
+def open_audio_reader(
+    path: str,
+    sample_rate: int = ASR_SAMPLE_RATE,
+    block_frames: int = DEFAULT_BLOCK_FRAMES,
+    stream: Any = None,
+) -> Any:
+    """Streaming reader for ``path``: libsndfile where it can, ffmpeg otherwise.
+
+    WAV, FLAC, OGG and (recent libsndfile) MP3 are read in-process; containers
+    such as M4A/AAC, WebM/Opus and video files go through an ffmpeg pipe.
+
+    ``stream`` is a file still being written, with ``done``, ``open()`` and
+    ``wait()`` (see ``downloads.Download``): libsndfile formats are decoded
+    while it grows, anything else once it is complete.
+    """
+    if stream is not None and not stream.done:
+        try:
+            return StreamingAudioReader(path, sample_rate, block_frames, opener=stream.open)
+        except Exception:
+            stream.wait()
+    try:
+        return StreamingAudioReader(path, sample_rate, block_frames)
+    except Exception as exc:
+        ffmpeg = ffmpeg_binary()
+        if not ffmpeg:
+            raise RuntimeError(
+                f"cannot decode {path} ({exc}); install ffmpeg or set QWEN_ASR_FFMPEG"
+            ) from exc
+        return FFmpegAudioReader(path, sample_rate, block_frames, ffmpeg=ffmpeg)
+
+
+class ArrayAudioReader:
+    """:class:`StreamingAudioReader` over samples already in memory.
+
+    ``samples`` is mono audio at ``native_rate``; blocks and segments are
+    resampled to ``sample_rate`` on the fly. ``source_rate`` is the rate of
+    the original input when the samples were already resampled from it.
+    """
+
+    path: Optional[str] = None
+
+    def __init__(
+        self,
+        samples: np.ndarray,
+        native_rate: int,
+        sample_rate: int = ASR_SAMPLE_RATE,
+        block_frames: int = DEFAULT_BLOCK_FRAMES,
+        source_rate: Optional[int] = None,
+    ) -> None:
+        self.samples = np.asarray(samples, dtype=np.float32)
+        self.sample_rate = int(sample_rate)
+        self.native_rate = int(native_rate)
+        self.source_rate = int(source_rate or native_rate)
+        self.frames = len(self.samples)
+        self.block_frames = int(block_frames)
+        self.total_samples = resampled_length(
+            self.frames, self.native_rate, self.sample_rate
+        )
+        self.duration = self.frames / float(self.native_rate) if self.native_rate else 0.0
+
+    def read_segment(self, start: int, count: int) -> np.ndarray:
+        ratio = self.native_rate / float(self.sample_rate)
+        first = min(self.frames, int(start * ratio))
+        data = self.samples[first : first + int(math.ceil(count * ratio)) + 1]
+        return resample(data, self.native_rate, self.sample_rate)[:count]
+
+    def blocks(self) -> Iterator[np.ndarray]:
+        resampler = Resampler(self.native_rate, self.sample_rate)
+        for start in range(0, self.frames, self.block_frames):
+            out = resampler.process(self.samples[start : start + self.block_frames])
+            if len(out):
+                yield out
+        tail = resampler.flush()
+        if len(tail):
+            yield tail
+
+
+class AudioWindow:
+    """Sliding window over a stream of sample blocks.
+
+    ``read(start, end)`` returns samples by absolute index and ``release(pos)``
+    discards everything before ``pos``; callers may only move forward, except
+    within the samples that are still held.
+    """
+
+    def __init__(self, blocks: Iterable[np.ndarray]) -> None:
+        self._blocks = iter(blocks)
+        self._buffer = np.zeros(0, dtype=np.float32)
+        self._buffer_start = 0
+        self.exhausted = False
+
+    @property
+    def available_end(self) -> int:
+        return self._buffer_start + len(self._buffer)
+
+    def _fill(self, end: int) -> None:
+        pending: List[np.ndarray] = []
+        available = self.available_end
+        while available < end and not self.exhausted:
+            try:
+                block = next(self._blocks)
+            except StopIteration:
+                self.exhausted = True
+                break
+            pending.append(block)
+            available += len(block)
+        if pending:
+            self._buffer = np.concatenate([self._buffer, *pending])
+
+    def read(self, start: int, end: int) -> np.ndarray:
+        if start < self._buffer_start:
+            raise ValueError(f"samples before {self._buffer_start} were released")
+        self._fill(end)
+        return self._buffer[start - self._buffer_start : end - self._buffer_start]
+
+    def release(self, position: int) -> None:
+        drop = min(max(0, position - self._buffer_start), len(self._buffer))
+        if drop:
+            # Copy so the released prefix can actually be freed.
+            self._buffer = self._buffer[drop:].copy()
+            self._buffer_start += drop
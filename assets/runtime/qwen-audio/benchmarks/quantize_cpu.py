@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+CPU benchmark: fp32 vs int8-dynamic Qwen3-ASR on one fixed clip.
+
+    python benchmarks/quantize_cpu.py --audio clip.wav --reference "the text"
+
+Each mode loads the model on CPU, transcribes the clip once to warm up and
+then ``--runs`` more times. One JSON line per mode reports the load time,
+median latency, real-time factor and word error rate against the
+reference. Without a reference the fp32 transcript is used, which measures
+how much quantization changes the output. CJK text is scored per character.
+"""
+
+import argparse
+import json
+import statistics
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+RUNTIME_DIR = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(RUNTIME_DIR))
+
+from config import DEFAULT_MAX_NEW_TOKENS, DEFAULT_QWEN_MODEL  # noqa: E402
+from quantization import INT8_DYNAMIC  # noqa: E402
+from textutil import tokenize  # noqa: E402
+
+_PUNCT = set("，。！？；：、,.!?;:…\"'“”‘’()（）")
+
+
+def _words(text: str) -> List[str]:
+    words = (
+        "".join(ch for ch in token.strip().lower() if ch not in _PUNCT)
+        for token in tokenize(text)
+    )
+    return [word for word in words if word]
+
+
+def word_error_rate(reference: str, hypothesis: str) -> float:
+    """Word-level edit distance over the reference length."""
+    ref, hyp = _words(reference), _words(hypothesis)
+    if not ref:
+        return 0.0 if not hyp else 1.0
+    previous = list(range(len(hyp) + 1))
+    for i, ref_word in enumerate(ref, 1):
+        current = [i]
+        for j, hyp_word in enumerate(hyp, 1):
+            current.append(
+                min(
+                    previous[j] + 1,
+                    current[j - 1] + 1,
+                    previous[j - 1] + (ref_word != hyp_word),
+                )
+            )
+        previous = current
+    return previous[-1] / float(len(ref))
+
+
+def _bench_mode(args: argparse.Namespace, quantize: Optional[str]) -> Dict[str, Any]:
+    import soundfile as sf  # type: ignore
+
+    import stt
+    from registry import model_registry
+
+    started = time.perf_counter()
+    model = stt.get_qwen_model(
+        model_name=args.model,
+        backend="transformers",
+        device="cpu",
+        dtype="float32",
+        max_batch=1,
+        max_new_tokens=DEFAULT_MAX_NEW_TOKENS,
+        forced_aligner=None,
+        forced_aligner_kwargs=None,
+        quantize=quantize,
+    )
+    load_sec = time.perf_counter() - started
+
+    def _transcribe() -> str:
+        results = model.transcribe(audio=args.audio, language=args.language)
+        result = results[0] if isinstance(results, list) else results
+        return str(getattr(result, "text", "") or "")
+
+    text = _transcribe()
+    latencies = []
+    for _ in range(args.runs):
+        started = time.perf_counter()
+        text = _transcribe()
+        latencies.append(time.perf_counter() - started)
+    # Free the weights before the next mode loads its own copy.
+    del model
+    model_registry.evict()
+
+    latency = statistics.median(latencies)
+    return {
+        "quantize": quantize or "none",
+        "load_sec": round(load_sec, 3),
+        "latency_sec": round(latency, 3),
+        "rtf": round(latency / sf.info(args.audio).duration, 4),
+        "text": text,
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--audio", required=True, help="clip to transcribe")
+    parser.add_argument("--reference", help="reference transcript")
+    parser.add_argument("--reference-file", help="file holding the reference transcript")
+    parser.add_argument("--model", default=DEFAULT_QWEN_MODEL)
+    parser.add_argument("--language", default=None)
+    parser.add_argument("--runs", type=int, default=3)
+    args = parser.parse_args(argv)
+
+    reference = args.reference
+    if args.reference_file:
+        reference = Path(args.reference_file).read_text(encoding="utf-8")
+
+    rows = [_bench_mode(args, None), _bench_mode(args, INT8_DYNAMIC)]
+    baseline = rows[0]
+    for row in rows:
+        row["wer"] = round(word_error_rate(reference or baseline["text"], row["text"]), 4)
+        row["wer_against"] = "reference" if reference else "fp32"
+        row["speedup"] = round(baseline["latency_sec"] / row["latency_sec"], 2)
+        print(json.dumps(row, ensure_ascii=False))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,188 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Content hashing and a size-bounded on-disk LRU cache.
+
+Entries are plain files named after the hash of their key. Recency is tracked
+with the file mtime, so the cache survives restarts and needs no index.
+Files are written under a ``.tmp-`` name and renamed into place; ones left
+behind by a process that died mid-write are swept when the cache is created.
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+HASH_BLOCK_SIZE = 1 << 20
+# Temporary files untouched for this long belong to no live writer.
+TEMP_FILE_GRACE_SEC = 3600
+TEMP_PREFIX = ".tmp-"
+_HASH_MEMO_SIZE = 256
+
+_hash_memo: "OrderedDict[Tuple[str, int, int], str]" = OrderedDict()
+_hash_memo_lock = threading.Lock()
+
+
+def hash_file(path: str) -> str:
+    """SHA-256 of the file content, read in fixed-size blocks.
+
+    Results are memoized by path, size and mtime so repeated lookups for an
+    unchanged file cost a single ``stat``.
+    """
+    stat = os.stat(path)
+    memo_key = (os.path.realpath(path), stat.st_size, stat.st_mtime_ns)
+    with _hash_memo_lock:
+        digest = _hash_memo.get(memo_key)
+        if digest is not None:
+            _hash_memo.move_to_end(memo_key)
+            return digest
+
+    hasher = hashlib.sha256()
+    with open(path, "rb") as src:
+        for block in iter(lambda: src.read(HASH_BLOCK_SIZE), b""):
+            hasher.update(block)
+    digest = hasher.hexdigest()
+
+    with _hash_memo_lock:
+        _hash_memo[memo_key] = digest
+        while len(_hash_memo) > _HASH_MEMO_SIZE:
+            _hash_memo.popitem(last=False)
+    return digest
+
+
+def cache_key(parts: Dict[str, Any]) -> str:
+    payload = json.dumps(parts, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class DiskLRUCache:
+    def __init__(self, directory: str, max_bytes: int, suffix: str = "") -> None:
+        self.directory = directory
+        self.max_bytes = max(0, int(max_bytes))
+        self.suffix = suffix
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.swept = self.sweep_temporary()
+
+    def sweep_temporary(self, grace_sec: float = TEMP_FILE_GRACE_SEC) -> int:
+        """Delete ``.tmp-`` and ``.commit`` files older than ``grace_sec``.
+
+        Eviction skips these names, so without this they would outlive the
+        size budget forever. Returns the number of files deleted.
+        """
+        cutoff = time.time() - grace_sec
+        swept = 0
+        try:
+            with os.scandir(self.directory) as it:
+                for entry in it:
+                    name = entry.name
+                    if not (name.startswith(TEMP_PREFIX) or name.endswith(".commit")):
+                        continue
+                    try:
+                        if entry.is_file() and entry.stat().st_mtime < cutoff:
+                            os.remove(entry.path)
+                            swept += 1
+                    except OSError:
+                        continue
+        except OSError:
+            return 0
+        return swept
+
+    def path_for(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}{self.suffix}")
+
+    def get_path(self, key: str) -> Optional[str]:
+        """Return the entry path and mark it as recently used, or None."""
+        path = self.path_for(key)
+        try:
+            os.utime(path)
+        except OSError:
+            with self._lock:
+                self.misses += 1
+            return None
+        with self._lock:
+            self.hits += 1
+        return path
+
+    def put_bytes(self, key: str, data: bytes) -> str:
+        os.makedirs(self.directory, exist_ok=True)
+        fd, temp_path = tempfile.mkstemp(dir=self.directory, prefix=TEMP_PREFIX)
+        try:
+            with os.fdopen(fd, "wb") as dst:
+                dst.write(data)
+            return self.commit(key, temp_path)
+        except Exception:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+
+    def commit(self, key: str, temp_path: str) -> str:
+        """Move a fully written file into the cache under ``key``."""
+        path = self.path_for(key)
+        os.replace(temp_path, path)
+        self.evict()
+        return path
+
+    def get_json(self, key: str) -> Optional[Any]:
+        path = self.get_path(key)
+        if path is None:
+            return None
+        try:
+            with open(path, "r", encoding="utf-8") as src:
+                return json.load(src)
+        except (OSError, ValueError):
+            return None
+
+    def put_json(self, key: str, value: Any) -> str:
+        return self.put_bytes(key, json.dumps(value, ensure_ascii=False).encode("utf-8"))
+
+    def remove(self, key: str) -> None:
+        try:
+            os.remove(self.path_for(key))
+        except OSError:
+            pass
+
+    def evict(self) -> None:
+        """Delete least recently used entries until the cache fits its budget."""
+        with self._lock:
+            entries = []
+            total = 0
+            try:
+                with os.scandir(self.directory) as it:
+                    for entry in it:
+                        if not entry.is_file() or entry.name.startswith(TEMP_PREFIX):
+                            continue
+                        stat = entry.stat()
+                        entries.append((stat.st_mtime, stat.st_size, entry.path))
+                        total += stat.st_size
+            except OSError:
+                return
+            entries.sort()
+            for _mtime, size, path in entries:
+                if total <= self.max_bytes:
+                    break
+                try:
+                    os.remove(path)
+                except OSError:
+                    continue
+                total -= size
+                self.evictions += 1
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "directory": self.directory,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "swept": self.swept,
+            }
@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Append-only chunk checkpoints for long transcriptions.
+
+Every finished chunk is appended to a JSON-lines file and flushed to disk, so
+a runtime killed mid-file (watchdog, host restart, OOM) keeps everything up to
+the last completed chunk and a repeated request resumes from there.
+"""
+
+import json
+import logging
+import os
+from typing import Any, Dict, Optional
+
+from cache import DiskLRUCache
+
+CHECKPOINT_VERSION = 1
+
+
+def _parse_line(line: str) -> Optional[Any]:
+    try:
+        return json.loads(line)
+    except ValueError:
+        # A line torn by a kill mid-write.
+        return None
+
+
+class ChunkCheckpoint:
+    """Chunk records of one transcription, stored under ``key`` in ``store``.
+
+    The first line is a header naming the key; each further line is one chunk
+    record with an integer ``index``. A later record for the same index
+    replaces an earlier one.
+    """
+
+    def __init__(self, store: DiskLRUCache, key: str) -> None:
+        self.store = store
+        self.key = key
+        self.path = store.path_for(key)
+
+    def _header(self) -> Dict[str, Any]:
+        return {"version": CHECKPOINT_VERSION, "key": self.key}
+
+    def _read(self) -> Dict[int, Dict[str, Any]]:
+        if self.store.get_path(self.key) is None:
+            return {}
+        try:
+            with open(self.path, "r", encoding="utf-8") as src:
+                lines = src.read().splitlines()
+        except OSError:
+            return {}
+        if not lines or _parse_line(lines[0]) != self._header():
+            return {}
+        records: Dict[int, Dict[str, Any]] = {}
+        for line in lines[1:]:
+            record = _parse_line(line)
+            if isinstance(record, dict) and isinstance(record.get("index"), int):
+                records[record["index"]] = record
+        return records
+
+    def resume(self) -> Dict[int, Dict[str, Any]]:
+        """Return completed chunk records by index and prepare for appending.
+
+        The file is rewritten with only the valid records, so a torn last line
+        cannot swallow the next append.
+        """
+        records = self._read()
+        lines = [self._header()] + [records[index] for index in sorted(records)]
+        payload = "".join(json.dumps(line, ensure_ascii=False) + "\n" for line in lines)
+        self.store.put_bytes(self.key, payload.encode("utf-8"))
+        return records
+
+    def append(self, record: Dict[str, Any]) -> None:
+        line = json.dumps(record, ensure_ascii=False) + "\n"
+        try:
+            with open(self.path, "a", encoding="utf-8") as dst:
+                dst.write(line)
+                dst.flush()
+                os.fsync(dst.fileno())
+        except OSError as exc:
+            logging.warning("failed to write chunk checkpoint: %s", exc)
+
+    def discard(self) -> None:
+        self.store.remove(self.key)
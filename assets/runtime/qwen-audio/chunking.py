@@ -0,0 +1,224 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Signal-level chunk planning for long STT inputs.
+
+Cut points are chosen from frame energies alone, before any model runs, so
+every sample is transcribed exactly once and chunks do not depend on each
+other's model output.
+"""
+
+import math
+import queue
+import threading
+from dataclasses import dataclass
+from typing import Any, Callable, Iterable, Iterator, Optional, Tuple
+
+import numpy as np
+
+from audio_io import AudioWindow
+
+FRAME_SEC = 0.02
+# Frames this much above the quiet floor of a chunk still count as silence...
+SILENCE_MARGIN_DB = 8.0
+# ...as long as they are at least this far below the loud part of the chunk.
+SPEECH_HEADROOM_DB = 15.0
+# Anything below this level is silence regardless of the chunk statistics.
+ABSOLUTE_SILENCE_DB = -60.0
+
+
+@dataclass
+class PlannedChunk:
+    index: int
+    start: int
+    end: int
+    samples: np.ndarray
+    is_last: bool
+
+    @property
+    def name(self) -> str:
+        return f"chunk_{self.index:03d}"
+
+
+def frame_energy_db(samples: np.ndarray, frame_len: int) -> np.ndarray:
+    """RMS level in dBFS of each complete ``frame_len`` frame."""
+    count = len(samples) // frame_len
+    if count <= 0:
+        return np.zeros(0, dtype=np.float32)
+    frames = samples[: count * frame_len].reshape(count, frame_len)
+    power = np.mean(np.square(frames, dtype=np.float32), axis=1)
+    return (10.0 * np.log10(power + 1e-12)).astype(np.float32)
+
+
+def has_speech(energy_db: np.ndarray) -> bool:
+    """Whether frame levels vary enough, loudly enough, to contain speech."""
+    if not len(energy_db):
+        return False
+    floor, loud = np.percentile(energy_db, [5, 90])
+    # A flat level, however loud, is steady noise rather than speech.
+    return float(loud) > ABSOLUTE_SILENCE_DB and float(loud - floor) >= SILENCE_MARGIN_DB
+
+
+def _silent_runs(silent: np.ndarray) -> np.ndarray:
+    """``(start, end)`` frame index pairs of consecutive True values."""
+    edges = np.diff(np.concatenate(([0], silent.astype(np.int8), [0])))
+    return np.stack([np.flatnonzero(edges == 1), np.flatnonzero(edges == -1)], axis=1)
+
+
+def silence_threshold_db(energy_db: np.ndarray) -> float:
+    """Level below which a frame of this audio counts as silence."""
+    floor, loud = np.percentile(energy_db, [5, 90])
+    return max(
+        min(float(floor) + SILENCE_MARGIN_DB, float(loud) - SPEECH_HEADROOM_DB),
+        ABSOLUTE_SILENCE_DB,
+    )
+
+
+def find_silence_cut(
+    energy_db: np.ndarray,
+    search_start: int,
+    min_silence_frames: int,
+) -> Optional[int]:
+    """Frame index in the middle of the latest long-enough silent run.
+
+    Only runs that end at or after ``search_start`` are considered; the part of
+    a run before ``search_start`` still counts towards its length.
+    """
+    if not len(energy_db):
+        return None
+    runs = _silent_runs(energy_db < silence_threshold_db(energy_db))
+    if not len(runs):
+        return None
+    lengths = runs[:, 1] - runs[:, 0]
+    candidates = runs[(lengths >= min_silence_frames) & (runs[:, 1] > search_start)]
+    if not len(candidates):
+        return None
+    run_start, run_end = candidates[-1]
+    return (max(int(run_start), search_start) + int(run_end)) // 2
+
+
+def plan_cut(
+    samples: np.ndarray,
+    sample_rate: int,
+    min_silence_sec: float,
+    tail_silence_window_sec: float,
+) -> int:
+    """Choose where to end a chunk whose maximum extent is ``samples``.
+
+    Prefers the middle of a pause in the last ``tail_silence_window_sec``,
+    then a pause anywhere in the second half, then the quietest frame of the
+    tail window. Returns an offset into ``samples``.
+    """
+    frame_len = max(1, int(round(FRAME_SEC * sample_rate)))
+    energy = frame_energy_db(samples, frame_len)
+    if not len(energy):
+        return len(samples)
+
+    count = len(energy)
+    min_frames = max(1, int(math.ceil(min_silence_sec / FRAME_SEC)))
+    tail_start = max(1, count - int(math.ceil(tail_silence_window_sec / FRAME_SEC)))
+
+    for search_start in (tail_start, max(1, count // 2)):
+        frame = find_silence_cut(energy, search_start, min_frames)
+        if frame is not None:
+            return frame * frame_len + frame_len // 2
+
+    quietest = tail_start + int(np.argmin(energy[tail_start:]))
+    return quietest * frame_len + frame_len // 2
+
+
+def plan_chunks(
+    window: AudioWindow,
+    sample_rate: int,
+    max_chunk_sec: float,
+    min_silence_sec: float,
+    tail_silence_window_sec: float,
+    merge_tail_sec: float,
+) -> Iterator[PlannedChunk]:
+    """Split the audio behind ``window`` into chunks cut at pauses.
+
+    Each chunk is at most ``max_chunk_sec`` long, except that a remainder
+    shorter than ``merge_tail_sec`` is merged into the final chunk. The window
+    only needs to hold one chunk plus the merge look-ahead.
+    """
+    max_samples = max(1, int(max_chunk_sec * sample_rate))
+    lookahead = max_samples + max(0, int(merge_tail_sec * sample_rate))
+    start = 0
+    index = 0
+    while True:
+        ahead = window.read(start, start + lookahead)
+        if len(ahead) < lookahead and window.exhausted:
+            if len(ahead) or index == 0:
+                yield PlannedChunk(index, start, start + len(ahead), ahead, True)
+            return
+
+        cut = plan_cut(
+            ahead[:max_samples], sample_rate, min_silence_sec, tail_silence_window_sec
+        )
+        end = start + cut
+        yield PlannedChunk(index, start, end, ahead[:cut], False)
+        window.release(end)
+        start = end
+        index += 1
+
+
+
+_PIPELINE_DONE = object()
+
+
+def run_pipelined(
+    chunks: Iterable[PlannedChunk],
+    first_stage: Callable[[PlannedChunk], Any],
+    second_stage: Callable[[PlannedChunk, Any], Any],
+    depth: int = 1,
+) -> Iterator[Tuple[PlannedChunk, Any, Any]]:
+    """Overlap ``first_stage`` of chunk N+1 with ``second_stage`` of chunk N.
+
+    The first stage (and chunk planning) runs on a worker thread that hands
+    results over through a queue of at most ``depth`` chunks; the second stage
+    runs on the caller's thread. Results are yielded in chunk order. With
+    ``depth <= 0`` both stages run sequentially on the caller's thread.
+    """
+    if depth <= 0:
+        for chunk in chunks:
+            first = first_stage(chunk)
+            yield chunk, first, second_stage(chunk, first)
+        return
+
+    handoff: "queue.Queue[Any]" = queue.Queue(maxsize=depth)
+    stop = threading.Event()
+
+    def _put(item: Any) -> bool:
+        while not stop.is_set():
+            try:
+                handoff.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _produce() -> None:
+        try:
+            for chunk in chunks:
+                if stop.is_set() or not _put((chunk, first_stage(chunk), None)):
+                    return
+        except BaseException as exc:  # re-raised on the consumer thread
+            _put((None, None, exc))
+            return
+        _put(_PIPELINE_DONE)
+
+    worker = threading.Thread(target=_produce, name="qwen-audio-asr-stage", daemon=True)
+    worker.start()
+    try:
+        while True:
+            item = handoff.get()
+            if item is _PIPELINE_DONE:
+                return
+            chunk, first, error = item
+            if error is not None:
+                raise error
+            yield chunk, first, second_stage(chunk, first)
+    finally:
+        stop.set()
+        worker.join()
@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Cheap confidence scores for chunk transcripts.
+
+Qwen3-ASR exposes no token log-probabilities, so a draft transcript is judged
+on what can be checked without a second model: repetition loops, a
+speaking rate no person produces, text over silence (or silence for speech),
+and a language that disagrees with the one pinned for the file. The score is
+the weakest of these signals, between 0 and 1.
+"""
+
+from typing import Any, List, Optional
+
+import numpy as np
+
+from chunking import FRAME_SEC, frame_energy_db, has_speech, silence_threshold_db
+from textutil import tokenize
+
+# Tokens (words, or CJK characters) per second of voiced audio. Fast CJK
+# speech reaches ~9; anything far beyond is a decoding loop.
+MAX_TOKENS_PER_SEC = 12.0
+# Below this rate over a long stretch of speech, words were dropped.
+MIN_TOKENS_PER_SEC = 0.5
+MIN_RATE_CHECK_SEC = 3.0
+# Less voiced audio than this cannot carry a word.
+MIN_SPEECH_SEC = 0.3
+REPEAT_NGRAM = 4
+MIN_REPEAT_TOKENS = 12
+
+
+def speech_seconds(samples: np.ndarray, sample_rate: int) -> float:
+    """Seconds of ``samples`` louder than their own silence threshold."""
+    frame_len = max(1, int(FRAME_SEC * sample_rate))
+    energy = frame_energy_db(np.asarray(samples, dtype=np.float32), frame_len)
+    if not has_speech(energy):
+        return 0.0
+    voiced = int(np.count_nonzero(energy >= silence_threshold_db(energy)))
+    return voiced * frame_len / float(sample_rate)
+
+
+def repetition_ratio(tokens: List[str], n: int = REPEAT_NGRAM) -> float:
+    """Share of the ``n``-grams in ``tokens`` that already occurred earlier."""
+    if len(tokens) < n + 1:
+        return 0.0
+    grams = [tuple(tokens[i : i + n]) for i in range(len(tokens) - n + 1)]
+    return 1.0 - len(set(grams)) / float(len(grams))
+
+
+def primary_language(language: Any) -> Optional[str]:
+    """First language of a detection such as ``"Chinese,English"``."""
+    text = str(language or "").split(",", 1)[0].strip()
+    return text or None
+
+
+def transcript_confidence(
+    text: str,
+    samples: np.ndarray,
+    sample_rate: int,
+    language: Optional[str] = None,
+    expected_language: Optional[str] = None,
+) -> float:
+    """Confidence in ``text`` as the transcript of ``samples``, from 0 to 1."""
+    scores = [1.0]
+
+    tokens = [token.strip().lower() for token in tokenize(str(text or "").strip())]
+    speech = speech_seconds(samples, sample_rate)
+    if not tokens:
+        # Saying nothing is only believable for a chunk without speech.
+        scores.append(1.0 if speech < MIN_SPEECH_SEC else 0.0)
+    elif speech < MIN_SPEECH_SEC:
+        # Text over silence is hallucinated.
+        scores.append(0.0)
+    else:
+        rate = len(tokens) / speech
+        if rate > MAX_TOKENS_PER_SEC:
+            scores.append(MAX_TOKENS_PER_SEC / rate)
+        if speech >= MIN_RATE_CHECK_SEC and rate < MIN_TOKENS_PER_SEC:
+            scores.append(rate / MIN_TOKENS_PER_SEC)
+        if len(tokens) >= MIN_REPEAT_TOKENS:
+            scores.append(1.0 - repetition_ratio(tokens))
+
+    expected = primary_language(expected_language)
+    detected = primary_language(language)
+    if expected and detected and detected.lower() != expected.lower():
+        scores.append(0.0)
+    return float(max(0.0, min(scores)))
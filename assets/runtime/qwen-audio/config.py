@@ -25,6 +25,14 @@ DEFAULT_MODEL = os.environ.get(
     "QWEN_ASR_MODEL", DEFAULT_MLX_MODEL if IS_DARWIN else DEFAULT_QWEN_MODEL
 )
 
+# Smaller checkpoints that draft transcripts in cascade mode.
+DEFAULT_QWEN_DRAFT_MODEL = os.environ.get(
+    "QWEN_ASR_QWEN_DRAFT_MODEL", "Qwen/Qwen3-ASR-0.6B"
+)
+DEFAULT_MLX_DRAFT_MODEL = os.environ.get(
+    "QWEN_ASR_MLX_DRAFT_MODEL", "mlx-community/Qwen3-ASR-0.6B-8bit"
+)
+
 # TTS model defaults (see: https://github.com/Blaizzy/mlx-audio/tree/main/mlx_audio/tts/models/qwen3_tts)
 #
 # Available models and their capabilities:
@@ -54,6 +62,8 @@ DEFAULT_QWEN_TTS_CUSTOM_MODEL = os.environ.get(
     "QWEN_TTS_CUSTOM_MODEL",
     "mlx-community/Qwen3-TTS-12Hz-1.7B-CustomVoice-bf16",
 ) if IS_DARWIN else "Qwen/Qwen3-TTS-12Hz-1.7B-CustomVoice"
+# Longest segment (words, or CJK characters) streamed TTS synthesizes at once.
+TTS_SEGMENT_MAX_TOKENS = int(os.environ.get("QWEN_TTS_SEGMENT_TOKENS", "40"))
 # On Apple Silicon we use the quantized MLX build; on every other platform we
 # fall back to the official PyTorch weights served through the `voxcpm` package.
 DEFAULT_VOXCPM2_TTS_MODEL = os.environ.get(
@@ -81,27 +91,102 @@ def _resolve_default_device() -> str:
 
 DEFAULT_DEVICE = _resolve_default_device()
 DEFAULT_DTYPE = os.environ.get("QWEN_ASR_DTYPE", "bf16")
+# Weight quantization of transformers models loaded on CPU ("int8-dynamic" or
+# empty for none); requests override it with ``quantize``.
+DEFAULT_QUANTIZE = os.environ.get("QWEN_ASR_QUANTIZE", "")
 DEFAULT_BACKEND = os.environ.get(
     "QWEN_ASR_BACKEND", "mlx-audio" if IS_DARWIN else "transformers"
 ).strip().lower()
 DEFAULT_MAX_BATCH = int(os.environ.get("QWEN_ASR_MAX_BATCH", "2"))
 DEFAULT_MAX_NEW_TOKENS = int(os.environ.get("QWEN_ASR_MAX_NEW_TOKENS", "8192"))
+# predict_batch closes a batch once its longest input would exceed this many
+# times its shortest, so short memos are not padded to the length of long ones.
+# 0 batches by count only.
+BATCH_MAX_DURATION_RATIO = float(os.environ.get("QWEN_ASR_BATCH_MAX_DURATION_RATIO", "2.0"))
+# Idle tiers: release allocator caches, then unload models (keeping the
+# interpreter warm), then exit. 0 disables a tier. Under memory pressure
+# (less than QWEN_ASR_MIN_AVAILABLE_MB free) models are unloaded as soon as
+# the runtime has been idle for the cache-release period.
+IDLE_RELEASE_CACHES_SEC = int(os.environ.get("QWEN_ASR_IDLE_RELEASE_CACHES", "60"))
 IDLE_TIMEOUT_SEC = int(os.environ.get("QWEN_ASR_IDLE_TIMEOUT", "600"))
-
-DEFAULT_MLX_MAX_CHUNK_SEC = float(os.environ.get("QWEN_ASR_MLX_MAX_CHUNK_SEC", "120"))
-DEFAULT_MLX_MIN_SILENCE_SEC = float(
-    os.environ.get("QWEN_ASR_MLX_MIN_SILENCE_SEC", "0.2")
+IDLE_EXIT_SEC = int(os.environ.get("QWEN_ASR_IDLE_EXIT", "21600"))
+MIN_AVAILABLE_MEMORY_MB = int(os.environ.get("QWEN_ASR_MIN_AVAILABLE_MB", "512"))
+
+# Request lanes: each lane has its own worker pool so long STT jobs never block
+# TTS or control requests such as ping.
+STT_WORKERS = int(os.environ.get("QWEN_ASR_STT_WORKERS", "1"))
+TTS_WORKERS = int(os.environ.get("QWEN_ASR_TTS_WORKERS", "1"))
+CONTROL_WORKERS = int(os.environ.get("QWEN_ASR_CONTROL_WORKERS", "2"))
+STREAM_WORKERS = int(os.environ.get("QWEN_ASR_STREAM_WORKERS", "1"))
+MAX_PENDING_PER_LANE = int(os.environ.get("QWEN_ASR_MAX_PENDING_PER_LANE", "64"))
+
+# Live streaming sessions: the unfinalized audio is re-decoded every
+# STREAM_STEP_SEC of new audio and finalized at a pause of
+# STREAM_ENDPOINT_SILENCE_SEC, or at the best pause once it reaches
+# STREAM_MAX_BUFFER_SEC. Sessions without a push for STREAM_SESSION_TTL_SEC
+# are dropped.
+STREAM_STEP_SEC = float(os.environ.get("QWEN_ASR_STREAM_STEP_SEC", "1.0"))
+STREAM_MAX_BUFFER_SEC = float(os.environ.get("QWEN_ASR_STREAM_MAX_BUFFER_SEC", "15"))
+STREAM_ENDPOINT_SILENCE_SEC = float(
+    os.environ.get("QWEN_ASR_STREAM_ENDPOINT_SILENCE_SEC", "0.6")
 )
-DEFAULT_MLX_TAIL_SILENCE_WINDOW_SEC = float(
-    os.environ.get("QWEN_ASR_MLX_TAIL_SILENCE_WINDOW_SEC", "3.0")
-)
-DEFAULT_MLX_MERGE_TAIL_SEC = float(os.environ.get("QWEN_ASR_MLX_MERGE_TAIL_SEC", "60"))
+STREAM_SESSION_TTL_SEC = float(os.environ.get("QWEN_ASR_STREAM_SESSION_TTL_SEC", "300"))
+
+# Resident model registry: loaded models stay resident until the memory budget
+# or model count is exceeded, then the least recently used idle model is
+# dropped. A budget of 0 uses half of physical memory.
+MODEL_MEMORY_BUDGET_MB = int(os.environ.get("QWEN_ASR_MODEL_BUDGET_MB", "0"))
+MAX_RESIDENT_MODELS = int(os.environ.get("QWEN_ASR_MAX_RESIDENT_MODELS", "6"))
+
+
+def _chunk_env(name: str, default: str) -> str:
+    # Chunking used to be MLX-only; the QWEN_ASR_MLX_* names still work.
+    return os.environ.get(
+        f"QWEN_ASR_{name}", os.environ.get(f"QWEN_ASR_MLX_{name}", default)
+    )
+
+
+# Long-audio chunking, shared by the MLX and transformers STT backends.
+DEFAULT_MAX_CHUNK_SEC = float(_chunk_env("MAX_CHUNK_SEC", "120"))
+DEFAULT_MIN_SILENCE_SEC = float(_chunk_env("MIN_SILENCE_SEC", "0.2"))
+DEFAULT_TAIL_SILENCE_WINDOW_SEC = float(_chunk_env("TAIL_SILENCE_WINDOW_SEC", "3.0"))
+DEFAULT_MERGE_TAIL_SEC = float(_chunk_env("MERGE_TAIL_SEC", "60"))
+# Chunks the ASR stage may run ahead of forced alignment; 0 runs them in turn.
+DEFAULT_PIPELINE_DEPTH = int(_chunk_env("PIPELINE_DEPTH", "1"))
+# Without an explicit language, files longer than one chunk are probed with
+# this many short windows spread across the file; the majority language is then
+# pinned for every chunk. 0 pins whatever the first chunk detects.
+DEFAULT_LANGUAGE_PROBES = int(os.environ.get("QWEN_ASR_LANGUAGE_PROBES", "3"))
+LANGUAGE_PROBE_SEC = float(os.environ.get("QWEN_ASR_LANGUAGE_PROBE_SEC", "8"))
 
 
 def _strtobool(value: str) -> bool:
     return str(value).strip().lower() not in {"0", "false", "off", "no"}
 
 
+# Cascade mode transcribes every chunk with the draft model and re-runs only
+# chunks whose draft scores below CASCADE_MIN_CONFIDENCE (0..1) on the full
+# model. Requests can turn it on with ``cascade`` even when this is off.
+CASCADE_ENABLED = _strtobool(os.environ.get("QWEN_ASR_CASCADE", "0"))
+CASCADE_MIN_CONFIDENCE = float(os.environ.get("QWEN_ASR_CASCADE_MIN_CONFIDENCE", "0.6"))
+
+
+RUNTIME_DIR = os.path.dirname(os.path.abspath(__file__))
+CACHE_DIR = os.environ.get("QWEN_ASR_CACHE_DIR") or os.path.join(RUNTIME_DIR, ".cache")
+# Transcripts keyed by audio content hash and decoding parameters.
+TRANSCRIPT_CACHE_ENABLED = _strtobool(os.environ.get("QWEN_ASR_TRANSCRIPT_CACHE", "1"))
+TRANSCRIPT_CACHE_MAX_MB = int(os.environ.get("QWEN_ASR_TRANSCRIPT_CACHE_MB", "256"))
+# Per-chunk checkpoints of chunked transcriptions, so a repeated request
+# resumes after a crash instead of starting over.
+CHECKPOINTS_ENABLED = _strtobool(os.environ.get("QWEN_ASR_CHECKPOINTS", "1"))
+CHECKPOINT_MAX_MB = int(os.environ.get("QWEN_ASR_CHECKPOINT_MAX_MB", "64"))
+# Decoded short inputs kept in memory by content hash; 0 disables.
+DECODE_CACHE_MAX_MB = int(os.environ.get("QWEN_ASR_DECODE_CACHE_MB", "64"))
+# audio_url bodies with an ETag/Last-Modified validator, revalidated per use.
+DOWNLOAD_CACHE_MAX_MB = int(os.environ.get("QWEN_ASR_DOWNLOAD_CACHE_MB", "512"))
+DOWNLOAD_TIMEOUT_SEC = float(os.environ.get("QWEN_ASR_DOWNLOAD_TIMEOUT_SEC", "30"))
+
+
 def _can_reach_hf(endpoint: str, timeout_sec: float = 2.0) -> bool:
     url = endpoint.rstrip("/")
     if not url.startswith(("http://", "https://")):
@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Lane-based request dispatcher for the stdin/stdout JSON protocol.
+
+Requests are read continuously and executed on small per-lane thread pools, so
+a long ``predict`` never blocks a ``ping`` or a short ``tts``. Responses are
+written as soon as each request finishes and the host correlates them by ``id``.
+"""
+
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional
+
+CONTROL_LANE = "control"
+STT_LANE = "stt"
+TTS_LANE = "tts"
+# Live sessions get their own lane so pushes are not queued behind file jobs.
+STREAM_LANE = "stream"
+
+DEFAULT_METHOD_LANES: Dict[str, str] = {
+    "ping": CONTROL_LANE,
+    "load": CONTROL_LANE,
+    "warmup": CONTROL_LANE,
+    "unload": CONTROL_LANE,
+    "job_status": CONTROL_LANE,
+    "stats": CONTROL_LANE,
+    "predict": STT_LANE,
+    "predict_batch": STT_LANE,
+    "tts": TTS_LANE,
+    "stream_open": STREAM_LANE,
+    "stream_push": STREAM_LANE,
+    "stream_close": STREAM_LANE,
+}
+
+
+class LaneFullError(RuntimeError):
+    pass
+
+
+class Lane:
+    def __init__(self, name: str, workers: int, max_pending: int) -> None:
+        self.name = name
+        self.workers = max(1, int(workers))
+        self.max_pending = max(1, int(max_pending))
+        self._executor = ThreadPoolExecutor(
+            max_workers=self.workers, thread_name_prefix=f"qwen-audio-{name}"
+        )
+        self._lock = threading.Lock()
+        self._pending = 0
+        self._running = 0
+        self._completed = 0
+
+    def submit(self, fn: Callable[[], None]) -> None:
+        with self._lock:
+            if self._pending >= self.max_pending:
+                raise LaneFullError(
+                    f"{self.name} lane is full ({self.max_pending} pending requests)"
+                )
+            self._pending += 1
+        self._executor.submit(self._run, fn)
+
+    def _run(self, fn: Callable[[], None]) -> None:
+        with self._lock:
+            self._running += 1
+        try:
+            fn()
+        finally:
+            with self._lock:
+                self._running -= 1
+                self._pending -= 1
+                self._completed += 1
+
+    def status(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "workers": self.workers,
+                "max_pending": self.max_pending,
+                "pending": self._pending,
+                "running": self._running,
+                "completed": self._completed,
+            }
+
+    def shutdown(self, wait: bool = True) -> None:
+        self._executor.shutdown(wait=wait, cancel_futures=not wait)
+
+
+class RequestDispatcher:
+    """Route protocol methods to lanes; unknown methods go to the control lane."""
+
+    def __init__(
+        self,
+        lane_workers: Dict[str, int],
+        max_pending: int,
+        method_lanes: Optional[Dict[str, str]] = None,
+    ) -> None:
+        self._method_lanes = dict(method_lanes or DEFAULT_METHOD_LANES)
+        self._lanes: Dict[str, Lane] = {
+            name: Lane(name, workers, max_pending)
+            for name, workers in lane_workers.items()
+        }
+        if CONTROL_LANE not in self._lanes:
+            self._lanes[CONTROL_LANE] = Lane(CONTROL_LANE, 1, max_pending)
+
+    def lane_for(self, method: Optional[str]) -> str:
+        lane = self._method_lanes.get(method or "", CONTROL_LANE)
+        return lane if lane in self._lanes else CONTROL_LANE
+
+    def submit(self, method: Optional[str], fn: Callable[[], None]) -> None:
+        self._lanes[self.lane_for(method)].submit(fn)
+
+    def status(self) -> Dict[str, Any]:
+        return {name: lane.status() for name, lane in self._lanes.items()}
+
+    def shutdown(self, wait: bool = True) -> None:
+        for lane in self._lanes.values():
+            lane.shutdown(wait=wait)
@@ -0,0 +1,527 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Shared downloader for ``audio_url`` inputs.
+
+Requests reuse keep-alive HTTP(S) connections from a small per-host pool.
+Bodies that carry an ETag or Last-Modified validator are kept in a
+size-bounded on-disk cache (QWEN_ASR_DOWNLOAD_CACHE_MB) keyed by the URL and
+that validator, so repeating a URL costs one conditional request the server
+answers with 304. Other bodies go to a temporary file the caller releases.
+
+A cacheable body is written under a ``.tmp-`` name, which cache eviction
+skips, and only linked into the cache once it is complete. The callers that
+fetched it keep reading the ``.tmp-`` name until they release it.
+
+Bodies are written by a background thread and can be read while they arrive
+(:meth:`Download.open`), so decoding starts before the download completes.
+"""
+
+import http.client
+import io
+import os
+import re
+import shutil
+import tempfile
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, BinaryIO, Dict, List, Optional, Tuple
+from urllib.parse import urljoin, urlsplit, urlunsplit
+
+from cache import TEMP_PREFIX, DiskLRUCache, cache_key
+from config import CACHE_DIR, DOWNLOAD_CACHE_MAX_MB, DOWNLOAD_TIMEOUT_SEC
+
+# Bump when the cached metadata layout changes so stale entries miss.
+DOWNLOAD_CACHE_VERSION = 1
+DOWNLOAD_BLOCK_SIZE = 1 << 16
+MAX_REDIRECTS = 5
+MAX_IDLE_PER_HOST = 4
+_PATHS_MEMO_SIZE = 256
+_USER_AGENT = "qwen-audio-runtime"
+_SUFFIX_RE = re.compile(r"^\.[A-Za-z0-9]{1,8}$")
+
+_PoolKey = Tuple[str, str]
+
+
+class ConnectionPool:
+    """Idle keep-alive connections per ``(scheme, host:port)``."""
+
+    def __init__(self, timeout: float, max_idle_per_host: int = MAX_IDLE_PER_HOST) -> None:
+        self.timeout = timeout
+        self.max_idle_per_host = max_idle_per_host
+        self._idle: Dict[_PoolKey, List[http.client.HTTPConnection]] = {}
+        self._lock = threading.Lock()
+        self.opened = 0
+        self.reused = 0
+
+    def _take(self, key: _PoolKey) -> Optional[http.client.HTTPConnection]:
+        with self._lock:
+            idle = self._idle.get(key)
+            if idle:
+                self.reused += 1
+                return idle.pop()
+            self.opened += 1
+        return None
+
+    def _connect(self, key: _PoolKey) -> http.client.HTTPConnection:
+        scheme, netloc = key
+        if scheme == "https":
+            return http.client.HTTPSConnection(netloc, timeout=self.timeout)
+        return http.client.HTTPConnection(netloc, timeout=self.timeout)
+
+    def get(
+        self, url: str, headers: Dict[str, str]
+    ) -> Tuple[_PoolKey, http.client.HTTPConnection, http.client.HTTPResponse]:
+        """Send ``GET url`` and return the connection with its response headers read."""
+        parts = urlsplit(url)
+        if parts.scheme not in ("http", "https") or not parts.netloc:
+            raise ValueError(f"unsupported audio url: {url}")
+        key = (parts.scheme, parts.netloc)
+        target = urlunsplit(("", "", parts.path or "/", parts.query, ""))
+        while True:
+            conn = self._take(key)
+            reused = conn is not None
+            if conn is None:
+                conn = self._connect(key)
+            try:
+                conn.request("GET", target, headers=headers)
+                return key, conn, conn.getresponse()
+            except (http.client.RemoteDisconnected, ConnectionError):
+                conn.close()
+                # The server dropped an idle connection; retry on a new one.
+                if not reused:
+                    raise
+
+    def release(
+        self,
+        key: _PoolKey,
+        conn: http.client.HTTPConnection,
+        response: http.client.HTTPResponse,
+    ) -> None:
+        """Return ``conn`` for reuse once ``response`` has been read to the end."""
+        if response.will_close or not response.isclosed():
+            conn.close()
+            return
+        with self._lock:
+            idle = self._idle.setdefault(key, [])
+            if len(idle) < self.max_idle_per_host:
+                idle.append(conn)
+                return
+        conn.close()
+
+    def close(self) -> None:
+        with self._lock:
+            idle, self._idle = self._idle, {}
+        for conns in idle.values():
+            for conn in conns:
+                conn.close()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "opened": self.opened,
+                "reused": self.reused,
+                "idle": sum(len(conns) for conns in self._idle.values()),
+            }
+
+
+class Download:
+    """A file at ``path`` that may still be being written.
+
+    ``identity`` names the content (URL and validator) when the server sent
+    a validator, and is None otherwise. ``temporary`` files belong to the
+    callers, each of which calls :meth:`release` when done with them; the
+    last release deletes the file.
+    """
+
+    def __init__(
+        self,
+        url: str,
+        path: str,
+        size: Optional[int],
+        identity: Optional[str],
+        temporary: bool,
+    ) -> None:
+        self.url = url
+        self.path = path
+        self.size = size
+        self.identity = identity
+        self.temporary = temporary
+        self._cond = threading.Condition()
+        self._written = 0
+        self._done = False
+        self._error: Optional[BaseException] = None
+        self._users = 1
+        self._released = False
+
+    @classmethod
+    def completed(cls, url: str, path: str, identity: Optional[str]) -> "Download":
+        download = cls(url, path, os.path.getsize(path), identity, temporary=False)
+        download._written = download.size or 0
+        download._done = True
+        return download
+
+    @property
+    def done(self) -> bool:
+        with self._cond:
+            return self._done
+
+    @property
+    def released(self) -> bool:
+        with self._cond:
+            return self._released
+
+    def _acquire(self) -> "Download":
+        with self._cond:
+            self._users += 1
+        return self
+
+    def _advance(self, count: int) -> None:
+        with self._cond:
+            self._written += count
+            self._cond.notify_all()
+
+    def _finish(self, error: Optional[BaseException] = None) -> bool:
+        """Mark the body complete (or failed); True if it was released meanwhile."""
+        with self._cond:
+            self._error = error
+            self._done = True
+            self._cond.notify_all()
+            return self._released
+
+    def _check(self) -> None:
+        if self._error is not None:
+            raise RuntimeError(f"failed to download {self.url}: {self._error}") from self._error
+
+    def wait(self) -> str:
+        """Block until the body is complete and return its path."""
+        with self._cond:
+            while not self._done:
+                self._cond.wait()
+            self._check()
+        return self.path
+
+    def available(self, offset: int) -> int:
+        """Bytes written once more than ``offset`` are, or the download ends."""
+        with self._cond:
+            while not self._done and self._written <= offset:
+                self._cond.wait()
+            self._check()
+            return self._written
+
+    def total_size(self) -> int:
+        """Body size, waiting for the end when the server did not announce it."""
+        if self.size is not None:
+            return self.size
+        self.wait()
+        return self._written
+
+    def open(self) -> BinaryIO:
+        """Binary reader over the body whose reads wait for bytes still in flight."""
+        return io.BufferedReader(_DownloadReader(self), DOWNLOAD_BLOCK_SIZE)
+
+    def release(self) -> None:
+        """Drop one caller; the last stops a temporary download and deletes its file."""
+        with self._cond:
+            self._users = max(0, self._users - 1)
+            if self._users:
+                return
+            self._released = True
+            done = self._done
+        if done and self.temporary:
+            _remove(self.path)
+        # Otherwise the writer sees the flag and cleans up when it stops.
+
+
+class _DownloadReader(io.RawIOBase):
+    def __init__(self, download: Download) -> None:
+        super().__init__()
+        self._download = download
+        self._file = open(download.path, "rb")
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def readinto(self, buffer: Any) -> int:
+        position = self._file.tell()
+        count = min(len(buffer), self._download.available(position) - position)
+        if count <= 0:
+            return 0
+        data = self._file.read(count)
+        buffer[: len(data)] = data
+        return len(data)
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        if whence == io.SEEK_END:
+            offset, whence = self._download.total_size() + offset, io.SEEK_SET
+        return self._file.seek(offset, whence)
+
+    def tell(self) -> int:
+        return self._file.tell()
+
+    def close(self) -> None:
+        self._file.close()
+        super().close()
+
+
+def _remove(path: str) -> None:
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+
+
+def _url_suffix(url: str) -> str:
+    # Keep the extension: some decoders pick the format from it.
+    suffix = Path(urlsplit(url).path).suffix
+    return suffix.lower() if _SUFFIX_RE.match(suffix) else ".wav"
+
+
+class AudioDownloader:
+    def __init__(
+        self,
+        directory: str,
+        max_bytes: int,
+        timeout: float = DOWNLOAD_TIMEOUT_SEC,
+    ) -> None:
+        self.cache = DiskLRUCache(directory, max_bytes)
+        self.pool = ConnectionPool(timeout)
+        self._lock = threading.Lock()
+        self._inflight: Dict[str, Download] = {}
+        self._paths: "OrderedDict[str, Download]" = OrderedDict()
+        self.revalidated = 0
+        self.downloaded = 0
+
+    def _remember(self, download: Download) -> Download:
+        with self._lock:
+            self._paths[download.path] = download
+            self._paths.move_to_end(download.path)
+            while len(self._paths) > _PATHS_MEMO_SIZE:
+                self._paths.popitem(last=False)
+        return download
+
+    def lookup(self, path: Any) -> Optional[Download]:
+        """The download that produced ``path``, if this downloader made it."""
+        if not isinstance(path, str):
+            return None
+        with self._lock:
+            return self._paths.get(path)
+
+    def forget(self, path: str) -> None:
+        with self._lock:
+            self._paths.pop(path, None)
+
+    def _open(
+        self, url: str, headers: Dict[str, str]
+    ) -> Tuple[_PoolKey, http.client.HTTPConnection, http.client.HTTPResponse]:
+        for _ in range(MAX_REDIRECTS + 1):
+            key, conn, response = self.pool.get(url, headers)
+            location = response.getheader("Location")
+            if response.status not in (301, 302, 303, 307, 308) or not location:
+                return key, conn, response
+            response.read()
+            self.pool.release(key, conn, response)
+            url = urljoin(url, location)
+        raise RuntimeError(f"too many redirects downloading {url}")
+
+    def _temp_path(self, suffix: str) -> str:
+        # Inside the cache directory, so committing is a link, not a copy.
+        os.makedirs(self.cache.directory, exist_ok=True)
+        fd, path = tempfile.mkstemp(dir=self.cache.directory, prefix=TEMP_PREFIX, suffix=suffix)
+        os.close(fd)
+        return path
+
+    def _commit(self, path: str, body_key: str) -> None:
+        """Add the complete body at ``path`` to the cache, keeping ``path`` itself."""
+        staged = f"{path}.commit"
+        try:
+            os.link(path, staged)
+        except OSError:
+            # No hard links on this filesystem.
+            shutil.copyfile(path, staged)
+        try:
+            self.cache.commit(body_key, staged)
+        except OSError:
+            _remove(staged)
+            raise
+
+    def fetch(self, url: str) -> Download:
+        """Start downloading ``url``, or reuse the cached body if it is current."""
+        url_key = cache_key({"download": DOWNLOAD_CACHE_VERSION, "url": url})
+        headers = {"User-Agent": _USER_AGENT, "Accept-Encoding": "identity"}
+        meta = self.cache.get_json(url_key) if self.cache.max_bytes else None
+        cached_path = None
+        if isinstance(meta, dict) and meta.get("body"):
+            cached_path = self.cache.get_path(str(meta["body"]))
+        if cached_path is not None:
+            if meta.get("etag"):
+                headers["If-None-Match"] = str(meta["etag"])
+            if meta.get("last_modified"):
+                headers["If-Modified-Since"] = str(meta["last_modified"])
+
+        key, conn, response = self._open(url, headers)
+        if response.status == 304 and cached_path is not None:
+            response.read()
+            self.pool.release(key, conn, response)
+            with self._lock:
+                self.revalidated += 1
+            return self._remember(Download.completed(url, cached_path, meta.get("identity")))
+        if response.status != 200:
+            response.read()
+            self.pool.release(key, conn, response)
+            raise RuntimeError(
+                f"failed to download {url}: HTTP {response.status} {response.reason}"
+            )
+
+        etag = response.getheader("ETag")
+        last_modified = response.getheader("Last-Modified")
+        length = response.getheader("Content-Length")
+        size = int(length) if length and length.isdigit() else None
+        suffix = _url_suffix(url)
+        identity = None
+        if etag or last_modified:
+            identity = cache_key({"url": url, "etag": etag, "last_modified": last_modified})
+
+        if identity is not None and self.cache.max_bytes:
+            body_key = f"{identity}{suffix}"
+            with self._lock:
+                running = self._inflight.get(body_key)
+                if running is not None and running.released:
+                    # Its callers left and the writer is stopping; start over.
+                    running = None
+                if running is None:
+                    path = self._temp_path(suffix)
+                    download = Download(url, path, size, identity, temporary=True)
+                    self._inflight[body_key] = download
+                else:
+                    running._acquire()
+            if running is not None:
+                # Someone is already writing this body; read along with them.
+                conn.close()
+                return self._remember(running)
+            # A crash mid-write must not leave metadata pointing at a partial body.
+            self.cache.remove(url_key)
+            record = {
+                "url": url,
+                "etag": etag,
+                "last_modified": last_modified,
+                "identity": identity,
+                "body": body_key,
+            }
+        else:
+            fd, path = tempfile.mkstemp(prefix="audio_url_", suffix=suffix)
+            os.close(fd)
+            download = Download(url, path, size, identity, temporary=True)
+            body_key = None
+            record = None
+
+        dst = open(download.path, "wb")
+        with self._lock:
+            self.downloaded += 1
+        threading.Thread(
+            target=self._receive,
+            args=(download, dst, key, conn, response, url_key, body_key, record),
+            name="audio-download",
+            daemon=True,
+        ).start()
+        return self._remember(download)
+
+    def _receive(
+        self,
+        download: Download,
+        dst: BinaryIO,
+        key: _PoolKey,
+        conn: http.client.HTTPConnection,
+        response: http.client.HTTPResponse,
+        url_key: str,
+        body_key: Optional[str],
+        record: Optional[Dict[str, Any]],
+    ) -> None:
+        error: Optional[BaseException] = None
+        received = 0
+        try:
+            with dst:
+                while not download.released:
+                    # read1 hands over what has arrived instead of a full block.
+                    block = response.read1(DOWNLOAD_BLOCK_SIZE)
+                    if not block:
+                        break
+                    dst.write(block)
+                    # Readers open the file themselves; make the bytes visible.
+                    dst.flush()
+                    received += len(block)
+                    download._advance(len(block))
+            if download.released:
+                conn.close()
+            else:
+                if download.size is not None and received != download.size:
+                    raise RuntimeError(
+                        f"connection closed after {received} of {download.size} bytes"
+                    )
+                # Lets the response mark itself finished so the connection is reused.
+                response.read()
+                self.pool.release(key, conn, response)
+        except BaseException as exc:  # noqa: BLE001 - handed to the readers
+            conn.close()
+            error = exc
+        finally:
+            if body_key is not None:
+                with self._lock:
+                    if self._inflight.get(body_key) is download:
+                        del self._inflight[body_key]
+
+        if error is None and record is not None and body_key is not None:
+            try:
+                self._commit(download.path, body_key)
+                self.cache.put_json(url_key, record)
+            except OSError:
+                pass
+        if error is not None:
+            # Gone before readers wake up to the error.
+            _remove(download.path)
+            self.forget(download.path)
+        if download._finish(error) and error is None:
+            _remove(download.path)
+            self.forget(download.path)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            counts = {"downloaded": self.downloaded, "revalidated": self.revalidated}
+        return {**self.cache.stats(), **counts, "connections": self.pool.stats()}
+
+
+_downloader: Optional[AudioDownloader] = None
+_downloader_lock = threading.Lock()
+
+
+def get_downloader() -> AudioDownloader:
+    global _downloader
+    with _downloader_lock:
+        if _downloader is None:
+            _downloader = AudioDownloader(
+                os.path.join(CACHE_DIR, "downloads"),
+                max_bytes=DOWNLOAD_CACHE_MAX_MB * 1024 * 1024,
+            )
+        return _downloader
+
+
+def download_for(path: Any) -> Optional[Download]:
+    """The download behind a local path returned by :func:`get_downloader`, if any."""
+    downloader = _downloader
+    return downloader.lookup(path) if downloader is not None else None
+
+
+def release_download(path: str) -> None:
+    """Delete a temporary download (stopping it if still running) or file."""
+    download = download_for(path)
+    if download is None:
+        _remove(path)
+        return
+    download.release()
+    if download.released and download.done:
+        get_downloader().forget(path)
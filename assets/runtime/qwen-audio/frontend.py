@@ -0,0 +1,196 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Decode-once audio front-end for the STT backends.
+
+Inputs short enough to be held whole are decoded, downmixed and resampled to
+the model rate exactly once; the models, the language probes and the result
+metadata all consume that :class:`DecodedAudio` instead of handing the file
+back to a model to decode again. Decodes are memoized for the request being
+handled (see ``decode_scope``) and, by content hash, across requests in a
+small in-memory LRU (QWEN_ASR_DECODE_CACHE_MB, 0 disables it).
+
+Longer recordings are not decoded whole; the chunk engine streams them.
+"""
+
+import hashlib
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Any, Dict, Iterator, Optional, Tuple, Union
+
+import numpy as np
+
+import metrics
+from audio_io import open_audio_reader, resample
+from cache import hash_file
+from config import DECODE_CACHE_MAX_MB
+from downloads import download_for
+
+# A local file path or in-memory ``(mono float32 samples, sample_rate)``.
+AudioSource = Union[str, Tuple[Any, int]]
+
+
+@dataclass
+class DecodedAudio:
+    # Mono float32 at ``sample_rate``.
+    samples: np.ndarray
+    sample_rate: int
+    # Rate and duration of the original input.
+    source_rate: int
+    duration: float
+
+    @property
+    def nbytes(self) -> int:
+        return int(self.samples.nbytes)
+
+
+class DecodeCache:
+    """Byte-bounded LRU of decoded audio keyed by content hash and rate."""
+
+    def __init__(self, max_bytes: int) -> None:
+        self.max_bytes = max(0, int(max_bytes))
+        self._entries: "OrderedDict[Tuple[str, int], DecodedAudio]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Tuple[str, int]) -> Optional[DecodedAudio]:
+        with self._lock:
+            decoded = self._entries.get(key)
+            if decoded is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return decoded
+
+    def put(self, key: Tuple[str, int], decoded: DecodedAudio) -> None:
+        if decoded.nbytes > self.max_bytes:
+            return
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._bytes -= previous.nbytes
+            self._entries[key] = decoded
+            self._bytes += decoded.nbytes
+            while self._bytes > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._bytes -= evicted.nbytes
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+            }
+
+
+decode_cache = DecodeCache(DECODE_CACHE_MAX_MB * 1024 * 1024)
+
+_local = threading.local()
+
+
+@contextmanager
+def decode_scope() -> Iterator[Dict[Any, Any]]:
+    """Memoize decodes and digests on this thread until the scope exits.
+
+    Nested scopes share the outermost memo.
+    """
+    outer: Optional[Dict[Any, Any]] = getattr(_local, "memo", None)
+    if outer is not None:
+        yield outer
+        return
+    memo: Dict[Any, Any] = {}
+    _local.memo = memo
+    try:
+        yield memo
+    finally:
+        _local.memo = None
+
+
+def _memo() -> Optional[Dict[Any, Any]]:
+    return getattr(_local, "memo", None)
+
+
+def _source_key(source: AudioSource) -> Tuple[Any, ...]:
+    if isinstance(source, str):
+        return ("path", source)
+    # The memo holds on to the samples, so their id cannot be reused.
+    return ("pcm", id(source[0]), int(source[1]))
+
+
+def audio_digest(source: AudioSource) -> str:
+    """SHA-256 of a file's bytes or of in-memory samples and their rate.
+
+    Downloads with an ETag or Last-Modified are named by URL and validator.
+    """
+    if isinstance(source, str):
+        download = download_for(source)
+        if download is not None:
+            if download.identity:
+                # The URL and its validator name the content before it arrives.
+                return download.identity
+            download.wait()
+        # hash_file memoizes by path, size and mtime itself.
+        return hash_file(source)
+    memo = _memo()
+    key = ("digest",) + _source_key(source)
+    if memo is not None and key in memo:
+        return memo[key][1]
+    samples, sample_rate = source
+    hasher = hashlib.sha256(str(int(sample_rate)).encode("ascii"))
+    hasher.update(memoryview(np.ascontiguousarray(samples)).cast("B"))
+    digest = hasher.hexdigest()
+    if memo is not None:
+        memo[key] = (samples, digest)
+    return digest
+
+
+def _decode(source: AudioSource, sample_rate: int) -> DecodedAudio:
+    if isinstance(source, str):
+        reader = open_audio_reader(source, sample_rate, stream=download_for(source))
+        blocks = list(reader.blocks())
+        samples = np.concatenate(blocks) if blocks else np.zeros(0, dtype=np.float32)
+        return DecodedAudio(samples, sample_rate, reader.native_rate, reader.duration)
+    data, source_rate = source
+    data = np.asarray(data, dtype=np.float32).reshape(-1)
+    return DecodedAudio(
+        resample(data, int(source_rate), sample_rate),
+        sample_rate,
+        int(source_rate),
+        len(data) / float(source_rate) if source_rate else 0.0,
+    )
+
+
+def decode_audio(source: AudioSource, sample_rate: int) -> DecodedAudio:
+    """Decode ``source`` to mono float32 at ``sample_rate``, at most once."""
+    memo = _memo()
+    memo_key = ("decoded", sample_rate) + _source_key(source)
+    if memo is not None and memo_key in memo:
+        return memo[memo_key][1]
+
+    cache_key = None
+    decoded = None
+    if decode_cache.max_bytes:
+        cache_key = (audio_digest(source), int(sample_rate))
+        decoded = decode_cache.get(cache_key)
+    if decoded is None:
+        with metrics.stage("decode"):
+            decoded = _decode(source, int(sample_rate))
+        if cache_key is not None:
+            decode_cache.put(cache_key, decoded)
+    if memo is not None:
+        memo[memo_key] = (source, decoded)
+    return decoded
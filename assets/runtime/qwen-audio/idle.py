@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Tiered idle policy for the audio runtime.
+
+Instead of exiting after a fixed idle period, the runtime first releases
+allocator caches, then evicts models while keeping the interpreter and the
+heavy imports warm, and only exits after a much longer idle period or when
+the machine runs low on memory.
+"""
+
+import gc
+import sys
+from typing import Any, Callable, Dict, Optional
+
+try:
+    import psutil  # type: ignore
+except ImportError:  # optional; /proc/meminfo is used on Linux without it
+    psutil = None
+
+STAGE_ACTIVE = "active"
+STAGE_CACHES_RELEASED = "caches_released"
+STAGE_MODELS_UNLOADED = "models_unloaded"
+STAGE_EXIT = "exit"
+# Pressure unloading waits this long when the cache-release tier is disabled.
+DEFAULT_PRESSURE_AFTER_SEC = 60.0
+
+
+def release_caches() -> None:
+    """Return cached allocator memory to the system without dropping models.
+
+    Only frameworks that are already imported are touched.
+    """
+    gc.collect()
+    torch = sys.modules.get("torch")
+    if torch is not None:
+        try:
+            if torch.cuda.is_available():
+                torch.cuda.empty_cache()
+        except Exception:
+            pass
+        try:
+            mps = getattr(torch, "mps", None)
+            if mps is not None and torch.backends.mps.is_available():
+                mps.empty_cache()
+        except Exception:
+            pass
+    mx = sys.modules.get("mlx.core")
+    if mx is not None:
+        try:
+            clear_cache = getattr(mx, "clear_cache", None) or mx.metal.clear_cache
+            clear_cache()
+        except Exception:
+            pass
+
+
+def available_memory_bytes() -> Optional[int]:
+    """Memory available to new allocations, or None when unknown."""
+    if psutil is not None:
+        try:
+            return int(psutil.virtual_memory().available)
+        except Exception:
+            pass
+    try:
+        with open("/proc/meminfo", "r", encoding="ascii") as src:
+            for line in src:
+                if line.startswith("MemAvailable:"):
+                    return int(line.split()[1]) * 1024
+    except (OSError, ValueError, IndexError):
+        pass
+    return None
+
+
+class IdlePolicy:
+    """Decide what to release for a given idle time.
+
+    ``tick`` is called periodically with the seconds since the last request
+    and performs each tier at most once per idle period. Passing the time of
+    the last request as ``last_active`` starts a new idle period whenever it
+    has moved since the previous tick, so a request that ran entirely between
+    two ticks is not missed. A tier set to 0 is disabled.
+
+    Memory pressure unloads models early, but only once the runtime has been
+    idle for ``release_after`` seconds: a model that was just used is likely
+    to be used again, and loading it may be what lowered available memory.
+    """
+
+    def __init__(
+        self,
+        release_after: float,
+        unload_after: float,
+        exit_after: float,
+        min_available_bytes: int = 0,
+        release: Callable[[], None] = release_caches,
+        unload: Callable[[], Any] = lambda: None,
+        has_models: Callable[[], bool] = lambda: False,
+        available_memory: Callable[[], Optional[int]] = available_memory_bytes,
+    ) -> None:
+        self.release_after = release_after
+        self.unload_after = unload_after
+        self.exit_after = exit_after
+        self.min_available_bytes = max(0, int(min_available_bytes))
+        self.pressure_after = release_after if release_after > 0 else DEFAULT_PRESSURE_AFTER_SEC
+        self._release = release
+        self._unload = unload
+        self._has_models = has_models
+        self._available_memory = available_memory
+        self.stage = STAGE_ACTIVE
+        self.reason: Optional[str] = None
+        self._last_active: Optional[float] = None
+
+    def reset(self) -> None:
+        self.stage = STAGE_ACTIVE
+        self.reason = None
+
+    def _reached(self, limit: float, idle_sec: float) -> bool:
+        return limit > 0 and idle_sec >= limit
+
+    def _under_pressure(self) -> bool:
+        if not self.min_available_bytes:
+            return False
+        available = self._available_memory()
+        return available is not None and available < self.min_available_bytes
+
+    def tick(self, idle_sec: float, last_active: Optional[float] = None) -> str:
+        """Apply the tier for ``idle_sec`` and return the resulting stage."""
+        if self.stage == STAGE_EXIT:
+            return self.stage
+        if last_active is not None and last_active != self._last_active:
+            if self._last_active is not None:
+                self.reset()
+            self._last_active = last_active
+
+        if idle_sec >= self.pressure_after and self._under_pressure():
+            if self._has_models():
+                self._unload()
+                self._release()
+                self._advance(STAGE_MODELS_UNLOADED, "memory_pressure")
+            else:
+                # Nothing left to drop but the interpreter itself.
+                self._advance(STAGE_EXIT, "memory_pressure")
+            return self.stage
+
+        if self._reached(self.exit_after, idle_sec):
+            self._advance(STAGE_EXIT, "idle")
+        elif self._reached(self.unload_after, idle_sec):
+            if self.stage != STAGE_MODELS_UNLOADED:
+                self._unload()
+                self._release()
+                self._advance(STAGE_MODELS_UNLOADED, "idle")
+        elif self._reached(self.release_after, idle_sec):
+            if self.stage == STAGE_ACTIVE:
+                self._release()
+                self._advance(STAGE_CACHES_RELEASED, "idle")
+        return self.stage
+
+    def _advance(self, stage: str, reason: str) -> None:
+        self.stage = stage
+        self.reason = reason
+
+    def status(self) -> Dict[str, Any]:
+        return {
+            "stage": self.stage,
+            "reason": self.reason,
+            "release_after_sec": self.release_after,
+            "unload_after_sec": self.unload_after,
+            "exit_after_sec": self.exit_after,
+            "min_available_bytes": self.min_available_bytes,
+            "pressure_after_sec": self.pressure_after,
+        }
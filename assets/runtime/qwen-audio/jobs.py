@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Background jobs for long control operations such as model loading.
+
+A job is submitted through a protocol method that returns immediately with the
+job snapshot; the host polls ``job_status`` with the returned ``job_id``.
+"""
+
+import threading
+import time
+import traceback
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional
+
+JOB_QUEUED = "queued"
+JOB_RUNNING = "running"
+JOB_DONE = "done"
+JOB_ERROR = "error"
+
+
+class JobManager:
+    def __init__(
+        self,
+        workers: int = 1,
+        history: int = 64,
+        on_start: Optional[Callable[[], None]] = None,
+        on_finish: Optional[Callable[[], None]] = None,
+    ) -> None:
+        self._executor = ThreadPoolExecutor(
+            max_workers=max(1, int(workers)), thread_name_prefix="qwen-audio-job"
+        )
+        self._history = max(1, int(history))
+        self._jobs: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._on_start = on_start
+        self._on_finish = on_finish
+
+    def submit(self, kind: str, fn: Callable[[], Any]) -> Dict[str, Any]:
+        job_id = uuid.uuid4().hex[:12]
+        job: Dict[str, Any] = {
+            "job_id": job_id,
+            "kind": kind,
+            "status": JOB_QUEUED,
+            "created": time.time(),
+            "started": None,
+            "finished": None,
+            "result": None,
+            "error": None,
+        }
+        with self._lock:
+            self._jobs[job_id] = job
+            self._trim()
+        # Counted as busy from submission so the idle watchdog leaves it alone.
+        if self._on_start is not None:
+            self._on_start()
+        try:
+            self._executor.submit(self._run, job, fn)
+        except Exception:
+            if self._on_finish is not None:
+                self._on_finish()
+            raise
+        return self.status(job_id)
+
+    def _run(self, job: Dict[str, Any], fn: Callable[[], Any]) -> None:
+        with self._lock:
+            job["status"] = JOB_RUNNING
+            job["started"] = time.time()
+        outcome: Dict[str, Any] = {}
+        try:
+            outcome["result"] = fn()
+            outcome["status"] = JOB_DONE
+        except Exception as exc:
+            outcome["status"] = JOB_ERROR
+            outcome["error"] = str(exc)
+            outcome["traceback"] = traceback.format_exc()
+        finally:
+            if self._on_finish is not None:
+                self._on_finish()
+            # Published last so a finished status implies the hooks ran.
+            with self._lock:
+                job.update(outcome, finished=time.time())
+
+    def _trim(self) -> None:
+        # Called with self._lock held; only finished jobs are forgotten.
+        finished = [
+            job_id
+            for job_id, job in self._jobs.items()
+            if job["status"] in {JOB_DONE, JOB_ERROR}
+        ]
+        while len(self._jobs) > self._history and finished:
+            self._jobs.pop(finished.pop(0), None)
+
+    def status(self, job_id: str) -> Dict[str, Any]:
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None:
+                raise ValueError(f"unknown job: {job_id}")
+            return dict(job)
+
+    def jobs(self) -> List[Dict[str, Any]]:
+        with self._lock:
+            return [dict(job) for job in self._jobs.values()]
+
+    def wait(self, job_id: str, timeout: Optional[float] = None) -> Dict[str, Any]:
+        deadline = None if timeout is None else time.time() + timeout
+        while True:
+            job = self.status(job_id)
+            if job["status"] in {JOB_DONE, JOB_ERROR}:
+                return job
+            if deadline is not None and time.time() >= deadline:
+                return job
+            time.sleep(0.01)
+
+    def shutdown(self, wait: bool = True) -> None:
+        self._executor.shutdown(wait=wait, cancel_futures=not wait)
@@ -6,7 +6,21 @@ Qwen audio persistent service (stdin/stdout JSON protocol).
 
 The JSON protocol remains compatible with the original single-file runtime:
 - method="predict" performs STT/ASR
-- method="tts" performs TTS with Qwen/MLX or Voxtral backends
+- method="predict_batch" transcribes many files in duration-bucketed batches
+- method="stream_open" / "stream_push" / "stream_close" run a live STT
+  session over pushed PCM frames, emitting "partial" and "final" events
+- method="tts" performs TTS with Qwen/MLX or Voxtral backends; with
+  params.stream it synthesizes sentence by sentence, appending to the output
+  and emitting a "segment" event (sample/byte offsets) as each is ready
+- predict/stream_push accept params.audio_pcm and tts accepts params.output_pcm:
+  raw PCM in a shared-memory block or memory-mapped file (see pcm_transport.py)
+- method="stats" returns rolling latency statistics per method and model and
+  the process's peak RSS; predict/tts add a per-stage "timings" block when params.timings is set
+- method="load" / "warmup" start a background job that loads (and warms up)
+  models; "job_status" polls it and "unload" evicts idle models
+
+Requests are dispatched to per-lane worker pools (see dispatcher.py), so
+responses may be written out of order; the host matches them by ``id``.
 """
 
 import json
@@ -16,21 +30,46 @@ import sys
 import threading
 import time
 import traceback
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Optional
 
 from config import (
+    CONTROL_WORKERS,
     DEFAULT_BACKEND,
     DEFAULT_DEVICE,
     DEFAULT_DTYPE,
-    DEFAULT_MAX_BATCH,
-    DEFAULT_MAX_NEW_TOKENS,
     DEFAULT_MLX_ALIGNER_MODEL,
     DEFAULT_MODEL,
+    DEFAULT_QUANTIZE,
     DEFAULT_QWEN_ALIGNER_MODEL,
+    IDLE_EXIT_SEC,
+    IDLE_RELEASE_CACHES_SEC,
     IDLE_TIMEOUT_SEC,
+    MAX_PENDING_PER_LANE,
+    MIN_AVAILABLE_MEMORY_MB,
+    STREAM_WORKERS,
+    STT_WORKERS,
+    TTS_WORKERS,
 )
-from stt import get_qwen_model, get_mlx_models, get_stt_status, method_predict, set_touch_callback
-from tts import get_tts_status, method_tts
+from dispatcher import CONTROL_LANE, STREAM_LANE, STT_LANE, TTS_LANE, RequestDispatcher
+from idle import STAGE_EXIT, IdlePolicy
+from jobs import JobManager
+from metrics import LatencyStats, process_peak_rss_bytes, recording
+from registry import model_registry, request_scope
+from stt import (
+    get_stt_status,
+    method_predict,
+    method_predict_batch,
+    preload_stt_model,
+    set_touch_callback,
+    warmup_stt,
+)
+from streaming import (
+    method_stream_close,
+    method_stream_open,
+    method_stream_push,
+    stream_manager,
+)
+from tts import get_tts_status, method_tts, preload_tts_model, warmup_tts
 
 
 if hasattr(sys.stdin, "reconfigure"):
@@ -45,6 +84,21 @@ _last_active = time.time()
 _last_active_lock = threading.Lock()
 _busy_count = 0
 _busy_lock = threading.Lock()
+_write_lock = threading.Lock()
+_dispatcher: Optional[RequestDispatcher] = None
+_jobs: Optional[JobManager] = None
+_jobs_lock = threading.Lock()
+_latency_stats = LatencyStats()
+# Methods whose latency is tracked by the ``stats`` method.
+_TIMED_METHODS = {"predict", "predict_batch", "tts"}
+_idle_policy = IdlePolicy(
+    release_after=IDLE_RELEASE_CACHES_SEC,
+    unload_after=IDLE_TIMEOUT_SEC,
+    exit_after=IDLE_EXIT_SEC,
+    min_available_bytes=MIN_AVAILABLE_MEMORY_MB * 1024 * 1024,
+    unload=lambda: model_registry.evict(),
+    has_models=lambda: bool(model_registry.keys()),
+)
 
 
 def touch() -> None:
@@ -75,17 +129,21 @@ def _is_busy() -> bool:
 def watchdog() -> None:
     while True:
         time.sleep(1)
+        stream_manager.expire()
         if _is_busy():
+            _idle_policy.reset()
             continue
         with _last_active_lock:
-            idle = time.time() - _last_active
-        if idle > IDLE_TIMEOUT_SEC:
+            last_active = _last_active
+        if _idle_policy.tick(time.time() - last_active, last_active) == STAGE_EXIT:
             os.kill(os.getpid(), signal.SIGTERM)
 
 
 def _json_write(obj: Dict[str, Any]) -> None:
-    sys.stdout.write(json.dumps(obj, ensure_ascii=False) + "\n")
-    sys.stdout.flush()
+    line = json.dumps(obj, ensure_ascii=False) + "\n"
+    with _write_lock:
+        sys.stdout.write(line)
+        sys.stdout.flush()
 
 
 def _err(id_: Optional[str], err: str, tb: Optional[str] = None) -> None:
@@ -99,6 +157,11 @@ def _ok(id_: Optional[str], result: Any) -> None:
     _json_write({"id": id_, "ok": True, "result": result})
 
 
+def _event(id_: Optional[str], event: str, payload: Dict[str, Any]) -> None:
+    # Events carry no "ok" field; the final ok/error message ends the request.
+    _json_write({"id": id_, "event": event, **payload})
+
+
 def method_ping(_params: Dict[str, Any]) -> Dict[str, Any]:
     stt_status = get_stt_status()
     tts_status = get_tts_status()
@@ -109,30 +172,181 @@ def method_ping(_params: Dict[str, Any]) -> Dict[str, Any]:
         "default_backend": DEFAULT_BACKEND,
         "default_device": DEFAULT_DEVICE,
         "default_dtype": DEFAULT_DTYPE,
+        "default_quantize": DEFAULT_QUANTIZE or None,
         "default_qwen_aligner_model": DEFAULT_QWEN_ALIGNER_MODEL,
         "default_mlx_aligner_model": DEFAULT_MLX_ALIGNER_MODEL,
         **stt_status,
         **tts_status,
+        "lanes": _dispatcher.status() if _dispatcher is not None else {},
+        "stream_sessions": stream_manager.count(),
+        "models": model_registry.stats(),
+        "idle": _idle_policy.status(),
+    }
+
+
+def _model_specs(params: Dict[str, Any]) -> List[Dict[str, Any]]:
+    specs = params.get("models")
+    if specs is None:
+        specs = [params]
+    if not isinstance(specs, list) or not specs:
+        raise ValueError("params.models must be a non-empty list")
+    for spec in specs:
+        if not isinstance(spec, dict) or spec.get("type") not in {"stt", "tts"}:
+            raise ValueError('each model spec needs "type": "stt" or "tts"')
+    return specs
+
+
+def _load_models(specs: List[Dict[str, Any]], warmup: bool) -> Dict[str, Any]:
+    loaded = []
+    # Pin the models until the whole batch is loaded so a later spec cannot
+    # evict an earlier one.
+    with request_scope() as keys:
+        for spec in specs:
+            params = {k: v for k, v in spec.items() if k != "type"}
+            if spec["type"] == "stt":
+                info = warmup_stt(params) if warmup else preload_stt_model(params)
+            else:
+                info = warmup_tts(params) if warmup else preload_tts_model(params)
+            loaded.append({"type": spec["type"], **info})
+            touch()
+        return {"models": loaded, "keys": sorted(keys)}
+
+
+def _get_jobs() -> JobManager:
+    global _jobs
+    with _jobs_lock:
+        if _jobs is None:
+            _jobs = JobManager(on_start=begin_busy, on_finish=end_busy)
+        return _jobs
+
+
+def method_load(params: Dict[str, Any], warmup: bool = False) -> Dict[str, Any]:
+    """Load (and optionally warm up) models in the background.
+
+    Returns the job snapshot immediately unless ``params.wait`` is set; poll
+    ``job_status`` with its ``job_id``.
+    """
+    specs = _model_specs(params)
+    warmup = warmup or bool(params.get("warmup", False))
+    jobs = _get_jobs()
+    job = jobs.submit("warmup" if warmup else "load", lambda: _load_models(specs, warmup))
+    if params.get("wait"):
+        return jobs.wait(job["job_id"])
+    return job
+
+
+def method_unload(params: Dict[str, Any]) -> Dict[str, Any]:
+    keys = params.get("keys")
+    kind = params.get("type")
+    if keys:
+        evicted = [key for k in keys for key in model_registry.evict(key=k)]
+    else:
+        evicted = model_registry.evict(kind=kind)
+    return {"evicted": evicted, "models": model_registry.stats()["models"]}
+
+
+def method_job_status(params: Dict[str, Any]) -> Dict[str, Any]:
+    job_id = params.get("job_id")
+    if job_id:
+        return _get_jobs().status(job_id)
+    return {"jobs": _get_jobs().jobs()}
+
+
+def method_stats(_params: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        "latency": _latency_stats.snapshot(),
+        "models": model_registry.stats(),
+        "process_peak_rss_bytes": process_peak_rss_bytes(),
     }
 
 
 def handle_request(req: Dict[str, Any]) -> Dict[str, Any]:
+    req_id = req.get("id")
     method = req.get("method")
     params = req.get("params") or {}
 
+    def emit(event: str, payload: Dict[str, Any]) -> None:
+        touch()
+        _event(req_id, event, payload)
+
     if method == "ping":
         return method_ping(params)
     if method == "predict":
-        return method_predict(params)
+        return method_predict(params, emit=emit)
+    if method == "predict_batch":
+        return method_predict_batch(params, emit=emit)
+    if method == "stream_open":
+        return method_stream_open(params)
+    if method == "stream_push":
+        return method_stream_push(params, emit=emit)
+    if method == "stream_close":
+        return method_stream_close(params, emit=emit)
     if method == "tts":
-        return method_tts(params)
+        return method_tts(params, emit=emit)
+    if method == "load":
+        return method_load(params)
+    if method == "warmup":
+        return method_load(params, warmup=True)
+    if method == "unload":
+        return method_unload(params)
+    if method == "job_status":
+        return method_job_status(params)
+    if method == "stats":
+        return method_stats(params)
 
     raise ValueError(f"unknown method: {method}")
 
 
+def _run_request(req: Dict[str, Any]) -> None:
+    req_id = req.get("id")
+    method = req.get("method")
+    params = req.get("params") or {}
+    try:
+        # Models fetched while handling the request stay pinned until it ends.
+        with request_scope(), recording() as timings:
+            try:
+                result = handle_request(req)
+            except Exception:
+                if method in _TIMED_METHODS:
+                    _latency_stats.observe(method, params.get("model"), {}, ok=False)
+                raise
+        if method in _TIMED_METHODS and isinstance(result, dict):
+            report = timings.as_dict(audio_sec=result.get("duration"))
+            _latency_stats.observe(method, result.get("model"), report)
+            if params.get("timings"):
+                result["timings"] = report
+        _ok(req_id, result)
+    except Exception as exc:
+        _err(req_id, str(exc), traceback.format_exc())
+    finally:
+        end_busy()
+
+
+def _dispatch_line(dispatcher: RequestDispatcher, line: str) -> None:
+    try:
+        req = json.loads(line)
+    except Exception as exc:
+        _err(None, str(exc), traceback.format_exc())
+        return
+    if not isinstance(req, dict):
+        _err(None, "request must be a JSON object")
+        return
+
+    begin_busy()
+    try:
+        dispatcher.submit(req.get("method"), lambda: _run_request(req))
+    except Exception as exc:
+        end_busy()
+        _err(req.get("id"), str(exc))
+
+
 def main() -> None:
+    global _dispatcher
+
     def _handle_term(_signum: int, _frame: Any) -> None:
-        raise SystemExit(0)
+        # Worker threads may be deep inside a model call; do not wait for them.
+        sys.stdout.flush()
+        os._exit(0)
 
     signal.signal(signal.SIGTERM, _handle_term)
     signal.signal(signal.SIGINT, _handle_term)
@@ -143,43 +357,29 @@ def main() -> None:
     prewarm = os.environ.get("QWEN_ASR_PREWARM", "0").strip() != "0"
 
     if prewarm:
-        try:
-            if DEFAULT_BACKEND in {"mlx", "mlx_audio", "mlx-audio"}:
-                get_mlx_models(DEFAULT_MODEL, DEFAULT_MLX_ALIGNER_MODEL)
-            else:
-                get_qwen_model(
-                    model_name=DEFAULT_MODEL,
-                    backend=DEFAULT_BACKEND,
-                    device=DEFAULT_DEVICE,
-                    dtype=DEFAULT_DTYPE,
-                    max_batch=DEFAULT_MAX_BATCH,
-                    max_new_tokens=DEFAULT_MAX_NEW_TOKENS,
-                    forced_aligner=DEFAULT_QWEN_ALIGNER_MODEL,
-                    forced_aligner_kwargs=None,
-                )
-        except Exception:
-            traceback.print_exc(file=sys.stderr)
-
-    for line in sys.stdin:
-        line = line.strip()
-        if not line:
-            continue
-        touch()
-        begin_busy()
-        try:
-            req = json.loads(line)
-            req_id = req.get("id")
-            result = handle_request(req)
-            _ok(req_id, result)
-        except Exception as exc:
-            req_id = None
-            try:
-                req_id = json.loads(line).get("id")
-            except Exception:
-                pass
-            _err(req_id, str(exc), traceback.format_exc())
-        finally:
-            end_busy()
+        # Loads in the background while requests are already being served.
+        method_load({"models": [{"type": "stt", "return_time_stamps": True}]})
+
+    _dispatcher = RequestDispatcher(
+        lane_workers={
+            STT_LANE: STT_WORKERS,
+            TTS_LANE: TTS_WORKERS,
+            STREAM_LANE: STREAM_WORKERS,
+            CONTROL_LANE: CONTROL_WORKERS,
+        },
+        max_pending=MAX_PENDING_PER_LANE,
+    )
+
+    try:
+        for line in sys.stdin:
+            line = line.strip()
+            if not line:
+                continue
+            touch()
+            _dispatch_line(_dispatcher, line)
+    finally:
+        _dispatcher.shutdown(wait=True)
+        _get_jobs().shutdown(wait=False)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,211 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Per-request stage timings and rolling latency statistics.
+
+A recorder is bound to the thread handling a request; code anywhere below it
+wraps work in ``stage("asr")`` etc. Stages nest and report self time, so a
+``synth`` stage that triggers a model load does not count the load twice.
+Worker threads that act on behalf of a request re-bind its recorder with
+``bound``.
+"""
+
+import math
+import sys
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Any, Deque, Dict, Iterable, Iterator, List, Optional, Tuple
+
+try:
+    import resource  # type: ignore
+except ImportError:  # Windows
+    resource = None
+
+# Upper bounds (milliseconds) of the latency histogram buckets.
+LATENCY_BUCKETS_MS = (
+    50, 100, 250, 500, 1000, 2500, 5000, 10000, 30000, 60000, 120000, 300000
+)
+STATS_WINDOW = 512
+
+_local = threading.local()
+
+
+class Timings:
+    def __init__(self) -> None:
+        self.started = time.perf_counter()
+        self.stages: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def add(self, name: str, seconds: float) -> None:
+        with self._lock:
+            self.stages[name] = self.stages.get(name, 0.0) + max(0.0, seconds)
+
+    def as_dict(self, audio_sec: Optional[float] = None) -> Dict[str, Any]:
+        total = time.perf_counter() - self.started
+        with self._lock:
+            out: Dict[str, Any] = {
+                f"{name}_sec": round(value, 4) for name, value in self.stages.items()
+            }
+        out["total_sec"] = round(total, 4)
+        out["rtf"] = round(total / audio_sec, 4) if audio_sec else None
+        return out
+
+
+def process_peak_rss_bytes() -> Optional[int]:
+    """Peak resident set size over the life of this process, or None where unsupported.
+
+    This is a high-water mark that never goes down, so it describes the
+    process rather than any one request.
+    """
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on macOS and kilobytes on Linux.
+    return int(peak if sys.platform == "darwin" else peak * 1024)
+
+
+def current() -> Optional[Timings]:
+    return getattr(_local, "timings", None)
+
+
+@contextmanager
+def bound(timings: Optional[Timings]) -> Iterator[Optional[Timings]]:
+    """Record into ``timings`` on this thread for the duration of the block."""
+    previous = current()
+    previous_stack = getattr(_local, "stack", None)
+    _local.timings = timings
+    _local.stack = []
+    try:
+        yield timings
+    finally:
+        _local.timings = previous
+        _local.stack = previous_stack
+
+
+@contextmanager
+def recording() -> Iterator[Timings]:
+    with bound(Timings()) as timings:
+        yield timings  # type: ignore[misc]
+
+
+@contextmanager
+def stage(name: str) -> Iterator[None]:
+    timings = current()
+    if timings is None:
+        yield
+        return
+    stack: List[float] = _local.stack
+    started = time.perf_counter()
+    stack.append(0.0)
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - started
+        nested = stack.pop()
+        timings.add(name, elapsed - nested)
+        if stack:
+            stack[-1] += elapsed
+
+
+_DONE = object()
+
+
+def timed_iter(name: str, iterable: Iterable[Any]) -> Iterator[Any]:
+    """Yield from ``iterable``, counting the time spent producing items.
+
+    The recorder is captured here, so the iterator may be consumed on another
+    thread (e.g. the chunk pipeline) and still record into this request.
+    """
+    timings = current()
+
+    def _iterate() -> Iterator[Any]:
+        iterator = iter(iterable)
+        while True:
+            if current() is timings:
+                with stage(name):
+                    item = next(iterator, _DONE)
+            else:
+                with bound(timings), stage(name):
+                    item = next(iterator, _DONE)
+            if item is _DONE:
+                return
+            yield item
+
+    return _iterate()
+
+
+def _percentile(sorted_values: List[float], q: float) -> float:
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(math.ceil(q * len(sorted_values))) - 1)
+    return sorted_values[max(0, index)]
+
+
+class LatencyStats:
+    """Rolling latency window per (method, model)."""
+
+    def __init__(self, window: int = STATS_WINDOW) -> None:
+        self.window = window
+        self._samples: Dict[Tuple[str, str], Deque[Dict[str, Any]]] = {}
+        self._counts: Dict[Tuple[str, str], int] = {}
+        self._errors: Dict[Tuple[str, str], int] = {}
+        self._lock = threading.Lock()
+
+    def observe(
+        self,
+        method: str,
+        model: Optional[str],
+        timings: Dict[str, Any],
+        ok: bool = True,
+    ) -> None:
+        key = (method, model or "-")
+        with self._lock:
+            self._counts[key] = self._counts.get(key, 0) + 1
+            if not ok:
+                self._errors[key] = self._errors.get(key, 0) + 1
+                return
+            samples = self._samples.setdefault(key, deque(maxlen=self.window))
+            samples.append(timings)
+
+    def snapshot(self) -> Dict[str, Any]:
+        out: Dict[str, Any] = {}
+        with self._lock:
+            keys = sorted(set(self._counts))
+            windows = {key: list(self._samples.get(key, ())) for key in keys}
+            counts = dict(self._counts)
+            errors = dict(self._errors)
+        for key in keys:
+            method, model = key
+            samples = windows[key]
+            totals_ms = sorted(s.get("total_sec", 0.0) * 1000.0 for s in samples)
+            histogram = []
+            for bound_ms in LATENCY_BUCKETS_MS:
+                histogram.append(
+                    {"le_ms": bound_ms, "count": sum(1 for v in totals_ms if v <= bound_ms)}
+                )
+            histogram.append({"le_ms": None, "count": len(totals_ms)})
+            stage_means: Dict[str, float] = {}
+            for sample in samples:
+                for name, value in sample.items():
+                    if name.endswith("_sec") and name != "total_sec" and value is not None:
+                        stage_means[name] = stage_means.get(name, 0.0) + value
+            rtfs = [s["rtf"] for s in samples if s.get("rtf") is not None]
+            out.setdefault(method, {})[model] = {
+                "count": counts.get(key, 0),
+                "errors": errors.get(key, 0),
+                "window": len(totals_ms),
+                "p50_ms": round(_percentile(totals_ms, 0.5), 2),
+                "p90_ms": round(_percentile(totals_ms, 0.9), 2),
+                "p99_ms": round(_percentile(totals_ms, 0.99), 2),
+                "max_ms": round(totals_ms[-1], 2) if totals_ms else 0.0,
+                "histogram": histogram,
+                "mean_stage_sec": {
+                    name: round(total / len(samples), 4)
+                    for name, total in sorted(stage_means.items())
+                },
+                "mean_rtf": round(sum(rtfs) / len(rtfs), 4) if rtfs else None,
+            }
+        return out
@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Raw PCM handoff through shared memory or memory-mapped files.
+
+Instead of encoding audio to a file, the host describes a PCM buffer:
+
+    {"path": "/dev/shm/rec.pcm", "dtype": "int16", "sample_rate": 48000,
+     "channels": 1, "frames": 96000, "offset": 0}
+
+``path`` names any file and is memory-mapped (under /dev/shm it never
+touches the disk); ``name`` instead attaches an existing
+``multiprocessing.shared_memory`` block. Samples are interleaved
+little-endian ``int16`` or ``float32``; ``offset`` is in bytes and
+``frames`` defaults to the rest of the buffer.
+"""
+
+import mmap
+import os
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, Tuple
+
+import numpy as np
+
+from audio_io import resample, to_mono_float32
+
+# dtype name -> (little-endian NumPy dtype, full-scale value)
+PCM_DTYPES: Dict[str, Tuple[str, float]] = {
+    "int16": ("<i2", 32768.0),
+    "float32": ("<f4", 1.0),
+}
+
+
+def _dtype(spec: Dict[str, Any]) -> Tuple[np.dtype, float]:
+    name = spec.get("dtype") or "int16"
+    if name not in PCM_DTYPES:
+        raise ValueError(f"unsupported pcm dtype: {name}, expected int16 or float32")
+    np_dtype, scale = PCM_DTYPES[name]
+    return np.dtype(np_dtype), scale
+
+
+def _check_spec(spec: Any) -> Dict[str, Any]:
+    if not isinstance(spec, dict):
+        raise ValueError("pcm buffer must be an object with path or name")
+    if bool(spec.get("path")) == bool(spec.get("name")):
+        raise ValueError("pcm buffer needs exactly one of path or name")
+    return spec
+
+
+def _attach_shared_memory(name: str) -> Any:
+    from multiprocessing import shared_memory
+
+    try:
+        return shared_memory.SharedMemory(name=name, track=False)
+    except TypeError:
+        # Before Python 3.13 attaching registers the block with the resource
+        # tracker, which would unlink the host's block when this process exits.
+        shm = shared_memory.SharedMemory(name=name)
+        if os.name == "posix":
+            from multiprocessing import resource_tracker
+
+            resource_tracker.unregister(shm._name, "shared_memory")  # type: ignore[attr-defined]
+        return shm
+
+
+@contextmanager
+def _mapped(spec: Dict[str, Any]) -> Iterator[Any]:
+    """Read-only bytes of the buffer ``spec`` names, mapped rather than copied."""
+    if spec.get("name"):
+        try:
+            shm = _attach_shared_memory(spec["name"])
+        except FileNotFoundError as exc:
+            raise FileNotFoundError(f"shared memory block not found: {spec['name']}") from exc
+        try:
+            yield shm.buf
+        finally:
+            shm.close()
+        return
+    path = spec["path"]
+    if not os.path.isfile(path):
+        raise FileNotFoundError(f"pcm buffer not found: {path}")
+    if os.path.getsize(path) == 0:
+        yield b""
+        return
+    with open(path, "rb") as src, mmap.mmap(src.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+        yield mapped
+
+
+def _frame_count(available_bytes: int, dtype: np.dtype, channels: int, frames: Any) -> int:
+    available = max(0, available_bytes) // (dtype.itemsize * channels)
+    if frames is None:
+        return available
+    if int(frames) > available:
+        raise ValueError(f"pcm buffer holds {available} frames, {frames} requested")
+    return int(frames)
+
+
+def read_pcm(spec: Any) -> Tuple[np.ndarray, int]:
+    """Copy a host PCM buffer out as ``(mono float32 samples, sample_rate)``."""
+    spec = _check_spec(spec)
+    dtype, scale = _dtype(spec)
+    channels = max(1, int(spec.get("channels", 1)))
+    offset = int(spec.get("offset", 0))
+    if not spec.get("sample_rate"):
+        raise ValueError("pcm buffer needs sample_rate")
+    sample_rate = int(spec["sample_rate"])
+
+    def _decode(raw: np.ndarray) -> np.ndarray:
+        samples = raw.astype(np.float32)
+        if scale != 1.0:
+            samples /= scale
+        if channels > 1:
+            samples = to_mono_float32(samples.reshape(-1, channels))
+        return samples
+
+    with _mapped(spec) as buf:
+        frames = _frame_count(len(buf) - offset, dtype, channels, spec.get("frames"))
+        raw = np.frombuffer(buf, dtype=dtype, count=frames * channels, offset=offset)
+        try:
+            return _decode(raw), sample_rate
+        finally:
+            # The view must go before the mapping can be closed.
+            del raw
+
+
+def write_pcm(
+    spec: Any, samples: np.ndarray, sample_rate: int, truncate: bool = True
+) -> Dict[str, Any]:
+    """Write mono audio into a host PCM buffer and describe what was written.
+
+    With ``spec.sample_rate`` the audio is resampled to it first. A ``path``
+    is created (or truncated) to fit, or with ``truncate=False`` written in
+    place after what it already holds; a shared-memory ``name`` must already
+    be large enough.
+    """
+    spec = _check_spec(spec)
+    dtype, scale = _dtype(spec)
+    offset = int(spec.get("offset", 0))
+    target_rate = int(spec.get("sample_rate") or sample_rate)
+    samples = resample(np.asarray(samples, dtype=np.float32).reshape(-1), sample_rate, target_rate)
+    if scale != 1.0:
+        pcm = np.clip(np.round(samples * scale), -scale, scale - 1).astype(dtype)
+    else:
+        pcm = samples.astype(dtype)
+    data = pcm.tobytes()
+
+    if spec.get("name"):
+        shm = _attach_shared_memory(spec["name"])
+        try:
+            if offset + len(data) > shm.size:
+                raise ValueError(
+                    f"shared memory block {spec['name']} holds {shm.size} bytes, "
+                    f"{offset + len(data)} needed"
+                )
+            shm.buf[offset : offset + len(data)] = data
+        finally:
+            shm.close()
+    else:
+        mode = "r+b" if not truncate and os.path.exists(spec["path"]) else "wb"
+        with open(spec["path"], mode) as dst:
+            dst.seek(offset)
+            dst.write(data)
+
+    out: Dict[str, Any] = {
+        "dtype": spec.get("dtype") or "int16",
+        "sample_rate": target_rate,
+        "channels": 1,
+        "frames": len(pcm),
+        "offset": offset,
+    }
+    out["name" if spec.get("name") else "path"] = spec.get("name") or spec["path"]
+    return out
+
@@ -0,0 +1,350 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Resident model registry shared by the STT and TTS backends.
+
+Models are kept loaded under a memory budget and evicted least recently used
+first. Models used by a request that is still running are pinned through a
+per-thread request scope and are never evicted underneath it.
+"""
+
+import gc
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Optional, Set
+
+import metrics
+from config import MAX_RESIDENT_MODELS, MODEL_MEMORY_BUDGET_MB
+
+
+# Wrapper objects are searched this many attributes deep for models.
+_MAX_WRAPPER_DEPTH = 8
+
+
+def _tensor_bytes(value: Any, seen: Set[Any]) -> int:
+    """Bytes of a torch tensor, or of the tensors in a (nested) tuple/list.
+
+    Quantized ``Linear`` layers store their packed weights as a tuple in
+    ``state_dict()``; tensors sharing storage are counted once.
+    """
+    if isinstance(value, (tuple, list)):
+        return sum(_tensor_bytes(item, seen) for item in value)
+    if not callable(getattr(value, "numel", None)) or not callable(
+        getattr(value, "element_size", None)
+    ):
+        return 0
+    try:
+        key = ("tensor", value.data_ptr(), value.numel())
+    except Exception:
+        key = ("tensor", id(value), 0)
+    if key in seen:
+        return 0
+    seen.add(key)
+    try:
+        return int(value.numel()) * int(value.element_size())
+    except Exception:
+        return 0
+
+
+def _module_bytes(obj: Any, seen: Set[Any]) -> int:
+    # torch.nn.Module: state_dict() covers every submodule, buffers and the
+    # packed weights of dynamically quantized layers.
+    if callable(getattr(obj, "named_parameters", None)) and callable(
+        getattr(obj, "buffers", None)
+    ):
+        try:
+            state_dict = getattr(obj, "state_dict", None)
+            if callable(state_dict):
+                tensors = list(state_dict(keep_vars=True).values())
+            else:
+                tensors = list(obj.parameters()) + list(obj.buffers())
+            return sum(_tensor_bytes(t, seen) for t in tensors)
+        except Exception:
+            return 0
+    # mlx.nn.Module: parameters() is a nested dict of arrays.
+    parameters = getattr(obj, "parameters", None)
+    if callable(parameters):
+        try:
+            from mlx.utils import tree_flatten  # type: ignore
+
+            return sum(int(v.nbytes) for _, v in tree_flatten(parameters()))
+        except Exception:
+            return 0
+    return 0
+
+
+def _walk_bytes(obj: Any, seen: Set[Any], depth: int) -> int:
+    if id(obj) in seen or isinstance(obj, (str, bytes, int, float, bool, type(None))):
+        return 0
+    seen.add(id(obj))
+    size = _module_bytes(obj, seen)
+    if size or depth >= _MAX_WRAPPER_DEPTH:
+        return size
+    if isinstance(obj, dict):
+        children = list(obj.values())
+    elif isinstance(obj, (list, tuple, set)):
+        children = list(obj)
+    else:
+        children = list(getattr(obj, "__dict__", {}).values())
+    return sum(_walk_bytes(child, seen, depth + 1) for child in children)
+
+
+def estimate_model_bytes(model: Any) -> int:
+    """Best-effort size of a model's weights; 0 when it cannot be determined.
+
+    Wrapper objects (e.g. ``Qwen3ASRModel`` around a transformers model and
+    its forced aligner) are searched recursively through their attributes
+    and containers; shared modules and tensors are counted once.
+    """
+    return _walk_bytes(model, set(), 0)
+
+
+def _default_budget_bytes() -> int:
+    if MODEL_MEMORY_BUDGET_MB > 0:
+        return MODEL_MEMORY_BUDGET_MB * 1024 * 1024
+    # Half of physical memory where it can be read cheaply; unbounded otherwise
+    # (the resident model count still applies).
+    try:
+        return int(os.sysconf("SC_PAGE_SIZE") * os.sysconf("SC_PHYS_PAGES") // 2)
+    except (AttributeError, ValueError, OSError):
+        return 0
+
+
+class _Entry:
+    def __init__(self, key: str, kind: str, model: Any, size: int, load_sec: float) -> None:
+        self.key = key
+        self.kind = kind
+        self.model = model
+        self.bytes = size
+        self.load_sec = load_sec
+        self.refs = 0
+        self.hits = 0
+        self.last_used = time.time()
+
+
+class ModelRegistry:
+    def __init__(self, budget_bytes: int = 0, max_models: int = 0) -> None:
+        self.budget_bytes = max(0, int(budget_bytes))
+        self.max_models = max(0, int(max_models))
+        self._entries: "OrderedDict[str, _Entry]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._load_locks: Dict[str, threading.Lock] = {}
+        # Sizes of models seen before, used to make room ahead of a reload.
+        self._known_bytes: Dict[str, int] = {}
+        self._local = threading.local()
+        self.loads = 0
+        self.hits = 0
+        self.evictions = 0
+
+    def get(self, key: str, loader: Callable[[], Any], kind: str = "") -> Any:
+        """Return the model cached under ``key``, loading it on a miss."""
+        model = self._lookup(key)
+        if model is not None:
+            return model
+
+        with self._load_lock(key):
+            model = self._lookup(key)
+            if model is not None:
+                return model
+
+            self._make_room(self._known_bytes.get(key, 0), incoming_models=1)
+            started = time.perf_counter()
+            with metrics.stage("load"):
+                model = loader()
+            entry = _Entry(
+                key,
+                kind,
+                model,
+                estimate_model_bytes(model),
+                time.perf_counter() - started,
+            )
+            with self._lock:
+                self._entries[key] = entry
+                self._known_bytes[key] = entry.bytes
+                self.loads += 1
+                self._pin(entry)
+            logging.info(
+                "loaded %s model %s (%.1f MB, %.1fs)",
+                kind or "unknown",
+                key,
+                entry.bytes / (1024 * 1024),
+                entry.load_sec,
+            )
+            self._make_room(keep=key)
+            return model
+
+    def _load_lock(self, key: str) -> threading.Lock:
+        with self._lock:
+            return self._load_locks.setdefault(key, threading.Lock())
+
+    def _lookup(self, key: str) -> Any:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            self._entries.move_to_end(key)
+            entry.last_used = time.time()
+            entry.hits += 1
+            self.hits += 1
+            self._pin(entry)
+            return entry.model
+
+    def _pin(self, entry: _Entry) -> None:
+        # Called with self._lock held.
+        held: Optional[Set[str]] = getattr(self._local, "held", None)
+        if held is not None and entry.key not in held:
+            held.add(entry.key)
+            entry.refs += 1
+
+    @contextmanager
+    def request_scope(self) -> Iterator[Set[str]]:
+        """Pin every model fetched on this thread until the scope exits.
+
+        Yields the set of registry keys pinned so far.
+        """
+        outer: Optional[Set[str]] = getattr(self._local, "held", None)
+        if outer is not None:
+            yield outer
+            return
+        held: Set[str] = set()
+        self._local.held = held
+        try:
+            yield held
+        finally:
+            self._local.held = None
+            with self._lock:
+                for key in held:
+                    entry = self._entries.get(key)
+                    if entry is not None and entry.refs > 0:
+                        entry.refs -= 1
+            self._make_room()
+
+    def retain(self, model: Any) -> Callable[[], None]:
+        """Pin the entry holding ``model`` beyond the current request.
+
+        Returns a function that drops the pin again (calling it more than once
+        is harmless). Models the registry does not hold are not tracked.
+        """
+        with self._lock:
+            entry = next((e for e in self._entries.values() if e.model is model), None)
+            if entry is None:
+                return lambda: None
+            entry.refs += 1
+        released = threading.Event()
+
+        def _release() -> None:
+            if released.is_set():
+                return
+            released.set()
+            with self._lock:
+                if entry.refs > 0:
+                    entry.refs -= 1
+            self._make_room()
+
+        return _release
+
+    def _over_budget(self, incoming_bytes: int, incoming_models: int) -> bool:
+        if self.max_models and len(self._entries) + incoming_models > self.max_models:
+            return True
+        if not self.budget_bytes:
+            return False
+        resident = sum(entry.bytes for entry in self._entries.values())
+        return resident + incoming_bytes > self.budget_bytes
+
+    def _make_room(
+        self,
+        incoming_bytes: int = 0,
+        incoming_models: int = 0,
+        keep: Optional[str] = None,
+    ) -> None:
+        evicted: List[_Entry] = []
+        with self._lock:
+            while self._over_budget(incoming_bytes, incoming_models):
+                victim = next(
+                    (
+                        entry
+                        for entry in self._entries.values()
+                        if entry.refs == 0 and entry.key != keep
+                    ),
+                    None,
+                )
+                if victim is None:
+                    break
+                del self._entries[victim.key]
+                evicted.append(victim)
+                self.evictions += 1
+        self._drop(evicted)
+
+    def evict(self, key: Optional[str] = None, kind: Optional[str] = None) -> List[str]:
+        """Drop idle models matching ``key`` / ``kind`` (all idle models if neither)."""
+        with self._lock:
+            evicted = [
+                entry
+                for entry in self._entries.values()
+                if entry.refs == 0
+                and (key is None or entry.key == key)
+                and (kind is None or entry.kind == kind)
+            ]
+            for entry in evicted:
+                del self._entries[entry.key]
+            self.evictions += len(evicted)
+        self._drop(evicted)
+        return [entry.key for entry in evicted]
+
+    def _drop(self, evicted: List[_Entry]) -> None:
+        if not evicted:
+            return
+        for entry in evicted:
+            logging.info("evicted %s model %s", entry.kind or "unknown", entry.key)
+            entry.model = None
+        gc.collect()
+
+    def peek(self, key: str) -> Any:
+        with self._lock:
+            entry = self._entries.get(key)
+            return entry.model if entry is not None else None
+
+    def keys(self, kind: Optional[str] = None) -> List[str]:
+        """Resident keys, most recently used first."""
+        with self._lock:
+            return [
+                entry.key
+                for entry in reversed(self._entries.values())
+                if kind is None or entry.kind == kind
+            ]
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            entries = list(reversed(self._entries.values()))
+            return {
+                "budget_bytes": self.budget_bytes,
+                "max_models": self.max_models,
+                "resident_bytes": sum(entry.bytes for entry in entries),
+                "loads": self.loads,
+                "hits": self.hits,
+                "evictions": self.evictions,
+                "models": [
+                    {
+                        "key": entry.key,
+                        "kind": entry.kind,
+                        "bytes": entry.bytes,
+                        "refs": entry.refs,
+                        "hits": entry.hits,
+                        "load_sec": round(entry.load_sec, 3),
+                        "last_used": entry.last_used,
+                    }
+                    for entry in entries
+                ],
+            }
+
+
+model_registry = ModelRegistry(_default_budget_bytes(), MAX_RESIDENT_MODELS)
+
+
+def request_scope() -> Any:
+    return model_registry.request_scope()
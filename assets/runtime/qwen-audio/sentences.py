@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Sentence and clause splitting for segment-by-segment speech synthesis.
+
+Text is cut after sentence-final punctuation, full-width CJK marks included;
+ASCII marks only count before whitespace, so "3.5" and "a.m." stay whole,
+and closing quotes or brackets stay with their sentence. Sentences longer
+than ``max_tokens`` are re-cut at clause marks and packed back up to that
+length, and as a last resort between words (or CJK characters). Fragments
+shorter than ``min_tokens`` join the next piece so no model call is asked to
+say a single word, unless that would exceed ``max_tokens``. Lengths are
+counted in ``textutil.tokenize`` tokens: a word, or one CJK character.
+"""
+
+from typing import List, Set
+
+from textutil import tokenize
+
+SENTENCE_END = set("。！？!?.…\n")
+CLAUSE_MARKS = set("，,、；;：:")
+_ASCII_MARKS = set("!?.,;:")
+_CLOSING = set("\"'”’）)」』】》]")
+
+DEFAULT_SEGMENT_MAX_TOKENS = 40
+DEFAULT_SEGMENT_MIN_TOKENS = 4
+
+
+def _cut(text: str, marks: Set[str]) -> List[str]:
+    """Pieces of ``text`` ending after each run of ``marks`` (and closers)."""
+    pieces: List[str] = []
+    start = 0
+    i = 0
+    n = len(text)
+    while i < n:
+        ch = text[i]
+        i += 1
+        if ch not in marks:
+            continue
+        while i < n and (text[i] in marks or text[i] in _CLOSING):
+            i += 1
+        if ch in _ASCII_MARKS and i < n and not text[i].isspace():
+            continue
+        pieces.append(text[start:i])
+        start = i
+    if start < n:
+        pieces.append(text[start:])
+    return pieces
+
+
+def _length(text: str) -> int:
+    return len(tokenize(text))
+
+
+def _pack(pieces: List[str], max_tokens: int) -> List[str]:
+    """Join consecutive pieces while they fit in ``max_tokens``."""
+    packed: List[str] = []
+    current = ""
+    for piece in pieces:
+        if current and _length(current + piece) > max_tokens:
+            packed.append(current)
+            current = ""
+        current += piece
+    if current:
+        packed.append(current)
+    return packed
+
+
+def _split_long(sentence: str, max_tokens: int) -> List[str]:
+    if _length(sentence) <= max_tokens:
+        return [sentence]
+    pieces: List[str] = []
+    for clause in _cut(sentence, CLAUSE_MARKS):
+        if _length(clause) <= max_tokens:
+            pieces.append(clause)
+            continue
+        tokens = tokenize(clause)
+        pieces.extend(
+            "".join(tokens[i : i + max_tokens]) for i in range(0, len(tokens), max_tokens)
+        )
+    return _pack(pieces, max_tokens)
+
+
+def split_sentences(
+    text: str,
+    max_tokens: int = DEFAULT_SEGMENT_MAX_TOKENS,
+    min_tokens: int = DEFAULT_SEGMENT_MIN_TOKENS,
+) -> List[str]:
+    """Split ``text`` into synthesis segments, in order and stripped."""
+    max_tokens = max(1, int(max_tokens))
+    pieces: List[str] = []
+    for sentence in _cut(str(text or ""), SENTENCE_END):
+        pieces.extend(_split_long(sentence, max_tokens))
+
+    segments: List[str] = []
+    pending = ""
+    for piece in pieces:
+        if pending and _length(pending + piece) > max_tokens:
+            # Too short on its own, but joining would overflow the segment.
+            segments.append(pending.strip())
+            pending = ""
+        pending += piece
+        if _length(pending) >= min_tokens:
+            segments.append(pending.strip())
+            pending = ""
+    if pending.strip():
+        if segments and _length(segments[-1] + pending) <= max_tokens:
+            segments[-1] = (segments[-1] + pending).strip()
+        else:
+            segments.append(pending.strip())
+    return [segment for segment in segments if segment]
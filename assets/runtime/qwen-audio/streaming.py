@@ -0,0 +1,380 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Live streaming STT sessions.
+
+The host opens a session, pushes PCM frames as they are captured and closes
+the session when the user stops. Each session keeps a rolling buffer of the
+audio that is not final yet and re-decodes it every ``step_sec`` of new audio.
+Tokens that two consecutive hypotheses agree on (LocalAgreement-2) are
+reported as stable, the rest as unstable. At a pause, or at the best pause
+once the buffer grows too long, the audio up to the pause is decoded once
+more and emitted as a final segment and dropped from the buffer.
+"""
+
+import base64
+import threading
+import time
+import uuid
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from audio_io import ASR_SAMPLE_RATE, Resampler, to_mono_float32
+from chunking import (
+    FRAME_SEC,
+    frame_energy_db,
+    has_speech,
+    plan_cut,
+    silence_threshold_db,
+)
+from config import (
+    DEFAULT_MIN_SILENCE_SEC,
+    DEFAULT_TAIL_SILENCE_WINDOW_SEC,
+    STREAM_ENDPOINT_SILENCE_SEC,
+    STREAM_MAX_BUFFER_SEC,
+    STREAM_SESSION_TTL_SEC,
+    STREAM_STEP_SEC,
+)
+from pcm_transport import PCM_DTYPES, read_pcm
+from textutil import tokenize
+
+# transcribe(samples, language) -> (text, detected language)
+StreamTranscriber = Callable[[np.ndarray, Optional[str]], Tuple[str, Optional[str]]]
+EventEmitter = Callable[[str, Dict[str, Any]], None]
+StreamEvent = Tuple[str, Dict[str, Any]]
+
+
+def agreed_prefix(previous: List[str], current: List[str]) -> int:
+    """Number of leading tokens two hypotheses agree on."""
+    count = 0
+    for left, right in zip(previous, current):
+        if left.strip().lower() != right.strip().lower():
+            break
+        count += 1
+    return count
+
+
+def decode_pcm(data: str, dtype: str = "int16", channels: int = 1) -> np.ndarray:
+    """Base64 little-endian interleaved PCM to mono float32."""
+    if dtype not in PCM_DTYPES:
+        raise ValueError(f"unsupported pcm dtype: {dtype}, expected int16 or float32")
+    np_dtype, scale = PCM_DTYPES[dtype]
+    raw = np.frombuffer(base64.b64decode(data), dtype=np_dtype)
+    samples = raw.astype(np.float32) / scale
+    if channels > 1:
+        samples = to_mono_float32(samples[: len(samples) // channels * channels].reshape(-1, channels))
+    return samples
+
+
+class StreamSession:
+    def __init__(
+        self,
+        transcribe: StreamTranscriber,
+        sample_rate: int = ASR_SAMPLE_RATE,
+        input_rate: int = ASR_SAMPLE_RATE,
+        channels: int = 1,
+        language: Optional[str] = None,
+        step_sec: float = STREAM_STEP_SEC,
+        max_buffer_sec: float = STREAM_MAX_BUFFER_SEC,
+        endpoint_silence_sec: float = STREAM_ENDPOINT_SILENCE_SEC,
+        min_silence_sec: float = DEFAULT_MIN_SILENCE_SEC,
+        on_close: Callable[[], None] = lambda: None,
+    ) -> None:
+        self.id = uuid.uuid4().hex
+        self.sample_rate = int(sample_rate)
+        self.input_rate = int(input_rate)
+        self.channels = max(1, int(channels))
+        self.language = language
+        self.lock = threading.Lock()
+        self.last_active = time.monotonic()
+        self.finals: List[Dict[str, Any]] = []
+        self.received = 0
+        self._transcribe = transcribe
+        self._on_close = on_close
+        self._resampler = Resampler(self.input_rate, self.sample_rate)
+        self._step = max(1, int(step_sec * self.sample_rate))
+        self._max_buffer = max(self._step, int(max_buffer_sec * self.sample_rate))
+        self._endpoint = max(1, int(endpoint_silence_sec * self.sample_rate))
+        self._min_silence_sec = min_silence_sec
+        self._frame_len = max(1, int(round(FRAME_SEC * self.sample_rate)))
+        # Audio that is not final yet; _buffer_start is its absolute index.
+        self._buffer = np.zeros(0, dtype=np.float32)
+        self._buffer_start = 0
+        self._undecoded = 0
+        self._hypothesis: List[str] = []
+        self._stable: List[str] = []
+        self._closed = False
+
+    @property
+    def text(self) -> str:
+        return " ".join(final["text"] for final in self.finals).strip()
+
+    def push(self, samples: np.ndarray) -> List[StreamEvent]:
+        if self._closed:
+            raise RuntimeError(f"stream session closed: {self.id}")
+        self.last_active = time.monotonic()
+        return self._feed(self._resampler.process(samples))
+
+    def close(self) -> Tuple[List[StreamEvent], Dict[str, Any]]:
+        events: List[StreamEvent] = []
+        if not self._closed:
+            self._append(self._resampler.flush())
+            if self._has_speech():
+                events = self._commit(len(self._buffer))
+            self._closed = True
+            self._on_close()
+        return events, {
+            "session_id": self.id,
+            "text": self.text,
+            "segments": list(self.finals),
+            "language": self.language,
+            "duration": self.received / float(self.sample_rate),
+        }
+
+    def discard(self) -> None:
+        """Close without decoding the remaining audio; nobody awaits its result."""
+        if not self._closed:
+            self._closed = True
+            self._buffer = np.zeros(0, dtype=np.float32)
+            self._on_close()
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "session_id": self.id,
+            "received_sec": self.received / float(self.sample_rate),
+            "buffered_sec": len(self._buffer) / float(self.sample_rate),
+            "finals": len(self.finals),
+            "stable": "".join(self._stable).strip(),
+            "unstable": "".join(self._hypothesis[len(self._stable) :]).strip(),
+        }
+
+    def _append(self, samples: np.ndarray) -> None:
+        if len(samples):
+            self._buffer = np.concatenate([self._buffer, samples.astype(np.float32, copy=False)])
+            self._undecoded += len(samples)
+            self.received += len(samples)
+
+    def _feed(self, samples: np.ndarray) -> List[StreamEvent]:
+        self._append(samples)
+        events: List[StreamEvent] = []
+        if not self._has_speech():
+            self._drop_silence()
+            return events
+        cut = self._endpoint_cut()
+        if cut is None and len(self._buffer) >= self._max_buffer:
+            cut = plan_cut(
+                self._buffer,
+                self.sample_rate,
+                self._min_silence_sec,
+                DEFAULT_TAIL_SILENCE_WINDOW_SEC,
+            )
+        if cut is not None:
+            events += self._commit(cut)
+        if self._undecoded >= self._step and self._has_speech():
+            events += self._decode()
+        return events
+
+    def _energy(self) -> np.ndarray:
+        return frame_energy_db(self._buffer, self._frame_len)
+
+    def _has_speech(self) -> bool:
+        return has_speech(self._energy())
+
+    def _endpoint_cut(self) -> Optional[int]:
+        """Cut in the middle of a trailing pause of at least ``endpoint`` samples."""
+        energy = self._energy()
+        frames = int(np.ceil(self._endpoint / float(self._frame_len)))
+        if len(energy) <= frames:
+            return None
+        if np.all(energy[-frames:] < silence_threshold_db(energy)):
+            return len(self._buffer) - self._endpoint // 2
+        return None
+
+    def _drop_silence(self) -> None:
+        # Keep a little lead-in so the onset of the next word is not clipped.
+        excess = len(self._buffer) - self._endpoint
+        if excess > 0:
+            self._buffer = self._buffer[excess:]
+            self._buffer_start += excess
+            self._undecoded = min(self._undecoded, len(self._buffer))
+            self._hypothesis = []
+            self._stable = []
+
+    def _run(self, samples: np.ndarray) -> str:
+        text, detected = self._transcribe(samples, self.language)
+        if self.language is None and detected:
+            # Pin the first detection for the rest of the session.
+            self.language = str(detected).split(",", 1)[0].strip() or None
+        return str(text or "").strip()
+
+    def _decode(self) -> List[StreamEvent]:
+        tokens = tokenize(self._run(self._buffer))
+        agreed = agreed_prefix(self._hypothesis, tokens)
+        # Stable tokens only ever grow until the buffer is finalized.
+        if agreed > len(self._stable) and agreed_prefix(self._stable, tokens) == len(
+            self._stable
+        ):
+            self._stable = tokens[:agreed]
+        self._hypothesis = tokens
+        self._undecoded = 0
+        return [
+            (
+                "partial",
+                {
+                    **self.snapshot(),
+                    "start": self._buffer_start / float(self.sample_rate),
+                    "end": (self._buffer_start + len(self._buffer)) / float(self.sample_rate),
+                    "text": self.text,
+                },
+            )
+        ]
+
+    def _commit(self, cut: int) -> List[StreamEvent]:
+        cut = max(0, min(cut, len(self._buffer)))
+        text = self._run(self._buffer[:cut])
+        start = self._buffer_start / float(self.sample_rate)
+        end = (self._buffer_start + cut) / float(self.sample_rate)
+        self._buffer = self._buffer[cut:]
+        self._buffer_start += cut
+        self._undecoded = len(self._buffer)
+        self._hypothesis = []
+        self._stable = []
+        if not text:
+            return []
+        final = {"index": len(self.finals), "text": text, "start": start, "end": end}
+        self.finals.append(final)
+        return [("final", {"session_id": self.id, **final, "language": self.language})]
+
+
+class StreamManager:
+    def __init__(self, ttl_sec: float = STREAM_SESSION_TTL_SEC) -> None:
+        self.ttl_sec = ttl_sec
+        self._sessions: Dict[str, StreamSession] = {}
+        self._lock = threading.Lock()
+
+    def add(self, session: StreamSession) -> None:
+        with self._lock:
+            self._sessions[session.id] = session
+
+    def get(self, session_id: Optional[str]) -> StreamSession:
+        with self._lock:
+            session = self._sessions.get(session_id or "")
+        if session is None:
+            raise ValueError(f"unknown stream session: {session_id}")
+        return session
+
+    def pop(self, session_id: Optional[str]) -> StreamSession:
+        with self._lock:
+            session = self._sessions.pop(session_id or "", None)
+        if session is None:
+            raise ValueError(f"unknown stream session: {session_id}")
+        return session
+
+    def expire(self) -> List[str]:
+        """Drop sessions the host stopped pushing to and free their audio.
+
+        Called from the runtime watchdog and on every push, so abandoned
+        sessions go away even when no new stream is opened.
+        """
+        now = time.monotonic()
+        with self._lock:
+            stale = [
+                session
+                for session in self._sessions.values()
+                if self.ttl_sec > 0 and now - session.last_active > self.ttl_sec
+            ]
+            for session in stale:
+                del self._sessions[session.id]
+        for session in stale:
+            with session.lock:
+                session.discard()
+        return [session.id for session in stale]
+
+    def count(self) -> int:
+        with self._lock:
+            return len(self._sessions)
+
+
+stream_manager = StreamManager()
+
+
+def _emit_all(events: List[StreamEvent], emit: Optional[EventEmitter]) -> None:
+    if emit is None:
+        return
+    for name, payload in events:
+        emit(name, payload)
+
+
+def _pushed_samples(session: StreamSession, params: Dict[str, Any]) -> np.ndarray:
+    """Samples of a push: base64 ``pcm`` or a shared ``audio_pcm`` buffer."""
+    if params.get("audio_pcm"):
+        spec = {"sample_rate": session.input_rate, "channels": session.channels}
+        spec.update(params["audio_pcm"])
+        samples, sample_rate = read_pcm(spec)
+        if sample_rate != session.input_rate:
+            raise ValueError(
+                f"pcm buffer is {sample_rate} Hz, session expects {session.input_rate} Hz"
+            )
+        return samples
+    return decode_pcm(params.get("pcm") or "", params.get("dtype") or "int16", session.channels)
+
+
+def method_stream_open(params: Dict[str, Any]) -> Dict[str, Any]:
+    """Start a live session; PCM goes to ``stream_push`` with its ``session_id``."""
+    from stt import open_stream_transcriber
+
+    stream_manager.expire()
+    transcribe, cleanup, info = open_stream_transcriber(params)
+    session = StreamSession(
+        transcribe,
+        sample_rate=info.get("sample_rate") or ASR_SAMPLE_RATE,
+        input_rate=int(params.get("sample_rate", ASR_SAMPLE_RATE)),
+        channels=int(params.get("channels", 1)),
+        language=params.get("language"),
+        step_sec=float(params.get("step_sec", STREAM_STEP_SEC)),
+        max_buffer_sec=float(params.get("max_buffer_sec", STREAM_MAX_BUFFER_SEC)),
+        endpoint_silence_sec=float(
+            params.get("endpoint_silence_sec", STREAM_ENDPOINT_SILENCE_SEC)
+        ),
+        on_close=cleanup,
+    )
+    stream_manager.add(session)
+    return {
+        "session_id": session.id,
+        **info,
+        "input_sample_rate": session.input_rate,
+        "channels": session.channels,
+    }
+
+
+def method_stream_push(
+    params: Dict[str, Any], emit: Optional[EventEmitter] = None
+) -> Dict[str, Any]:
+    """Append PCM to a session; ``partial``/``final`` events are emitted on this request.
+
+    The audio is base64 ``pcm`` (``dtype`` int16 or float32) or an
+    ``audio_pcm`` buffer descriptor (see pcm_transport.py).
+    """
+    session = stream_manager.get(params.get("session_id"))
+    samples = _pushed_samples(session, params)
+    with session.lock:
+        events = session.push(samples)
+        snapshot = session.snapshot()
+    _emit_all(events, emit)
+    stream_manager.expire()
+    return snapshot
+
+
+def method_stream_close(
+    params: Dict[str, Any], emit: Optional[EventEmitter] = None
+) -> Dict[str, Any]:
+    """Finalize the remaining audio and return the whole transcript."""
+    session = stream_manager.pop(params.get("session_id"))
+    with session.lock:
+        has_audio = params.get("pcm") or params.get("audio_pcm")
+        events = session.push(_pushed_samples(session, params)) if has_audio else []
+        close_events, result = session.close()
+    _emit_all(events + close_events, emit)
+    return result
@@ -8,32 +8,73 @@ import shutil
 import sys
 import tempfile
 import threading
-import urllib.request
+from dataclasses import dataclass
 from pathlib import Path
-from types import SimpleNamespace
-from typing import Any, Callable, Dict, List, Optional, Tuple
+from typing import Any, Callable, Dict, List, Optional, Sequence, Set, Tuple
 
 import soundfile as sf
 
 from config import (
+    BATCH_MAX_DURATION_RATIO,
+    CACHE_DIR,
+    CASCADE_ENABLED,
+    CASCADE_MIN_CONFIDENCE,
+    CHECKPOINTS_ENABLED,
+    CHECKPOINT_MAX_MB,
     DEFAULT_BACKEND,
     DEFAULT_DEVICE,
     DEFAULT_DTYPE,
     DEFAULT_MAX_BATCH,
+    DEFAULT_LANGUAGE_PROBES,
+    DEFAULT_MAX_CHUNK_SEC,
     DEFAULT_MAX_NEW_TOKENS,
+    DEFAULT_MERGE_TAIL_SEC,
+    DEFAULT_MIN_SILENCE_SEC,
     DEFAULT_MLX_ALIGNER_MODEL,
-    DEFAULT_MLX_MAX_CHUNK_SEC,
-    DEFAULT_MLX_MERGE_TAIL_SEC,
-    DEFAULT_MLX_MIN_SILENCE_SEC,
+    DEFAULT_MLX_DRAFT_MODEL,
     DEFAULT_MLX_MODEL,
-    DEFAULT_MLX_TAIL_SILENCE_WINDOW_SEC,
     DEFAULT_MODEL,
+    DEFAULT_PIPELINE_DEPTH,
     DEFAULT_QWEN_ALIGNER_MODEL,
+    DEFAULT_QWEN_DRAFT_MODEL,
+    DEFAULT_TAIL_SILENCE_WINDOW_SEC,
+    LANGUAGE_PROBE_SEC,
+    TRANSCRIPT_CACHE_ENABLED,
+    TRANSCRIPT_CACHE_MAX_MB,
 )
+from alignment import SEGMENT_PUNCT, Alignment
+from audio_io import (
+    ASR_SAMPLE_RATE,
+    ArrayAudioReader,
+    AudioWindow,
+    StreamingAudioReader,
+    libsndfile_can_read,
+    open_audio_reader,
+)
+import metrics
+from cache import DiskLRUCache, cache_key
+from checkpoint import CHECKPOINT_VERSION, ChunkCheckpoint
+from confidence import primary_language, transcript_confidence
+from frontend import (
+    AudioSource,
+    DecodedAudio,
+    audio_digest,
+    decode_audio,
+    decode_cache,
+    decode_scope,
+)
+from chunking import PlannedChunk, plan_chunks, run_pipelined
 from mlx_runtime import ensure_mlx_audio, load_mlx_model_with_modelscope_fallback
+from downloads import download_for, get_downloader, release_download
+from pcm_transport import read_pcm
+from quantization import load_dtype, quantize_model, resolve_quantize
+from registry import model_registry
 
 _touch_callback: Callable[[], None] = lambda: None
 
+# Emits a protocol event (e.g. "partial") for the request being handled.
+EventEmitter = Callable[[str, Dict[str, Any]], None]
+
 
 def set_touch_callback(callback: Callable[[], None]) -> None:
     global _touch_callback
@@ -44,9 +85,9 @@ def touch() -> None:
     _touch_callback()
 
 # ---------- Qwen backend model management ----------
-_model = None
-_model_lock = threading.Lock()
-_model_key: Optional[str] = None
+# Loaded models live in the shared registry (registry.py) under these kinds.
+STT_MODEL_KIND = "stt"
+ALIGNER_MODEL_KIND = "aligner"
 
 _torch = None
 _Qwen3ASRModel = None
@@ -94,9 +135,9 @@ def get_qwen_model(
     max_new_tokens: int,
     forced_aligner: Optional[str],
     forced_aligner_kwargs: Optional[Dict[str, Any]],
+    quantize: Optional[str] = None,
 ) -> Any:
-    global _model, _model_key
-    _, Qwen3ASRModel = _ensure_qwen_backend()
+    torch, Qwen3ASRModel = _ensure_qwen_backend()
 
     model_name = (model_name or DEFAULT_MODEL).strip()
     backend = (backend or DEFAULT_BACKEND).strip().lower()
@@ -114,17 +155,15 @@ def get_qwen_model(
             "max_new_tokens": max_new_tokens,
             "forced_aligner": forced_aligner,
             # "forced_aligner_kwargs": forced_aligner_kwargs or {},
+            "quantize": quantize,
         },
         sort_keys=True,
         ensure_ascii=False,
     )
 
-    with _model_lock:
-        if _model is not None and _model_key == key:
-            return _model
-
+    def _load() -> Any:
         init_kwargs: Dict[str, Any] = {
-            "dtype": _resolve_dtype(dtype),
+            "dtype": _resolve_dtype(load_dtype(quantize, dtype)),
             "device_map": device,
             "max_inference_batch_size": max_batch,
             "max_new_tokens": max_new_tokens,
@@ -135,48 +174,43 @@ def get_qwen_model(
             init_kwargs["forced_aligner_kwargs"] = forced_aligner_kwargs
         logging.info(model_name)
         logging.info(init_kwargs)
-        _model = Qwen3ASRModel.from_pretrained(model_name, **init_kwargs)
-        _model_key = key
-        return _model
+        model = Qwen3ASRModel.from_pretrained(model_name, **init_kwargs)
+        # The forced aligner keeps its own weights; only the ASR model is quantized.
+        return quantize_model(model, quantize, torch)
+
+    return model_registry.get(f"transformers:{key}", _load, kind=STT_MODEL_KIND)
 
 
 # ---------- MLX backend model management ----------
-_mlx_model_key: Optional[str] = None
-_mlx_model_lock = threading.Lock()
-_mlx_asr_model = None
-_mlx_aligner_model = None
+# The ASR model and the forced aligner are separate registry entries so
+# text-only requests never load the aligner.
+def _load_mlx_stt_model(model_name: str) -> Any:
+    ensure_mlx_audio()
+    from mlx_audio.stt.utils import load_model as load_stt_model  # type: ignore
 
+    return load_mlx_model_with_modelscope_fallback(load_stt_model, model_name)
 
-def get_mlx_models(model_name: str, aligner_model_name: str) -> Tuple[Any, Any]:
-    global _mlx_asr_model, _mlx_aligner_model, _mlx_model_key
 
+def get_mlx_asr_model(model_name: str) -> Any:
     model_name = (model_name or DEFAULT_MLX_MODEL).strip()
-    aligner_model_name = (aligner_model_name or DEFAULT_MLX_ALIGNER_MODEL).strip()
-    key = json.dumps(
-        {"model": model_name, "aligner_model": aligner_model_name},
-        sort_keys=True,
-        ensure_ascii=False,
+    return model_registry.get(
+        f"mlx:{model_name}",
+        lambda: _load_mlx_stt_model(model_name),
+        kind=STT_MODEL_KIND,
     )
 
-    with _mlx_model_lock:
-        if (
-            _mlx_asr_model is not None
-            and _mlx_aligner_model is not None
-            and _mlx_model_key == key
-        ):
-            return _mlx_asr_model, _mlx_aligner_model
 
-        ensure_mlx_audio()
-        from mlx_audio.stt.utils import load_model as load_stt_model  # type: ignore
+def get_mlx_aligner_model(aligner_model_name: str) -> Any:
+    aligner_model_name = (aligner_model_name or DEFAULT_MLX_ALIGNER_MODEL).strip()
+    return model_registry.get(
+        f"mlx:{aligner_model_name}",
+        lambda: _load_mlx_stt_model(aligner_model_name),
+        kind=ALIGNER_MODEL_KIND,
+    )
 
-        _mlx_asr_model = load_mlx_model_with_modelscope_fallback(
-            load_stt_model, model_name
-        )
-        _mlx_aligner_model = load_mlx_model_with_modelscope_fallback(
-            load_stt_model, aligner_model_name
-        )
-        _mlx_model_key = key
-        return _mlx_asr_model, _mlx_aligner_model
+
+def get_mlx_models(model_name: str, aligner_model_name: str) -> Tuple[Any, Any]:
+    return get_mlx_asr_model(model_name), get_mlx_aligner_model(aligner_model_name)
 
 
 def _normalize_result_item(item: Any) -> Dict[str, Any]:
@@ -204,7 +238,15 @@ def _normalize_dtype_in_dict(kwargs: Dict[str, Any]) -> Dict[str, Any]:
     return out
 
 
+# Request fields that carry the audio itself.
+_AUDIO_FIELDS = {"audio", "audio_path", "audio_url", "audio_pcm"}
+
+
 def _resolve_audio_input(params: Dict[str, Any]) -> Any:
+    if "audio_pcm" in params:
+        # Raw PCM shared by the host; nothing to decode.
+        with metrics.stage("decode"):
+            return read_pcm(params["audio_pcm"])
     if "audio" in params:
         return params["audio"]
     if "audio_path" in params:
@@ -215,317 +257,565 @@ def _resolve_audio_input(params: Dict[str, Any]) -> Any:
     if "audio_url" in params:
         return params["audio_url"]
     raise ValueError(
-        "one of params.audio / params.audio_path / params.audio_url is required"
+        "one of params.audio / params.audio_path / params.audio_url / params.audio_pcm"
+        " is required"
     )
 
 
-def _to_ns_alignment_item(item: Any) -> SimpleNamespace:
-    if isinstance(item, dict):
-        start = item.get("start_time", item.get("start", 0.0))
-        end = item.get("end_time", item.get("end", start))
-        text = item.get("text", "")
-    else:
-        start = getattr(item, "start_time", getattr(item, "start", 0.0))
-        end = getattr(item, "end_time", getattr(item, "end", start))
-        text = getattr(item, "text", "")
+# ASCII punctuation only ends a segment when followed by whitespace, so "3.5"
+# or "e.g" stay intact.
+_ASCII_SEGMENT_PUNCT = set(",.!?;:")
 
-    try:
-        start_value = float(start)
-    except Exception:
-        start_value = 0.0
-    try:
-        end_value = float(end)
-    except Exception:
-        end_value = start_value
 
-    return SimpleNamespace(
-        start_time=start_value,
-        end_time=end_value,
-        text=str(text or ""),
-    )
+def _punctuation_segments(text: str) -> List[Dict[str, Any]]:
+    """Split ``text`` at punctuation without timestamps (no aligner needed)."""
+    segments: List[Dict[str, Any]] = []
+    current: List[str] = []
+    for idx, ch in enumerate(text):
+        current.append(ch)
+        if ch not in SEGMENT_PUNCT:
+            continue
+        next_ch = text[idx + 1] if idx + 1 < len(text) else ""
+        if ch in _ASCII_SEGMENT_PUNCT and next_ch and not next_ch.isspace():
+            continue
+        if next_ch and next_ch in SEGMENT_PUNCT:
+            continue
+        segment = "".join(current).strip()
+        if segment:
+            segments.append({"text": segment})
+        current = []
+    segment = "".join(current).strip()
+    if segment:
+        segments.append({"text": segment})
+    return segments
 
 
-def _alignment_to_list(alignment: List[SimpleNamespace]) -> List[Dict[str, Any]]:
-    return [
-        {
-            "start": item.start_time,
-            "end": item.end_time,
-            "text": item.text,
-            "time_stamps": [item.start_time, item.end_time],
-        }
-        for item in alignment
-    ]
+def _partial_payload(
+    index: int,
+    text: str,
+    alignment: Optional[Alignment],
+    processed_sec: float,
+    total_sec: float,
+) -> Dict[str, Any]:
+    if alignment is None:
+        segments = _punctuation_segments(text)
+    else:
+        segments = alignment.sentence_segments(text)
+    return {
+        "index": index,
+        "text": text,
+        "segments": segments,
+        "processed_sec": processed_sec,
+        "total_sec": total_sec,
+    }
 
 
-def _find_tail_silence_start(
-    alignment: List[SimpleNamespace],
-    chunk_len_sec: float,
-    min_silence_sec: float,
-    tail_silence_window_sec: float,
-) -> Optional[float]:
-    if not alignment:
-        return None
+# ---------- Transcript cache ----------
+# Bump when the cached transcript layout changes so stale entries miss.
+TRANSCRIPT_CACHE_VERSION = 3
 
-    window_start = max(0.0, chunk_len_sec - tail_silence_window_sec)
-    gaps: List[Tuple[float, float]] = []
+_transcript_cache: Optional[DiskLRUCache] = None
+_transcript_cache_lock = threading.Lock()
 
-    first = alignment[0]
-    if first.start_time >= min_silence_sec:
-        gaps.append((0.0, first.start_time))
 
-    for i in range(len(alignment) - 1):
-        gap_start = alignment[i].end_time
-        gap_end = alignment[i + 1].start_time
-        if gap_end - gap_start >= min_silence_sec:
-            gaps.append((gap_start, gap_end))
+def get_transcript_cache() -> DiskLRUCache:
+    global _transcript_cache
+    with _transcript_cache_lock:
+        if _transcript_cache is None:
+            _transcript_cache = DiskLRUCache(
+                os.path.join(CACHE_DIR, "transcripts"),
+                max_bytes=TRANSCRIPT_CACHE_MAX_MB * 1024 * 1024,
+                suffix=".json",
+            )
+        return _transcript_cache
 
-    last = alignment[-1]
-    if chunk_len_sec - last.end_time >= min_silence_sec:
-        gaps.append((last.end_time, chunk_len_sec))
 
-    if not gaps:
-        return None
+def _transcript_cache_key(
+    params: Dict[str, Any], audio: Optional[AudioSource], key_parts: Dict[str, Any]
+) -> Optional[str]:
+    """Cache key for ``audio``, or None when it cannot or should not be cached.
 
-    tail_gaps = [gap for gap in gaps if gap[1] < window_start and gap[0] < chunk_len_sec]
-    if not tail_gaps:
+    Local files and in-memory PCM are cached; the key is their content hash
+    plus ``key_parts``, so a hit never touches a model.
+    """
+    enabled = bool(params.get("cache", TRANSCRIPT_CACHE_ENABLED))
+    if not enabled or not audio:
         return None
-    return max(tail_gaps, key=lambda gap: gap[0])[0]
-
+    if isinstance(audio, str) and not os.path.isfile(audio):
+        return None
+    with metrics.stage("cache"):
+        return cache_key(
+            {
+                "version": TRANSCRIPT_CACHE_VERSION,
+                "audio_sha256": audio_digest(audio),
+                **key_parts,
+            }
+        )
 
-def _build_sentence_segments(
-    asr_text: str, alignment_result: List[SimpleNamespace]
-) -> List[Dict[str, Any]]:
-    punct = set("，。！？；：、,.!?;:…")
-    if not alignment_result:
-        return []
 
-    def _norm_char(ch: str) -> str:
-        if "A" <= ch <= "Z":
-            return ch.lower()
-        return ch
+def _load_cached_transcript(key: str) -> Optional[Dict[str, Any]]:
+    with metrics.stage("cache"):
+        cached = get_transcript_cache().get_json(key)
+    return cached if isinstance(cached, dict) else None
 
-    asr_clean: List[str] = []
-    punct_positions = set()
-    for ch in asr_text:
-        if ch.isspace():
-            continue
-        if ch in punct:
-            if asr_clean:
-                punct_positions.add(len(asr_clean) - 1)
-            continue
-        asr_clean.append(_norm_char(ch))
-
-    align_clean: List[str] = []
-    align_char_token: List[int] = []
-    for token_idx, item in enumerate(alignment_result):
-        token_text = str(item.text)
-        for ch in token_text:
-            if ch.isspace() or ch in punct:
-                continue
-            align_clean.append(_norm_char(ch))
-            align_char_token.append(token_idx)
-
-    token_boundaries = set()
-    asr_idx = 0
-    for align_idx, ch in enumerate(align_clean):
-        while asr_idx < len(asr_clean) and asr_clean[asr_idx] != ch:
-            asr_idx += 1
-        if asr_idx >= len(asr_clean):
-            break
-        if asr_idx in punct_positions:
-            token_boundaries.add(align_char_token[align_idx])
-        asr_idx += 1
 
-    segments: List[Dict[str, Any]] = []
-    cur_text: List[str] = []
-    cur_start: Optional[float] = None
-    cur_end: Optional[float] = None
-    for token_idx, item in enumerate(alignment_result):
-        if cur_start is None:
-            cur_start = item.start_time
-        cur_end = item.end_time
-        cur_text.append(str(item.text))
-        if token_idx in token_boundaries:
-            text = "".join(cur_text).strip()
-            if text and cur_end is not None:
-                segments.append(
-                    {
-                        "start": cur_start,
-                        "end": cur_end,
-                        "text": text,
-                        "time_stamps": [cur_start, cur_end],
-                    }
-                )
-            cur_text = []
-            cur_start = None
-            cur_end = None
-
-    if cur_text and cur_start is not None and cur_end is not None:
-        text = "".join(cur_text).strip()
-        if text:
-            segments.append(
-                {
-                    "start": cur_start,
-                    "end": cur_end,
-                    "text": text,
-                    "time_stamps": [cur_start, cur_end],
-                }
+def _store_cached_transcript(key: str, transcript: Dict[str, Any]) -> None:
+    try:
+        with metrics.stage("cache"):
+            get_transcript_cache().put_json(key, transcript)
+    except OSError as exc:
+        logging.warning("failed to write transcript cache entry: %s", exc)
+
+
+def _cached_transcript(
+    params: Dict[str, Any],
+    audio: Optional[AudioSource],
+    key_parts: Dict[str, Any],
+    compute: Callable[[], Dict[str, Any]],
+) -> Tuple[Dict[str, Any], str]:
+    """Return ``(transcript, status)`` with status ``hit``, ``miss`` or ``off``."""
+    key = _transcript_cache_key(params, audio, key_parts)
+    if key is None:
+        return compute(), "off"
+    cached = _load_cached_transcript(key)
+    if cached is not None:
+        return cached, "hit"
+    transcript = compute()
+    _store_cached_transcript(key, transcript)
+    return transcript, "miss"
+
+
+_checkpoint_store: Optional[DiskLRUCache] = None
+
+
+def get_checkpoint_store() -> DiskLRUCache:
+    global _checkpoint_store
+    with _transcript_cache_lock:
+        if _checkpoint_store is None:
+            _checkpoint_store = DiskLRUCache(
+                os.path.join(CACHE_DIR, "checkpoints"),
+                max_bytes=CHECKPOINT_MAX_MB * 1024 * 1024,
+                suffix=".jsonl",
             )
-    return segments
+        return _checkpoint_store
 
 
-def _resolve_mlx_audio_path(audio_input: Any) -> Tuple[str, Optional[str]]:
+def _open_checkpoint(
+    params: Dict[str, Any], audio: AudioSource, key_parts: Dict[str, Any]
+) -> Optional[ChunkCheckpoint]:
+    """Checkpoint for a chunked transcription, keyed like the transcript cache."""
+    if not bool(params.get("checkpoint", CHECKPOINTS_ENABLED)):
+        return None
+    with metrics.stage("cache"):
+        key = cache_key(
+            {
+                "checkpoint": CHECKPOINT_VERSION,
+                "audio_sha256": audio_digest(audio),
+                **key_parts,
+            }
+        )
+    return ChunkCheckpoint(get_checkpoint_store(), key)
+
+
+def _resolve_local_audio_path(audio_input: Any) -> Tuple[AudioSource, Optional[str]]:
+    """``(local audio, temp file to release)``; PCM passes through.
+
+    URLs go through the shared downloader and return as soon as the response
+    headers are in; the body keeps arriving while it is decoded.
+    """
+    if _is_pcm(audio_input):
+        return audio_input, None
     if isinstance(audio_input, str):
         if audio_input.startswith(("http://", "https://")):
-            url_no_query = audio_input.split("?", 1)[0]
-            suffix = Path(url_no_query).suffix or ".wav"
-            fd, temp_path = tempfile.mkstemp(prefix="mlx_audio_", suffix=suffix)
-            os.close(fd)
-            try:
-                with urllib.request.urlopen(audio_input, timeout=30) as resp:
-                    with open(temp_path, "wb") as dst:
-                        shutil.copyfileobj(resp, dst)
-            except Exception:
-                if os.path.exists(temp_path):
-                    os.remove(temp_path)
-                raise
-            return temp_path, temp_path
+            download = get_downloader().fetch(audio_input)
+            return download.path, download.path if download.temporary else None
 
         path = Path(audio_input)
         if path.exists():
             return str(path), None
 
     raise FileNotFoundError(
-        "mlx-audio backend requires params.audio_path (existing file) or params.audio_url"
+        "chunked transcription requires params.audio_path (existing file),"
+        " params.audio_url or params.audio_pcm"
     )
 
 
-def _run_mlx_asr(
-    audio_path: str,
-    model_name: str,
-    aligner_model_name: str,
+# Model classes that rejected in-memory sample arrays but accepted a WAV file
+# of the same samples; they are fed WAV files from then on.
+_path_only_model_types: Set[type] = set()
+
+
+def _as_mlx_array(samples: Any) -> Any:
+    try:
+        import mlx.core as mx  # type: ignore
+    except ImportError:
+        return samples
+    return mx.array(samples)
+
+
+class _ChunkFeeder:
+    """Hand decoded sample buffers to MLX models.
+
+    Models are given the samples directly. A temporary WAV file is written only
+    for models that insist on a path, and it is shared by the ASR and aligner
+    calls for the same chunk.
+    """
+
+    def __init__(self, sample_rate: int) -> None:
+        self.sample_rate = sample_rate
+        self._temp_dir: Optional[str] = None
+        self._lock = threading.Lock()
+
+    def generate(
+        self,
+        model: Any,
+        samples: Any,
+        name: str,
+        source_path: Optional[str] = None,
+        **kwargs: Any,
+    ) -> Any:
+        model_type = type(model)
+        if model_type in _path_only_model_types:
+            return model.generate(source_path or self._chunk_path(samples, name), **kwargs)
+        try:
+            return model.generate(_as_mlx_array(samples), **kwargs)
+        except (TypeError, ValueError, AttributeError) as exc:
+            array_error = exc
+        try:
+            result = model.generate(source_path or self._chunk_path(samples, name), **kwargs)
+        except Exception:
+            # A file fails too, so the error was not about in-memory audio.
+            raise array_error from None
+        logging.info(
+            "%s rejected in-memory audio (%s); falling back to WAV files",
+            model_type.__name__,
+            array_error,
+        )
+        _path_only_model_types.add(model_type)
+        return result
+
+    def _chunk_path(self, samples: Any, name: str) -> str:
+        # The ASR and alignment stages may run on different threads.
+        with self._lock:
+            if self._temp_dir is None:
+                self._temp_dir = tempfile.mkdtemp(prefix="mlx_audio_stream_")
+            path = os.path.join(self._temp_dir, f"{name}.wav")
+            if not os.path.exists(path):
+                sf.write(path, samples, self.sample_rate)
+            return path
+
+    def close(self) -> None:
+        if self._temp_dir is not None:
+            shutil.rmtree(self._temp_dir, ignore_errors=True)
+            self._temp_dir = None
+
+
+@dataclass
+class ChunkTranscript:
+    text: str
+    language: Optional[str] = None
+    # Raw alignment items relative to the chunk start, when the ASR call
+    # produced them itself (the transformers backend aligns in the same call).
+    alignment: Optional[List[Any]] = None
+    # Restored from a checkpoint rather than transcribed.
+    resumed: bool = False
+
+
+# transcribe(chunk, source_path, language) and
+# align(chunk, text, source_path, language); source_path is the original file
+# when one chunk covers all of it, language is None until it is known.
+ChunkTranscriber = Callable[[PlannedChunk, Optional[str], Optional[str]], ChunkTranscript]
+ChunkAligner = Callable[[PlannedChunk, str, Optional[str], Optional[str]], List[Any]]
+
+
+def _language_detection(
+    language: Optional[str], source: Optional[str], confidence: Optional[float] = None
+) -> Dict[str, Any]:
+    return {"language": language, "source": source, "confidence": confidence}
+
+
+def _probe_language(
+    reader: StreamingAudioReader,
+    transcribe: ChunkTranscriber,
+    probes: int,
+    probe_sec: float,
+) -> Dict[str, Any]:
+    """Majority language of ``probes`` short windows spread across the file.
+
+    The confidence is the share of probes with speech that agree.
+    """
+    sr = reader.sample_rate
+    total = reader.total_samples
+    probe_len = max(1, int(probe_sec * sr))
+    votes: Dict[str, int] = {}
+    with metrics.stage("language"):
+        for i in range(probes):
+            center = total * (i + 1) // (probes + 1)
+            start = max(0, min(total - probe_len, center - probe_len // 2))
+            samples = reader.read_segment(start, probe_len)
+            if not len(samples):
+                continue
+            # Negative indexes keep probe names apart from real chunks.
+            probe = PlannedChunk(-(i + 1), start, start + len(samples), samples, False)
+            transcript = transcribe(probe, None, None)
+            touch()
+            language = primary_language(transcript.language)
+            if language and str(transcript.text or "").strip():
+                votes[language] = votes.get(language, 0) + 1
+    if not votes:
+        return _language_detection(None, None)
+    best = max(votes, key=lambda name: votes[name])
+    return _language_detection(best, "probes", round(votes[best] / sum(votes.values()), 3))
+
+
+def _checkpoint_record(
+    chunk: PlannedChunk,
+    transcript: ChunkTranscript,
+    chunk_result: Optional[Alignment],
+    detection: Dict[str, Any],
+    sample_rate: int,
+) -> Dict[str, Any]:
+    alignment = None
+    if chunk_result is not None:
+        # Stored relative to the chunk, like fresh aligner output.
+        alignment = chunk_result.shifted(-chunk.start / float(sample_rate)).to_items()
+    return {
+        "index": chunk.index,
+        "start": chunk.start,
+        "end": chunk.end,
+        "text": transcript.text,
+        "language": transcript.language,
+        "language_detection": dict(detection),
+        "alignment": alignment,
+    }
+
+
+def _open_reader(audio: AudioSource, sample_rate: int, whole_max_sec: float) -> Any:
+    """Block reader over a file path or in-memory ``(samples, rate)`` audio.
+
+    Inputs no longer than ``whole_max_sec`` are decoded once through the
+    front-end (and shared with anything else in the request that needs
+    them); longer ones, and files of unknown length, are streamed block by
+    block. Containers libsndfile cannot open are streamed through ffmpeg.
+    """
+    if isinstance(audio, str):
+        if not os.path.exists(audio):
+            raise FileNotFoundError(f"audio file not found: {audio}")
+        reader = open_audio_reader(audio, sample_rate, stream=download_for(audio))
+        if not reader.total_samples:
+            return reader
+        duration = reader.duration
+    else:
+        samples, native_rate = audio
+        reader = ArrayAudioReader(samples, native_rate, sample_rate)
+        duration = reader.duration
+    if duration > whole_max_sec:
+        return reader
+    decoded = decode_audio(audio, sample_rate)
+    return ArrayAudioReader(
+        decoded.samples, sample_rate, sample_rate, source_rate=decoded.source_rate
+    )
+
+
+def _run_chunked_asr(
+    audio: AudioSource,
+    sample_rate: int,
+    transcribe: ChunkTranscriber,
+    align: Optional[ChunkAligner],
+    aligned: bool,
     language: Optional[str],
     max_chunk_sec: float,
     min_silence_sec: float,
     tail_silence_window_sec: float,
     merge_tail_sec: float,
+    language_probes: int = DEFAULT_LANGUAGE_PROBES,
+    on_chunk: Optional[Callable[[Dict[str, Any]], None]] = None,
+    pipeline_depth: int = DEFAULT_PIPELINE_DEPTH,
+    open_checkpoint: Optional[Callable[[], Optional[ChunkCheckpoint]]] = None,
 ) -> Dict[str, Any]:
-    import soundfile as sf  # type: ignore
-
-    asr_model, aligner_model = get_mlx_models(model_name, aligner_model_name)
-    if not os.path.exists(audio_path):
-        raise FileNotFoundError(f"audio file not found: {audio_path}")
-
-    audio_data, sr = sf.read(audio_path, always_2d=True)
-    total_samples = int(audio_data.shape[0])
+    """Transcribe ``audio`` chunk by chunk with any backend.
+
+    Chunks are cut at pauses and decoded block by block, so only the current
+    chunk is held in memory; inputs that fit in one chunk are decoded whole,
+    once, by the front-end (frontend.py). ``transcribe`` runs on the pipeline thread and
+    ``align`` (a separate forced-alignment stage, if any) on the caller's.
+    With ``aligned`` set, alignment items are shifted to file time and used
+    for sentence segments; otherwise sentences are split on punctuation only.
+
+    The language is detected once per file and then passed to every chunk and
+    to the aligner, so detection cannot flip mid-file: files longer than one
+    chunk are probed up front (see ``_probe_language``), otherwise the first
+    chunk with speech decides.
+
+    ``open_checkpoint`` is called for inputs longer than one chunk; with the
+    checkpoint it returns, every finished chunk is recorded and chunks found
+    there from an interrupted run are restored instead of transcribed again.
+    Chunk planning is deterministic, so the restored chunks line up; the
+    checkpoint is discarded once the whole file is done. Inputs that fit in
+    one chunk never touch the checkpoint store.
+    """
+    if align is None:
+        # Nothing to overlap with.
+        pipeline_depth = 0
+
+    sr = sample_rate
+    reader = _open_reader(audio, sr, max_chunk_sec + merge_tail_sec)
+    audio_path = audio if isinstance(audio, str) else None
+    window = AudioWindow(metrics.timed_iter("decode", reader.blocks()))
+    total_samples = reader.total_samples
     total_sec = total_samples / float(sr) if sr else 0.0
     asr_text = ""
-    alignment_result: List[SimpleNamespace] = []
+    alignment_parts: List[Alignment] = []
+
+    checkpoint = None
+    if open_checkpoint is not None and (
+        not total_samples or total_sec >= max_chunk_sec + merge_tail_sec
+    ):
+        checkpoint = open_checkpoint()
+
+    done = checkpoint.resume() if checkpoint is not None else {}
+    resumed_detection = done[max(done)].get("language_detection") if done else None
+    if done:
+        logging.info("resuming %s after %d checkpointed chunks", audio_path, len(done))
 
-    asr_kwargs: Dict[str, Any] = {"verbose": True}
-    if language:
-        asr_kwargs["language"] = language
-    align_kwargs: Dict[str, Any] = {}
     if language:
-        align_kwargs["language"] = language
-
-    if total_sec <= max_chunk_sec:
-        asr_result = asr_model.generate(audio_path, **asr_kwargs)
-        asr_text = str(getattr(asr_result, "text", "") or "").strip()
-        if asr_text:
-            raw_alignment = aligner_model.generate(
-                audio_path,
-                text=asr_text,
-                **align_kwargs,
-            )
-            alignment_result = [_to_ns_alignment_item(x) for x in (raw_alignment or [])]
+        detection = _language_detection(language, "request")
+    elif isinstance(resumed_detection, dict) and resumed_detection.get("language"):
+        detection = dict(resumed_detection)
+    elif language_probes > 0 and total_sec >= max_chunk_sec + merge_tail_sec:
+        detection = _probe_language(
+            reader, transcribe, language_probes, min(LANGUAGE_PROBE_SEC, max_chunk_sec)
+        )
     else:
-        max_chunk_samples = int(max_chunk_sec * sr)
-        temp_dir = tempfile.mkdtemp(prefix="mlx_audio_stream_")
-        try:
-            start = 0
-            idx = 0
-            while start < total_samples:
-                end = min(start + max_chunk_samples, total_samples)
-                if total_samples - end < int(merge_tail_sec * sr):
-                    end = total_samples
-
-                chunk_path = os.path.join(temp_dir, f"chunk_{idx:03d}.wav")
-                sf.write(chunk_path, audio_data[start:end], sr)
-
-                chunk_asr = asr_model.generate(chunk_path, **asr_kwargs)
-                touch()
-                chunk_text = str(getattr(chunk_asr, "text", "") or "").strip()
-                if chunk_text:
-                    asr_text = f"{asr_text} {chunk_text}".strip()
-
-                raw_chunk_alignment = []
-                if chunk_text:
-                    raw_chunk_alignment = aligner_model.generate(
-                        chunk_path,
-                        text=chunk_text,
-                        **align_kwargs,
-                    )
-                chunk_alignment = [
-                    _to_ns_alignment_item(x) for x in (raw_chunk_alignment or [])
-                ]
-
-                chunk_len = (end - start) / float(sr)
-                cut_start = None
-                if chunk_alignment:
-                    cut_start = _find_tail_silence_start(
-                        alignment=chunk_alignment,
-                        chunk_len_sec=chunk_len,
-                        min_silence_sec=min_silence_sec,
-                        tail_silence_window_sec=tail_silence_window_sec,
-                    )
-
-                offset = start / float(sr)
-                if end >= total_samples:
-                    next_start = total_samples
-                elif chunk_alignment:
-                    if cut_start is None:
-                        last_end = chunk_alignment[-1].end_time
-                        next_start = int(round((offset + last_end) * sr))
-                    else:
-                        next_start = int(round((offset + cut_start) * sr))
-                    if next_start <= start:
-                        next_start = end
-                else:
-                    next_start = end
-
-                trim_at = cut_start if cut_start is not None and next_start < end else None
-                if trim_at is None:
-                    trimmed_alignment = chunk_alignment
-                else:
-                    trimmed_alignment = [
-                        item for item in chunk_alignment if item.end_time <= trim_at
-                    ]
-
-                for item in trimmed_alignment:
-                    alignment_result.append(
-                        SimpleNamespace(
-                            start_time=item.start_time + offset,
-                            end_time=item.end_time + offset,
-                            text=item.text,
-                        )
-                    )
-
-                if next_start > total_samples:
-                    next_start = total_samples
-                start = next_start
-                idx += 1
-        finally:
-            shutil.rmtree(temp_dir, ignore_errors=True)
+        detection = _language_detection(None, None)
+
+    # The ASR stage may run on the pipeline thread; record into this request.
+    timings = metrics.current()
+
+    source_file = audio_path if audio_path and libsndfile_can_read(audio_path) else None
+
+    def _source_path(chunk: PlannedChunk) -> Optional[str]:
+        # A single chunk covering the file can reuse the original path if a
+        # model only accepts files (and can decode it).
+        return source_file if chunk.index == 0 and chunk.is_last else None
+
+    def _restore(chunk: PlannedChunk) -> Optional[ChunkTranscript]:
+        record = done.get(chunk.index)
+        if record is None or (record.get("start"), record.get("end")) != (
+            chunk.start,
+            chunk.end,
+        ):
+            return None
+        return ChunkTranscript(
+            text=str(record.get("text") or ""),
+            language=record.get("language"),
+            alignment=record.get("alignment"),
+            resumed=True,
+        )
+
+    def _asr_stage(chunk: PlannedChunk) -> ChunkTranscript:
+        transcript = _restore(chunk)
+        if transcript is None:
+            with metrics.bound(timings), metrics.stage("asr"):
+                transcript = transcribe(chunk, _source_path(chunk), detection["language"])
+            touch()
+        transcript.text = str(transcript.text or "").strip()
+        if detection["language"] is None and transcript.text:
+            # Chunks are transcribed in order on one thread, so every later
+            # chunk (and every alignment) sees the pinned language.
+            pinned = primary_language(transcript.language)
+            if pinned:
+                detection.update(_language_detection(pinned, "first_chunk"))
+        return transcript
+
+    def _align_stage(
+        chunk: PlannedChunk, transcript: ChunkTranscript
+    ) -> Optional[Alignment]:
+        if not aligned:
+            return None
+        if not transcript.text:
+            return Alignment.empty()
+        raw_chunk_alignment = transcript.alignment
+        if raw_chunk_alignment is None and align is not None:
+            with metrics.stage("align"):
+                raw_chunk_alignment = align(
+                    chunk, transcript.text, _source_path(chunk), detection["language"]
+                )
+            touch()
+        return Alignment.from_items(raw_chunk_alignment).shifted(chunk.start / float(sr))
+
+    chunks = plan_chunks(
+        window,
+        sample_rate=sr,
+        max_chunk_sec=max_chunk_sec,
+        min_silence_sec=min_silence_sec,
+        tail_silence_window_sec=tail_silence_window_sec,
+        merge_tail_sec=merge_tail_sec,
+    )
+    processed = 0
+    # Chunks come back in order, so merging is a plain concatenation.
+    for chunk, transcript, chunk_result in run_pipelined(
+        chunks, _asr_stage, _align_stage, depth=pipeline_depth
+    ):
+        processed = chunk.end
+        chunk_text = transcript.text
+        if chunk_text:
+            asr_text = f"{asr_text} {chunk_text}".strip()
+        if chunk_result is not None:
+            alignment_parts.append(chunk_result)
+        if checkpoint is not None and not transcript.resumed:
+            checkpoint.append(
+                _checkpoint_record(chunk, transcript, chunk_result, detection, sr)
+            )
+
+        if on_chunk is not None:
+            on_chunk(
+                _partial_payload(
+                    index=chunk.index,
+                    text=chunk_text,
+                    alignment=chunk_result,
+                    processed_sec=chunk.end / float(sr),
+                    total_sec=total_sec or None,
+                )
+            )
+
+    if checkpoint is not None:
+        checkpoint.discard()
+
+    return _transcript_result(
+        asr_text,
+        detection,
+        Alignment.concat(alignment_parts) if aligned else None,
+        # Streams that do not record their length are measured as decoded.
+        duration=total_sec or processed / float(sr),
+        sample_rate=reader.source_rate,
+    )
 
-    sentence_segments = _build_sentence_segments(asr_text, alignment_result)
-    if not sentence_segments and asr_text:
-        if alignment_result:
-            start = alignment_result[0].start_time
-            end = alignment_result[-1].end_time
+
+def _transcript_result(
+    asr_text: str,
+    language_detection: Dict[str, Any],
+    alignment_result: Optional[Alignment],
+    duration: Optional[float],
+    sample_rate: Optional[int],
+) -> Dict[str, Any]:
+    """Sentence-segment a whole transcript; ``alignment_result`` None means unaligned.
+
+    The alignment stays an :class:`Alignment` in the result; it is only turned
+    into JSON items if a caller needs them.
+    """
+    with metrics.stage("segment"):
+        if alignment_result is None:
+            sentence_segments = _punctuation_segments(asr_text)
+        else:
+            sentence_segments = alignment_result.sentence_segments(asr_text)
+    if not sentence_segments and asr_text and alignment_result is not None:
+        if len(alignment_result):
+            start = float(alignment_result.starts[0])
+            end = float(alignment_result.ends[-1])
         else:
             start = 0.0
-            end = total_sec
+            end = duration or 0.0
         sentence_segments = [
             {
                 "start": start,
@@ -537,22 +827,339 @@ def _run_mlx_asr(
 
     return {
         "text": asr_text,
+        "language": language_detection.get("language"),
+        "language_detection": language_detection,
         "sentence_segments": sentence_segments,
-        "alignment": _alignment_to_list(alignment_result),
-        "sample_rate": int(sr),
-        "duration": total_sec,
+        "alignment": alignment_result,
+        "sample_rate": sample_rate,
+        "duration": duration,
     }
 
 
-def _predict_qwen(params: Dict[str, Any], backend: str) -> Dict[str, Any]:
-    if backend != "transformers":
-        raise ValueError(f"unsupported backend: {backend}, expected transformers or mlx-audio")
+def _chunked_transcript(
+    result: Dict[str, Any], return_time_stamps: bool
+) -> Dict[str, Any]:
+    """Cacheable transcript for a ``_run_chunked_asr`` result."""
+    asr_text = str(result.get("text", "") or "")
+    sentence_segments = result.get("sentence_segments") or []
+    alignment = result.get("alignment")
+
+    if return_time_stamps:
+        items = sentence_segments or (alignment.to_list() if alignment is not None else [])
+    else:
+        items = [{"text": seg.get("text", "")} for seg in sentence_segments]
+        if not items and asr_text:
+            items = [{"text": asr_text}]
+    transcript = {
+        "language": result.get("language"),
+        "language_detection": result.get("language_detection"),
+        "text": asr_text,
+        "items": items,
+        "duration": result.get("duration"),
+        "sample_rate": result.get("sample_rate"),
+    }
+    if result.get("cascade"):
+        transcript["cascade"] = result["cascade"]
+    return transcript
+
 
-    model_name = params.get("model") or DEFAULT_MODEL
+def _chunking_params(params: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        "max_chunk_sec": float(params.get("max_chunk_sec", DEFAULT_MAX_CHUNK_SEC)),
+        "min_silence_sec": float(params.get("min_silence_sec", DEFAULT_MIN_SILENCE_SEC)),
+        "tail_silence_window_sec": float(
+            params.get("tail_silence_window_sec", DEFAULT_TAIL_SILENCE_WINDOW_SEC)
+        ),
+        "merge_tail_sec": float(params.get("merge_tail_sec", DEFAULT_MERGE_TAIL_SEC)),
+        "language_probes": int(params.get("language_probes", DEFAULT_LANGUAGE_PROBES)),
+    }
+
+
+def _mlx_chunk_transcriber(asr_model: Any, feeder: "_ChunkFeeder") -> ChunkTranscriber:
+    def _transcribe(
+        chunk: PlannedChunk, source_path: Optional[str], chunk_language: Optional[str]
+    ) -> ChunkTranscript:
+        asr_kwargs: Dict[str, Any] = {"verbose": True}
+        if chunk_language:
+            asr_kwargs["language"] = chunk_language
+        chunk_asr = feeder.generate(
+            asr_model, chunk.samples, chunk.name, source_path=source_path, **asr_kwargs
+        )
+        return ChunkTranscript(
+            text=str(getattr(chunk_asr, "text", "") or ""),
+            language=getattr(chunk_asr, "language", None) or chunk_language,
+        )
+
+    return _transcribe
+
+
+def _qwen_chunk_transcriber(
+    model: Any, return_time_stamps: bool, transcribe_kwargs: Dict[str, Any]
+) -> ChunkTranscriber:
+    def _transcribe(
+        chunk: PlannedChunk, source_path: Optional[str], chunk_language: Optional[str]
+    ) -> ChunkTranscript:
+        # Language probes (negative indexes) only need the detected language.
+        time_stamps_wanted = return_time_stamps and chunk.index >= 0
+        results = model.transcribe(
+            audio=(chunk.samples, ASR_SAMPLE_RATE),
+            language=chunk_language,
+            return_time_stamps=time_stamps_wanted,
+            **transcribe_kwargs,
+        )
+        result = results[0] if isinstance(results, list) else results
+        time_stamps = getattr(result, "time_stamps", None)
+        return ChunkTranscript(
+            text=str(getattr(result, "text", "") or ""),
+            language=getattr(result, "language", None) or chunk_language,
+            alignment=(
+                list(getattr(time_stamps, "items", None) or [])
+                if time_stamps_wanted
+                else None
+            ),
+        )
+
+    return _transcribe
+
+
+def _qwen_chunk_aligner(model: Any) -> ChunkAligner:
+    """Align chunk text with the forced aligner loaded into ``model``."""
+
+    def _align(
+        chunk: PlannedChunk,
+        text: str,
+        source_path: Optional[str],
+        chunk_language: Optional[str],
+    ) -> List[Any]:
+        results = model.forced_aligner.align(
+            audio=(chunk.samples, ASR_SAMPLE_RATE),
+            text=text,
+            language=chunk_language,
+        )
+        result = results[0] if isinstance(results, list) else results
+        return list(getattr(result, "items", None) or [])
+
+    return _align
+
+
+# ---------- Cascade ----------
+@dataclass
+class Cascade:
+    """Draft model of a cascaded request and how its chunks fared."""
+
+    draft_model: str
+    min_confidence: float
+    chunks: int = 0
+    escalated: int = 0
+
+    def key_parts(self) -> Dict[str, Any]:
+        return {"draft_model": self.draft_model, "min_confidence": self.min_confidence}
+
+    def summary(self) -> Dict[str, Any]:
+        return {**self.key_parts(), "chunks": self.chunks, "escalated": self.escalated}
+
+
+def _cascade_settings(
+    params: Dict[str, Any], model_name: str, default_draft_model: str
+) -> Optional[Cascade]:
+    """Cascade for a predict request, or None to use the full model only.
+
+    ``cascade`` turns it on or off per request; a ``draft_model`` alone turns
+    it on. A draft that is the full model itself has nothing to save.
+    """
+    draft_model = params.get("draft_model")
+    enabled = params.get("cascade")
+    if enabled is None:
+        enabled = bool(draft_model) or CASCADE_ENABLED
+    if not enabled:
+        return None
+    draft_model = str(draft_model or default_draft_model).strip()
+    if draft_model == str(model_name or "").strip():
+        return None
+    min_confidence = float(params.get("cascade_min_confidence", CASCADE_MIN_CONFIDENCE))
+    return Cascade(draft_model, min_confidence)
+
+
+def _cascade_chunk_transcriber(
+    draft: ChunkTranscriber, full: ChunkTranscriber, cascade: Cascade, sample_rate: int
+) -> ChunkTranscriber:
+    """Transcribe with ``draft`` and re-run chunks it is unsure of with ``full``.
+
+    Language probes only need the draft's language and are never re-run.
+    """
+
+    def _transcribe(
+        chunk: PlannedChunk, source_path: Optional[str], chunk_language: Optional[str]
+    ) -> ChunkTranscript:
+        transcript = draft(chunk, source_path, chunk_language)
+        if chunk.index < 0:
+            return transcript
+        cascade.chunks += 1
+        confidence = transcript_confidence(
+            transcript.text, chunk.samples, sample_rate, transcript.language, chunk_language
+        )
+        if confidence >= cascade.min_confidence:
+            return transcript
+        cascade.escalated += 1
+        logging.info(
+            "%s: draft confidence %.2f, re-running on the full model", chunk.name, confidence
+        )
+        return full(chunk, source_path, chunk_language)
+
+    return _transcribe
+
+
+def _run_mlx_asr(
+    audio: AudioSource,
+    model_name: str,
+    aligner_model_name: str,
+    language: Optional[str],
+    max_chunk_sec: float,
+    min_silence_sec: float,
+    tail_silence_window_sec: float,
+    merge_tail_sec: float,
+    language_probes: int = DEFAULT_LANGUAGE_PROBES,
+    on_chunk: Optional[Callable[[Dict[str, Any]], None]] = None,
+    pipeline_depth: int = DEFAULT_PIPELINE_DEPTH,
+    align: bool = True,
+    open_checkpoint: Optional[Callable[[], Optional[ChunkCheckpoint]]] = None,
+    cascade: Optional[Cascade] = None,
+) -> Dict[str, Any]:
+    """Transcribe ``audio`` chunk by chunk with the MLX models.
+
+    Forced alignment is a separate stage: with ``align=False`` the aligner is
+    neither loaded nor run and sentences are split on punctuation only. With a
+    ``cascade``, chunks are drafted by its smaller model first.
+    """
+    if isinstance(audio, str) and not os.path.exists(audio):
+        raise FileNotFoundError(f"audio file not found: {audio}")
+
+    asr_model = get_mlx_asr_model(model_name)
+    aligner_model = get_mlx_aligner_model(aligner_model_name) if align else None
+
+    sr = int(getattr(asr_model, "sample_rate", 0) or ASR_SAMPLE_RATE)
+    # The models are fed views into the decoded window.
+    feeder = _ChunkFeeder(sr)
+
+    _transcribe = _mlx_chunk_transcriber(asr_model, feeder)
+    if cascade is not None:
+        _transcribe = _cascade_chunk_transcriber(
+            _mlx_chunk_transcriber(get_mlx_asr_model(cascade.draft_model), feeder),
+            _transcribe,
+            cascade,
+            sr,
+        )
+
+    def _align(
+        chunk: PlannedChunk,
+        text: str,
+        source_path: Optional[str],
+        chunk_language: Optional[str],
+    ) -> List[Any]:
+        align_kwargs: Dict[str, Any] = {}
+        if chunk_language:
+            align_kwargs["language"] = chunk_language
+        return feeder.generate(
+            aligner_model,
+            chunk.samples,
+            chunk.name,
+            source_path=source_path,
+            text=text,
+            **align_kwargs,
+        )
+
+    try:
+        result = _run_chunked_asr(
+            audio,
+            sample_rate=sr,
+            transcribe=_transcribe,
+            align=_align if aligner_model is not None else None,
+            aligned=aligner_model is not None,
+            language=language,
+            max_chunk_sec=max_chunk_sec,
+            min_silence_sec=min_silence_sec,
+            tail_silence_window_sec=tail_silence_window_sec,
+            merge_tail_sec=merge_tail_sec,
+            language_probes=language_probes,
+            on_chunk=on_chunk,
+            pipeline_depth=pipeline_depth,
+            open_checkpoint=open_checkpoint,
+        )
+    finally:
+        feeder.close()
+    if cascade is not None:
+        result["cascade"] = cascade.summary()
+    return result
+
+
+def _run_qwen_asr(
+    audio: AudioSource,
+    model_kwargs: Dict[str, Any],
+    language: Optional[str],
+    return_time_stamps: bool,
+    transcribe_kwargs: Dict[str, Any],
+    max_chunk_sec: float,
+    min_silence_sec: float,
+    tail_silence_window_sec: float,
+    merge_tail_sec: float,
+    language_probes: int = DEFAULT_LANGUAGE_PROBES,
+    on_chunk: Optional[Callable[[Dict[str, Any]], None]] = None,
+    open_checkpoint: Optional[Callable[[], Optional[ChunkCheckpoint]]] = None,
+    cascade: Optional[Cascade] = None,
+) -> Dict[str, Any]:
+    """Transcribe ``audio`` chunk by chunk with ``Qwen3ASRModel``.
+
+    The model's forced aligner runs inside the same ``transcribe`` call, so
+    there is no separate alignment stage to overlap. With a ``cascade`` the
+    draft model is loaded without an aligner; chunks it keeps are aligned
+    afterwards by the full model's aligner.
+    """
+    model = get_qwen_model(**model_kwargs)
+
+    _transcribe = _qwen_chunk_transcriber(model, return_time_stamps, transcribe_kwargs)
+    _align: Optional[ChunkAligner] = None
+    if cascade is not None:
+        draft_model = get_qwen_model(
+            **{
+                **model_kwargs,
+                "model_name": cascade.draft_model,
+                "forced_aligner": None,
+                "forced_aligner_kwargs": None,
+            }
+        )
+        _transcribe = _cascade_chunk_transcriber(
+            _qwen_chunk_transcriber(draft_model, False, transcribe_kwargs),
+            _transcribe,
+            cascade,
+            ASR_SAMPLE_RATE,
+        )
+        if return_time_stamps:
+            _align = _qwen_chunk_aligner(model)
+
+    result = _run_chunked_asr(
+        audio,
+        sample_rate=ASR_SAMPLE_RATE,
+        transcribe=_transcribe,
+        align=_align,
+        aligned=return_time_stamps,
+        language=language,
+        max_chunk_sec=max_chunk_sec,
+        min_silence_sec=min_silence_sec,
+        tail_silence_window_sec=tail_silence_window_sec,
+        merge_tail_sec=merge_tail_sec,
+        language_probes=language_probes,
+        on_chunk=on_chunk,
+        open_checkpoint=open_checkpoint,
+    )
+    if cascade is not None:
+        result["cascade"] = cascade.summary()
+    return result
+
+
+def _qwen_model_kwargs(params: Dict[str, Any], backend: str) -> Dict[str, Any]:
+    """``get_qwen_model`` arguments for a predict/load request."""
     device = params.get("device") or DEFAULT_DEVICE
     dtype = params.get("dtype") or DEFAULT_DTYPE
-    max_batch = int(params.get("max_inference_batch_size", DEFAULT_MAX_BATCH))
-    max_new_tokens = int(params.get("max_new_tokens", DEFAULT_MAX_NEW_TOKENS))
     forced_aligner = (
         params.get("aligner_model")
         or params.get("forced_aligner")
@@ -565,61 +1172,197 @@ def _predict_qwen(params: Dict[str, Any], backend: str) -> Dict[str, Any]:
         }
     )
     forced_aligner_kwargs = dict(dtype=_resolve_dtype(dtype),device_map=device)
+    return {
+        "model_name": params.get("model") or DEFAULT_MODEL,
+        "backend": backend,
+        "device": device,
+        "dtype": dtype,
+        "max_batch": int(params.get("max_inference_batch_size", DEFAULT_MAX_BATCH)),
+        "max_new_tokens": int(params.get("max_new_tokens", DEFAULT_MAX_NEW_TOKENS)),
+        "forced_aligner": forced_aligner,
+        "forced_aligner_kwargs": forced_aligner_kwargs,
+        "quantize": resolve_quantize(params.get("quantize"), device),
+    }
+
+
+def _audio_info(audio_input: Any) -> Tuple[Optional[float], Optional[int]]:
+    """``(duration, sample_rate)`` of a decoded, path or ``(samples, sr)`` input, if known."""
+    if isinstance(audio_input, DecodedAudio):
+        return audio_input.duration, audio_input.source_rate
+    if _is_pcm(audio_input):
+        samples, sample_rate = audio_input
+        return len(samples) / float(sample_rate), int(sample_rate)
+    if not isinstance(audio_input, str) or not os.path.isfile(audio_input):
+        return None, None
+    try:
+        info = sf.info(audio_input)
+    except Exception:
+        return None, None
+    return info.duration, info.samplerate
+
+
+def _qwen_transcript(
+    result: Any, audio_input: Any, language: Optional[str], return_time_stamps: bool
+) -> Dict[str, Any]:
+    """Cacheable transcript for one whole-input ``Qwen3ASRModel.transcribe`` result."""
+    alignment = None
+    if return_time_stamps:
+        time_stamps = getattr(result, "time_stamps", None)
+        alignment = Alignment.from_items(getattr(time_stamps, "items", None))
+    duration, sample_rate = _audio_info(audio_input)
+    if language:
+        detection = _language_detection(language, "request")
+    else:
+        detected = primary_language(getattr(result, "language", None))
+        detection = _language_detection(detected, "first_chunk" if detected else None)
+    return _chunked_transcript(
+        _transcript_result(
+            str(getattr(result, "text", "") or "").strip(),
+            detection,
+            alignment,
+            duration=duration,
+            sample_rate=sample_rate,
+        ),
+        return_time_stamps,
+    )
+
+
+def _qwen_cache_key_parts(
+    model_kwargs: Dict[str, Any],
+    language: Optional[str],
+    return_time_stamps: bool,
+    transcribe_kwargs: Dict[str, Any],
+    chunking: Dict[str, Any],
+) -> Dict[str, Any]:
+    parts = {
+        "backend": model_kwargs["backend"],
+        "model": model_kwargs["model_name"],
+        "dtype": model_kwargs["dtype"],
+        "max_new_tokens": model_kwargs["max_new_tokens"],
+        "aligner_model": model_kwargs["forced_aligner"] if return_time_stamps else None,
+        "language": language,
+        "return_time_stamps": return_time_stamps,
+        "transcribe_kwargs": transcribe_kwargs,
+        **chunking,
+    }
+    if model_kwargs.get("quantize"):
+        parts["quantize"] = model_kwargs["quantize"]
+    return parts
+
+
+def _is_pcm(audio_input: Any) -> bool:
+    return isinstance(audio_input, tuple) and len(audio_input) == 2
+
+
+def _is_chunkable(audio_input: Any) -> bool:
+    """Files, URLs and shared PCM are chunked; other in-memory audio is not."""
+    if _is_pcm(audio_input):
+        return True
+    return isinstance(audio_input, str) and (
+        audio_input.startswith(("http://", "https://")) or os.path.isfile(audio_input)
+    )
+
+
+def _partial_emitter(
+    params: Dict[str, Any], emit: Optional[EventEmitter]
+) -> Optional[Callable[[Dict[str, Any]], None]]:
+    if emit is None or not bool(params.get("stream", False)):
+        return None
+    return lambda payload: emit("partial", payload)
+
+
+def _predict_qwen(
+    params: Dict[str, Any], backend: str, emit: Optional[EventEmitter] = None
+) -> Dict[str, Any]:
+    if backend != "transformers":
+        raise ValueError(f"unsupported backend: {backend}, expected transformers or mlx-audio")
+
+    model_kwargs = _qwen_model_kwargs(params, backend)
     language = params.get("language")
     return_time_stamps = bool(params.get("return_time_stamps", False))
     transcribe_kwargs = params.get("transcribe_kwargs") or {}
+    chunking = _chunking_params(params)
 
     audio_input = _resolve_audio_input(params)
-    model = get_qwen_model(
-        model_name=model_name,
-        backend=backend,
-        device=device,
-        dtype=dtype,
-        max_batch=max_batch,
-        max_new_tokens=max_new_tokens,
-        forced_aligner=forced_aligner,
-        forced_aligner_kwargs=forced_aligner_kwargs,
-    )
 
-    results = model.transcribe(
-        audio=audio_input,
-        language=language,
-        return_time_stamps=return_time_stamps,
-        **transcribe_kwargs,
-    )
-    if not isinstance(results, list):
-        results = [results]
+    if _is_chunkable(audio_input):
+        with metrics.stage("download"):
+            local_audio, cleanup_path = _resolve_local_audio_path(audio_input)
+        key_parts = _qwen_cache_key_parts(
+            model_kwargs, language, return_time_stamps, transcribe_kwargs, chunking
+        )
+        cascade = _cascade_settings(params, model_kwargs["model_name"], DEFAULT_QWEN_DRAFT_MODEL)
+        if cascade is not None:
+            key_parts["cascade"] = cascade.key_parts()
+        try:
+            transcript, cache_status = _cached_transcript(
+                params,
+                local_audio,
+                key_parts,
+                lambda: _chunked_transcript(
+                    _run_qwen_asr(
+                        local_audio,
+                        model_kwargs,
+                        language,
+                        return_time_stamps,
+                        transcribe_kwargs,
+                        on_chunk=_partial_emitter(params, emit),
+                        open_checkpoint=lambda: _open_checkpoint(params, local_audio, key_parts),
+                        cascade=cascade,
+                        **chunking,
+                    ),
+                    return_time_stamps,
+                ),
+            )
+        finally:
+            if cleanup_path:
+                release_download(cleanup_path)
+    else:
+        model = get_qwen_model(**model_kwargs)
+        with metrics.stage("asr"):
+            results = model.transcribe(
+                audio=audio_input,
+                language=language,
+                return_time_stamps=return_time_stamps,
+                **transcribe_kwargs,
+            )
+        if isinstance(results, list):
+            results = results[0]
+        transcript = _qwen_transcript(results, audio_input, language, return_time_stamps)
+        cache_status = "off"
 
-    # items: List[Dict[str, Any]] = [_normalize_result_item(x) for x in results]
-    text = results[0].text.strip()
+    items = transcript.get("items") or []
+    return {
+        **_qwen_response_header(model_kwargs, return_time_stamps),
+        "language": transcript.get("language") or language,
+        "language_detection": transcript.get("language_detection"),
+        "count": len(items),
+        "text": transcript.get("text"),
+        "items": items,
+        "duration": transcript.get("duration"),
+        "sample_rate": transcript.get("sample_rate"),
+        "cache": cache_status,
+        "cascade": transcript.get("cascade"),
+    }
 
-    items = [
-        {
-            "start": item.start_time,
-            "end": item.end_time,
-            "text": item.text,
-        }
-        for item in results[0].time_stamps.items
-    ]
-    info = sf.info(audio_input)
 
+def _qwen_response_header(
+    model_kwargs: Dict[str, Any], return_time_stamps: bool
+) -> Dict[str, Any]:
     return {
-        "model": model_name,
-        "backend": backend,
-        "device": device,
-        "dtype": dtype,
-        "language": results[0].language,
-        "aligner_model": forced_aligner,
+        "model": model_kwargs["model_name"],
+        "backend": model_kwargs["backend"],
+        "device": model_kwargs["device"],
+        "dtype": model_kwargs["dtype"],
+        "quantize": model_kwargs.get("quantize"),
+        "aligner_model": model_kwargs["forced_aligner"],
         "return_time_stamps": return_time_stamps,
-        "count": len(results),
-        "text": text,
-        "items": items,
-        "duration": info.duration,
-        "sample_rate": info.samplerate,
     }
 
 
-def _predict_mlx(params: Dict[str, Any], backend: str) -> Dict[str, Any]:
+def _predict_mlx(
+    params: Dict[str, Any], backend: str, emit: Optional[EventEmitter] = None
+) -> Dict[str, Any]:
     model_name = params.get("model") or DEFAULT_MODEL or DEFAULT_MLX_MODEL
     aligner_model = (
         params.get("aligner_model")
@@ -630,70 +1373,509 @@ def _predict_mlx(params: Dict[str, Any], backend: str) -> Dict[str, Any]:
     device = params.get("device") or "mps"
     dtype = params.get("dtype") or "float16"
     return_time_stamps = bool(params.get("return_time_stamps", False))
-
-    max_chunk_sec = float(params.get("max_chunk_sec", DEFAULT_MLX_MAX_CHUNK_SEC))
-    min_silence_sec = float(params.get("min_silence_sec", DEFAULT_MLX_MIN_SILENCE_SEC))
-    tail_silence_window_sec = float(
-        params.get("tail_silence_window_sec", DEFAULT_MLX_TAIL_SILENCE_WINDOW_SEC)
-    )
-    merge_tail_sec = float(params.get("merge_tail_sec", DEFAULT_MLX_MERGE_TAIL_SEC))
+    chunking = _chunking_params(params)
+    pipeline_depth = int(params.get("pipeline_depth", DEFAULT_PIPELINE_DEPTH))
 
     audio_input = _resolve_audio_input(params)
-    audio_path, cleanup_path = _resolve_mlx_audio_path(audio_input)
+    with metrics.stage("download"):
+        local_audio, cleanup_path = _resolve_local_audio_path(audio_input)
+    key_parts = {
+        "backend": backend,
+        "model": model_name,
+        "aligner_model": aligner_model if return_time_stamps else None,
+        "language": language,
+        "return_time_stamps": return_time_stamps,
+        **chunking,
+    }
+    cascade = _cascade_settings(params, model_name, DEFAULT_MLX_DRAFT_MODEL)
+    if cascade is not None:
+        key_parts["cascade"] = cascade.key_parts()
     try:
-        mlx_result = _run_mlx_asr(
-            audio_path=audio_path,
-            model_name=model_name,
-            aligner_model_name=aligner_model,
-            language=language,
-            max_chunk_sec=max_chunk_sec,
-            min_silence_sec=min_silence_sec,
-            tail_silence_window_sec=tail_silence_window_sec,
-            merge_tail_sec=merge_tail_sec,
+        transcript, cache_status = _cached_transcript(
+            params,
+            local_audio,
+            key_parts,
+            lambda: _chunked_transcript(
+                _run_mlx_asr(
+                    audio=local_audio,
+                    model_name=model_name,
+                    aligner_model_name=aligner_model,
+                    language=language,
+                    on_chunk=_partial_emitter(params, emit),
+                    pipeline_depth=pipeline_depth,
+                    align=return_time_stamps,
+                    open_checkpoint=lambda: _open_checkpoint(params, local_audio, key_parts),
+                    cascade=cascade,
+                    **chunking,
+                ),
+                return_time_stamps,
+            ),
         )
     finally:
-        if cleanup_path and os.path.exists(cleanup_path):
-            os.remove(cleanup_path)
-
-    asr_text = str(mlx_result.get("text", "") or "")
-    sentence_segments = mlx_result.get("sentence_segments") or []
-    alignment = mlx_result.get("alignment") or []
-
-    if return_time_stamps:
-        items = sentence_segments or alignment
-    else:
-        items = [{"text": seg.get("text", "")} for seg in sentence_segments]
-        if not items and asr_text:
-            items = [{"text": asr_text}]
+        if cleanup_path:
+            release_download(cleanup_path)
 
+    items = transcript.get("items") or []
     return {
         "model": model_name,
         "backend": backend,
         "device": device,
         "dtype": dtype,
-        "language": language,
+        "language": transcript.get("language") or language,
+        "language_detection": transcript.get("language_detection"),
         "aligner_model": aligner_model,
         "return_time_stamps": return_time_stamps,
         "count": len(items),
-        "text": asr_text,
+        "text": transcript.get("text", ""),
         "items": items,
-        "duration": mlx_result.get("duration"),
-        "sample_rate": mlx_result.get("sample_rate"),
+        "duration": transcript.get("duration"),
+        "sample_rate": transcript.get("sample_rate"),
+        "cache": cache_status,
+        "cascade": transcript.get("cascade"),
     }
 
 
-def method_predict(params: Dict[str, Any]) -> Dict[str, Any]:
+def _resolve_stt_backend(params: Dict[str, Any]) -> str:
     backend = (params.get("backend") or DEFAULT_BACKEND).strip().lower()
     if backend in {"mlx", "mlx_audio", "mlx-audio"}:
-        return _predict_mlx(params, backend="mlx-audio")
+        return "mlx-audio"
     if backend != "transformers":
         raise ValueError(f"unsupported backend: {backend}, expected transformers or mlx-audio")
-    return _predict_qwen(params, backend=backend)
+    return backend
+
+
+def preload_stt_model(params: Dict[str, Any]) -> Dict[str, Any]:
+    """Load the models a ``predict`` request with ``params`` would use."""
+    backend = _resolve_stt_backend(params)
+    return_time_stamps = bool(params.get("return_time_stamps", False))
+    if backend == "mlx-audio":
+        model_name = params.get("model") or DEFAULT_MODEL or DEFAULT_MLX_MODEL
+        get_mlx_asr_model(model_name)
+        aligner_model = None
+        if return_time_stamps:
+            aligner_model = (
+                params.get("aligner_model")
+                or params.get("forced_aligner")
+                or DEFAULT_MLX_ALIGNER_MODEL
+            )
+            get_mlx_aligner_model(aligner_model)
+        return {"backend": backend, "model": model_name, "aligner_model": aligner_model}
+
+    model_kwargs = _qwen_model_kwargs(params, backend)
+    get_qwen_model(**model_kwargs)
+    return {
+        "backend": backend,
+        "model": model_kwargs["model_name"],
+        "aligner_model": model_kwargs["forced_aligner"],
+        "quantize": model_kwargs["quantize"],
+    }
+
+
+def open_stream_transcriber(
+    params: Dict[str, Any]
+) -> Tuple[Callable[[Any, Optional[str]], Tuple[str, Optional[str]]], Callable[[], None], Dict]:
+    """Transcriber over in-memory 16 kHz buffers for a live session.
+
+    Returns ``(transcribe, close, info)``; ``transcribe(samples, language)``
+    gives ``(text, language)`` and ``close`` releases per-session resources,
+    including the registry pin on the session's model.
+    """
+    backend = _resolve_stt_backend(params)
+    counter = iter(range(1 << 62))
+    feeder: Optional[_ChunkFeeder] = None
+    if backend == "mlx-audio":
+        model_name = params.get("model") or DEFAULT_MODEL or DEFAULT_MLX_MODEL
+        feeder = _ChunkFeeder(ASR_SAMPLE_RATE)
+        model = get_mlx_asr_model(model_name)
+        transcribe_chunk = _mlx_chunk_transcriber(model, feeder)
+    else:
+        model_kwargs = _qwen_model_kwargs(params, backend)
+        model_name = model_kwargs["model_name"]
+        model = get_qwen_model(**model_kwargs)
+        transcribe_chunk = _qwen_chunk_transcriber(
+            model, False, params.get("transcribe_kwargs") or {}
+        )
+    # The session outlives the stream_open request; keep its model pinned so
+    # the registry neither evicts nor double-loads it while the session lives.
+    release_model = model_registry.retain(model)
+
+    def close() -> None:
+        if feeder is not None:
+            feeder.close()
+        release_model()
+
+    def _transcribe(samples: Any, language: Optional[str]) -> Tuple[str, Optional[str]]:
+        # Every decode gets its own name so path-only models never reuse a WAV.
+        chunk = PlannedChunk(next(counter), 0, len(samples), samples, True)
+        with metrics.stage("asr"):
+            result = transcribe_chunk(chunk, None, language)
+        return result.text, primary_language(result.language)
+
+    info = {"backend": backend, "model": model_name, "sample_rate": ASR_SAMPLE_RATE}
+    return _transcribe, close, info
+
+
+WARMUP_SECONDS = 1.0
+
+
+def warmup_stt(params: Dict[str, Any]) -> Dict[str, Any]:
+    """Transcribe a second of silence so kernels are compiled before real use."""
+    import numpy as np  # type: ignore
+
+    fd, path = tempfile.mkstemp(prefix="stt_warmup_", suffix=".wav")
+    os.close(fd)
+    try:
+        silence = np.zeros(int(WARMUP_SECONDS * ASR_SAMPLE_RATE), dtype=np.float32)
+        sf.write(path, silence, ASR_SAMPLE_RATE)
+        warm_params = {
+            key: value
+            for key, value in params.items()
+            if key not in _AUDIO_FIELDS and key != "stream"
+        }
+        result = method_predict({**warm_params, "audio_path": path, "cache": False})
+    finally:
+        if os.path.exists(path):
+            os.remove(path)
+    return {"backend": result.get("backend"), "model": result.get("model")}
+
+
+def method_predict(
+    params: Dict[str, Any], emit: Optional[EventEmitter] = None
+) -> Dict[str, Any]:
+    """Transcribe one audio input.
+
+    Files and URLs are transcribed in chunks cut at pauses on either backend.
+    With ``params.stream`` and an ``emit`` callback, a ``partial`` event is
+    emitted per finalized chunk before the final result is returned.
+    Transcripts of local files are cached on disk; ``params.cache=false``
+    bypasses the cache and the ``cache`` field reports ``hit``/``miss``/``off``.
+    """
+    backend = _resolve_stt_backend(params)
+    with decode_scope():
+        if backend == "mlx-audio":
+            return _predict_mlx(params, backend=backend, emit=emit)
+        return _predict_qwen(params, backend=backend, emit=emit)
+
+
+
+# ---------- Batched transcription ----------
+# Inputs shorter than this share a duration bucket regardless of the ratio.
+_BATCH_MIN_BUCKET_SEC = 1.0
+
+# (index, audio input, language, cache key) of an input that needs the model.
+_PendingInput = Tuple[int, Any, Optional[str], Optional[str]]
+
+
+def _plan_batches(
+    durations: Sequence[Optional[float]], max_batch: int, max_ratio: float
+) -> List[List[int]]:
+    """Group input indices into batches of similar duration.
+
+    Inputs are sorted by duration so each batch pads as little as possible. A
+    batch is closed when it holds ``max_batch`` inputs or when the next input
+    would be more than ``max_ratio`` times longer than its shortest one.
+    Inputs of unknown duration are batched last, in input order.
+    """
+    max_batch = max(1, int(max_batch))
+    known = sorted(
+        (i for i, d in enumerate(durations) if d is not None),
+        key=lambda i: (durations[i], i),
+    )
+    unknown = [i for i, d in enumerate(durations) if d is None]
+
+    batches: List[List[int]] = []
+    current: List[int] = []
+    for index in known:
+        if current:
+            shortest = max(durations[current[0]], _BATCH_MIN_BUCKET_SEC)
+            too_long = max_ratio > 0 and durations[index] > shortest * max_ratio
+            if len(current) >= max_batch or too_long:
+                batches.append(current)
+                current = []
+        current.append(index)
+    if current:
+        batches.append(current)
+    for start in range(0, len(unknown), max_batch):
+        batches.append(unknown[start : start + max_batch])
+    return batches
+
+
+def _batch_inputs(params: Dict[str, Any]) -> List[Dict[str, Any]]:
+    inputs = params.get("inputs")
+    if inputs is None:
+        inputs = params.get("audio_paths")
+    if not isinstance(inputs, list) or not inputs:
+        raise ValueError("params.inputs must be a non-empty list")
+    out: List[Dict[str, Any]] = []
+    for entry in inputs:
+        if isinstance(entry, str):
+            field = "audio_url" if entry.startswith(("http://", "https://")) else "audio_path"
+            entry = {field: entry}
+        elif not isinstance(entry, dict):
+            raise ValueError("each batch input must be a path, a URL or an object")
+        out.append(entry)
+    return out
+
+
+def _input_duration(audio_input: Any) -> Optional[float]:
+    if _is_pcm(audio_input):
+        return _audio_info(audio_input)[0]
+    if not isinstance(audio_input, str) or not os.path.isfile(audio_input):
+        return None
+    try:
+        return float(sf.info(audio_input).duration)
+    except Exception:
+        return None
+
+
+def _batch_item(index: int, entry: Dict[str, Any]) -> Dict[str, Any]:
+    item: Dict[str, Any] = {"index": index}
+    for field in ("audio_path", "audio_url", "audio_pcm"):
+        if field in entry:
+            item[field] = entry[field]
+    return item
 
 
+def _predict_batch_qwen(
+    params: Dict[str, Any],
+    backend: str,
+    inputs: List[Dict[str, Any]],
+    emit: Optional[EventEmitter],
+) -> Dict[str, Any]:
+    model_kwargs = _qwen_model_kwargs(params, backend)
+    return_time_stamps = bool(params.get("return_time_stamps", False))
+    transcribe_kwargs = params.get("transcribe_kwargs") or {}
+    max_ratio = float(params.get("max_duration_ratio", BATCH_MAX_DURATION_RATIO))
+    stream = bool(params.get("stream")) and emit is not None
+    chunking = _chunking_params(params)
+    # Inputs at least this long would be split into several chunks.
+    single_chunk_sec = chunking["max_chunk_sec"] + chunking["merge_tail_sec"]
+
+    results: List[Dict[str, Any]] = [_batch_item(i, e) for i, e in enumerate(inputs)]
+    pending: List[_PendingInput] = []
+
+    def _finish(
+        index: int,
+        transcript: Optional[Dict[str, Any]],
+        status: str = "",
+        error: Optional[BaseException] = None,
+    ) -> None:
+        item = results[index]
+        if error is not None:
+            item.update({"ok": False, "error": str(error)})
+        else:
+            item.update(
+                {
+                    "ok": True,
+                    "language": transcript.get("language"),
+                    "language_detection": transcript.get("language_detection"),
+                    "text": transcript.get("text"),
+                    "items": transcript.get("items"),
+                    "duration": transcript.get("duration"),
+                    "sample_rate": transcript.get("sample_rate"),
+                    "cache": status,
+                }
+            )
+        if stream:
+            emit("item", item)  # type: ignore[misc]
+
+    for index, entry in enumerate(inputs):
+        language = entry.get("language", params.get("language"))
+        try:
+            audio_input = _resolve_audio_input(entry)
+            key = _transcript_cache_key(
+                params,
+                audio_input if isinstance(audio_input, (str, tuple)) else None,
+                _qwen_cache_key_parts(
+                    model_kwargs, language, return_time_stamps, transcribe_kwargs, chunking
+                ),
+            )
+            cached = _load_cached_transcript(key) if key else None
+        except Exception as exc:
+            _finish(index, None, error=exc)
+            continue
+        if cached is not None:
+            _finish(index, cached, "hit")
+        else:
+            pending.append((index, audio_input, language, key))
+
+    calls = 0
+
+    def _run(model: Any, members: List[_PendingInput]) -> None:
+        nonlocal calls
+        languages = [member[2] for member in members]
+        calls += 1
+        try:
+            # Decoded here once; the model and the transcript metadata share it.
+            decoded = [decode_audio(member[1], ASR_SAMPLE_RATE) for member in members]
+            with metrics.stage("asr"):
+                outputs = model.transcribe(
+                    audio=[(audio.samples, ASR_SAMPLE_RATE) for audio in decoded],
+                    language=languages[0] if len(set(languages)) == 1 else languages,
+                    return_time_stamps=return_time_stamps,
+                    **transcribe_kwargs,
+                )
+            if not isinstance(outputs, list):
+                outputs = [outputs]
+            if len(outputs) != len(members):
+                raise RuntimeError(
+                    f"expected {len(members)} transcripts, got {len(outputs)}"
+                )
+        except Exception as exc:
+            if len(members) == 1:
+                _finish(members[0][0], None, error=exc)
+                return
+            # Isolate the failing input instead of failing the whole batch.
+            logging.warning(
+                "batch of %d inputs failed (%s); retrying one by one", len(members), exc
+            )
+            for member in members:
+                _run(model, [member])
+            return
+        for (index, _, language, key), audio, output in zip(members, decoded, outputs):
+            try:
+                transcript = _qwen_transcript(output, audio, language, return_time_stamps)
+            except Exception as exc:
+                _finish(index, None, error=exc)
+                continue
+            if key is not None:
+                _store_cached_transcript(key, transcript)
+            _finish(index, transcript, "miss" if key is not None else "off")
+        touch()
+
+    def _run_chunked(member: _PendingInput) -> None:
+        nonlocal calls
+        index, audio_input, language, key = member
+        calls += 1
+        try:
+            with metrics.stage("download"):
+                local_audio, cleanup_path = _resolve_local_audio_path(audio_input)
+            try:
+                key_parts = _qwen_cache_key_parts(
+                    model_kwargs, language, return_time_stamps, transcribe_kwargs, chunking
+                )
+                transcript = _chunked_transcript(
+                    _run_qwen_asr(
+                        local_audio,
+                        model_kwargs,
+                        language,
+                        return_time_stamps,
+                        transcribe_kwargs,
+                        open_checkpoint=lambda: _open_checkpoint(params, local_audio, key_parts),
+                        **chunking,
+                    ),
+                    return_time_stamps,
+                )
+            finally:
+                if cleanup_path:
+                    release_download(cleanup_path)
+        except Exception as exc:
+            _finish(index, None, error=exc)
+            return
+        if key is not None:
+            _store_cached_transcript(key, transcript)
+        _finish(index, transcript, "miss" if key is not None else "off")
+
+    if pending:
+        model = get_qwen_model(**model_kwargs)
+        with metrics.stage("probe"):
+            durations = [_input_duration(member[1]) for member in pending]
+        # Long recordings and URLs go through the chunk engine one at a time so
+        # memory stays bounded; everything else is batched.
+        short = [
+            i for i, d in enumerate(durations) if d is not None and d < single_chunk_sec
+        ]
+        short_set = set(short)
+        batches = _plan_batches(
+            [durations[i] for i in short], model_kwargs["max_batch"], max_ratio
+        )
+        for batch in batches:
+            _run(model, [pending[short[i]] for i in batch])
+        for i, member in enumerate(pending):
+            if i not in short_set:
+                _run_chunked(member)
+
+    return {
+        **_qwen_response_header(model_kwargs, return_time_stamps),
+        **_batch_summary(results),
+        "batches": calls,
+    }
+
+
+def _predict_batch_sequential(
+    params: Dict[str, Any],
+    backend: str,
+    inputs: List[Dict[str, Any]],
+    emit: Optional[EventEmitter],
+) -> Dict[str, Any]:
+    shared = {
+        key: value
+        for key, value in params.items()
+        if key not in _AUDIO_FIELDS and key not in {"inputs", "audio_paths", "stream"}
+    }
+    stream = bool(params.get("stream")) and emit is not None
+    results: List[Dict[str, Any]] = []
+    header: Dict[str, Any] = {"model": params.get("model"), "backend": backend}
+    calls = 0
+    for index, entry in enumerate(inputs):
+        item = _batch_item(index, entry)
+        try:
+            result = _predict_mlx({**shared, **entry}, backend=backend)
+        except Exception as exc:
+            item.update({"ok": False, "error": str(exc)})
+        else:
+            header = {"model": result.get("model"), "backend": result.get("backend")}
+            if result.get("cache") != "hit":
+                calls += 1
+            item.update({"ok": True, **result})
+            item.pop("model", None)
+            item.pop("backend", None)
+        results.append(item)
+        if stream:
+            emit("item", item)  # type: ignore[misc]
+        touch()
+    return {**header, **_batch_summary(results), "batches": calls}
+
+
+def _batch_summary(results: List[Dict[str, Any]]) -> Dict[str, Any]:
+    return {
+        "count": len(results),
+        "errors": sum(1 for item in results if not item.get("ok")),
+        "duration": sum(item.get("duration") or 0.0 for item in results),
+        "results": results,
+    }
+
+
+def method_predict_batch(
+    params: Dict[str, Any], emit: Optional[EventEmitter] = None
+) -> Dict[str, Any]:
+    """Transcribe many audio inputs, returning per-input results in input order.
+
+    ``params.inputs`` holds paths, URLs or objects with ``audio_path`` /
+    ``audio_url`` and an optional per-input ``language``; the other params
+    apply to every input as in ``predict``. The transformers backend sorts
+    inputs into duration buckets of up to ``max_inference_batch_size`` and
+    transcribes each bucket in one call; inputs longer than one chunk, URLs
+    and every MLX input are transcribed one by one in chunks. A
+    failing input is reported in its own result and does not fail the rest.
+    With ``params.stream`` an ``item`` event is emitted per finished input.
+    """
+    inputs = _batch_inputs(params)
+    backend = _resolve_stt_backend(params)
+    if backend == "mlx-audio":
+        return _predict_batch_sequential(params, backend, inputs, emit)
+    return _predict_batch_qwen(params, backend, inputs, emit)
+
 
 def get_stt_status() -> Dict[str, Any]:
+    stt_keys = model_registry.keys(STT_MODEL_KIND)
+    aligner_keys = model_registry.keys(ALIGNER_MODEL_KIND)
     return {
-        "loaded": (_model is not None) or (_mlx_asr_model is not None),
-        "model_key": _model_key if _model_key is not None else _mlx_model_key,
+        "loaded": bool(stt_keys),
+        "model_key": stt_keys[0] if stt_keys else None,
+        "aligner_loaded": bool(aligner_keys),
+        "aligner_model_key": aligner_keys[0] if aligner_keys else None,
+        "transcript_cache": get_transcript_cache().stats(),
+        "decode_cache": decode_cache.stats(),
+        "downloads": get_downloader().stats(),
     }
@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import sys
+import unittest
+from pathlib import Path
+from types import SimpleNamespace
+
+import numpy as np
+
+
+RUNTIME_DIR = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(RUNTIME_DIR))
+
+from alignment import Alignment  # noqa: E402
+
+
+def _items(*tokens):
+    return [
+        {"start_time": index * 0.5, "end_time": index * 0.5 + 0.4, "text": text}
+        for index, text in enumerate(tokens)
+    ]
+
+
+class AlignmentTests(unittest.TestCase):
+    def test_from_items_accepts_dicts_and_objects(self):
+        alignment = Alignment.from_items(
+            [
+                {"start": "0.5", "end": None, "text": "hi"},
+                SimpleNamespace(start_time=1.0, end_time=1.5, text=None),
+                {"start_time": "bad", "text": "there"},
+            ]
+        )
+
+        self.assertEqual(len(alignment), 3)
+        np.testing.assert_allclose(alignment.starts, [0.5, 1.0, 0.0])
+        np.testing.assert_allclose(alignment.ends, [0.5, 1.5, 0.0])
+        self.assertEqual([alignment.token(i) for i in range(3)], ["hi", "", "there"])
+
+    def test_concat_and_shift_keep_tokens_and_times(self):
+        first = Alignment.from_items(_items("hello", "world"))
+        second = Alignment.from_items(_items("again")).shifted(10.0)
+
+        merged = Alignment.concat([first, Alignment.empty(), second])
+
+        self.assertEqual(
+            [item["text"] for item in merged.to_list()], ["hello", "world", "again"]
+        )
+        self.assertEqual(merged.to_list()[2]["time_stamps"], [10.0, 10.4])
+        self.assertEqual(merged.shifted(-10.0).to_items()[2]["start_time"], 0.0)
+
+    def test_sentence_segments_follow_transcript_punctuation(self):
+        alignment = Alignment.from_items(_items("Hello", " world", " how", " are", " you"))
+
+        segments = alignment.sentence_segments("Hello world. How are you?")
+
+        self.assertEqual([segment["text"] for segment in segments], ["Hello world", "how are you"])
+        self.assertEqual(segments[0]["time_stamps"], [0.0, 0.9])
+        self.assertEqual((segments[1]["start"], segments[1]["end"]), (1.0, 2.4))
+
+    def test_sentence_segments_split_cjk_per_character_tokens(self):
+        alignment = Alignment.from_items(_items("你", "好", "世", "界"))
+
+        segments = alignment.sentence_segments("你好，世界。")
+
+        self.assertEqual([segment["text"] for segment in segments], ["你好", "世界"])
+
+    def test_empty_alignment_has_no_segments(self):
+        self.assertEqual(Alignment.from_items(None).sentence_segments("Hi."), [])
+        self.assertEqual(Alignment.concat([]).to_list(), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,270 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import os
+import stat
+import sys
+import tempfile
+import textwrap
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+import numpy as np
+import soundfile as sf
+
+
+RUNTIME_DIR = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(RUNTIME_DIR))
+
+import audio_io  # noqa: E402
+
+
+def _tone(freq, seconds, sample_rate):
+    t = np.arange(int(seconds * sample_rate)) / float(sample_rate)
+    return np.sin(2 * np.pi * freq * t).astype(np.float32)
+
+
+# Stands in for ffmpeg on a made-up container libsndfile cannot open: a
+# "FAKE <rate> <has-duration>" line followed by float32 samples. Like ffmpeg
+# it describes the input on stderr when given no output, and otherwise writes
+# f32le at -ar to stdout, honouring -ss and -t.
+_FAKE_FFMPEG = """\
+    import sys
+    import numpy as np
+
+    args = sys.argv[1:]
+
+    def opt(name, default=None):
+        return args[args.index(name) + 1] if name in args else default
+
+    with open(opt("-i"), "rb") as src:
+        header = src.readline().split()
+        if not header or header[0] != b"FAKE":
+            sys.stderr.write("Invalid data found when processing input\\n")
+            sys.exit(1)
+        rate = int(header[1])
+        samples = np.frombuffer(src.read(), dtype="<f4")
+    if "-f" not in args:
+        duration = "%.2f" % (len(samples) / float(rate)) if header[2] == b"1" else "N/A"
+        sys.stderr.write("  Duration: 00:00:%s, start: 0.000000\\n" % duration)
+        sys.stderr.write("  Stream #0:0: Audio: aac, %d Hz, mono, fltp\\n" % rate)
+        sys.exit(1)
+    out_rate = int(opt("-ar"))
+    count = int(round(len(samples) * out_rate / float(rate)))
+    out = np.interp(np.arange(count) * rate / float(out_rate), np.arange(len(samples)), samples)
+    first = int(round(float(opt("-ss", 0)) * out_rate))
+    out = out[first:]
+    if "-t" in args:
+        out = out[: int(round(float(opt("-t")) * out_rate))]
+    sys.stdout.buffer.write(out.astype("<f4").tobytes())
+"""
+
+
+def write_fake_ffmpeg(directory):
+    """Install the fake ffmpeg in ``directory`` and return its path."""
+    path = os.path.join(directory, "ffmpeg")
+    with open(path, "w") as script:
+        script.write(f"#!{sys.executable}\n" + textwrap.dedent(_FAKE_FFMPEG))
+    os.chmod(path, os.stat(path).st_mode | stat.S_IEXEC)
+    return path
+
+
+def write_fake_container(path, samples, sample_rate, with_duration=True):
+    with open(path, "wb") as out:
+        out.write(b"FAKE %d %d\n" % (sample_rate, 1 if with_duration else 0))
+        out.write(np.asarray(samples, dtype="<f4").tobytes())
+
+
+class ResamplerTests(unittest.TestCase):
+    def test_block_feeding_matches_one_shot(self):
+        signal = _tone(440.0, 2.3, 44100)
+        expected = audio_io.resample(signal, 44100, 16000)
+
+        resampler = audio_io.Resampler(44100, 16000)
+        blocks = [
+            resampler.process(signal[i : i + 3001])
+            for i in range(0, len(signal), 3001)
+        ]
+        blocks.append(resampler.flush())
+
+        np.testing.assert_array_equal(np.concatenate(blocks), expected)
+
+    def test_downsampling_preserves_in_band_tone(self):
+        out = audio_io.resample(_tone(440.0, 1.0, 48000), 48000, 16000)
+
+        self.assertEqual(len(out), 16000)
+        reference = _tone(440.0, 1.0, 16000)
+        self.assertLess(np.abs(out[100:-100] - reference[100:-100]).max(), 1e-3)
+
+    def test_downsampling_removes_out_of_band_tone(self):
+        out = audio_io.resample(_tone(10000.0, 1.0, 48000), 48000, 16000)
+
+        self.assertLess(np.sqrt(np.mean(out[100:-100] ** 2)), 0.01)
+
+    def test_same_rate_is_passthrough(self):
+        signal = _tone(440.0, 0.5, 16000)
+
+        np.testing.assert_array_equal(audio_io.resample(signal, 16000, 16000), signal)
+
+    def test_to_mono_float32_averages_channels(self):
+        stereo = np.array([[1.0, 0.0], [0.5, 0.5]], dtype=np.float64)
+
+        mono = audio_io.to_mono_float32(stereo)
+
+        self.assertEqual(mono.dtype, np.float32)
+        np.testing.assert_allclose(mono, [0.5, 0.5])
+
+
+class StreamingAudioReaderTests(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.temp_dir.cleanup)
+
+    def _write(self, data, sample_rate):
+        path = os.path.join(self.temp_dir.name, "input.wav")
+        sf.write(path, data, sample_rate, subtype="FLOAT")
+        return path
+
+    def test_blocks_match_whole_file_decode(self):
+        left = _tone(440.0, 3.1, 48000)
+        right = _tone(660.0, 3.1, 48000)
+        path = self._write(np.stack([left, right], axis=1), 48000)
+        expected = audio_io.resample((left + right) / 2.0, 48000, 16000)
+
+        reader = audio_io.StreamingAudioReader(path, 16000, block_frames=4096)
+        blocks = list(reader.blocks())
+
+        self.assertGreater(len(blocks), 1)
+        self.assertTrue(all(block.dtype == np.float32 for block in blocks))
+        np.testing.assert_allclose(np.concatenate(blocks), expected, atol=1e-6)
+        self.assertEqual(reader.total_samples, len(expected))
+        self.assertEqual(reader.native_rate, 48000)
+
+    def test_read_segment_decodes_only_the_requested_span(self):
+        signal = np.linspace(-0.5, 0.5, 16000 * 3, dtype=np.float32)
+        path = self._write(signal, 16000)
+
+        reader = audio_io.StreamingAudioReader(path, 16000)
+
+        np.testing.assert_array_equal(reader.read_segment(8000, 4000), signal[8000:12000])
+        self.assertEqual(len(reader.read_segment(47000, 4000)), 1000)
+        self.assertEqual(len(reader.read_segment(60000, 4000)), 0)
+
+    def test_array_reader_matches_file_reader(self):
+        signal = _tone(440.0, 2.3, 48000)
+        reader = audio_io.StreamingAudioReader(self._write(signal, 48000), 16000)
+
+        array_reader = audio_io.ArrayAudioReader(signal, 48000, 16000, block_frames=4096)
+
+        self.assertEqual(array_reader.total_samples, reader.total_samples)
+        np.testing.assert_allclose(
+            np.concatenate(list(array_reader.blocks())),
+            np.concatenate(list(reader.blocks())),
+            atol=1e-6,
+        )
+        np.testing.assert_allclose(
+            array_reader.read_segment(8000, 4000), reader.read_segment(8000, 4000), atol=1e-6
+        )
+
+    def test_window_holds_only_unreleased_samples(self):
+        signal = np.arange(100, dtype=np.float32)
+        window = audio_io.AudioWindow(
+            signal[i : i + 7] for i in range(0, len(signal), 7)
+        )
+
+        np.testing.assert_array_equal(window.read(0, 30), signal[0:30])
+        window.release(20)
+        np.testing.assert_array_equal(window.read(20, 50), signal[20:50])
+        self.assertLessEqual(window.available_end - 20, 50 - 20 + 7)
+        with self.assertRaises(ValueError):
+            window.read(10, 40)
+
+        np.testing.assert_array_equal(window.read(90, 120), signal[90:])
+        self.assertTrue(window.exhausted)
+
+
+class FFmpegAudioReaderTests(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.temp_dir.cleanup)
+        ffmpeg = write_fake_ffmpeg(self.temp_dir.name)
+        patcher = patch.dict(os.environ, {"QWEN_ASR_FFMPEG": ffmpeg})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.path = os.path.join(self.temp_dir.name, "voice.m4a")
+        self.signal = 0.5 * _tone(220.0, 3.0, 16000)
+
+    def test_soundfile_formats_skip_ffmpeg(self):
+        wav = os.path.join(self.temp_dir.name, "voice.wav")
+        sf.write(wav, self.signal, 16000)
+
+        reader = audio_io.open_audio_reader(wav)
+
+        self.assertIsInstance(reader, audio_io.StreamingAudioReader)
+
+    def test_other_containers_stream_through_ffmpeg(self):
+        write_fake_container(self.path, self.signal, 16000)
+
+        reader = audio_io.open_audio_reader(self.path, block_frames=4000)
+        blocks = list(reader.blocks())
+
+        self.assertIsInstance(reader, audio_io.FFmpegAudioReader)
+        self.assertEqual(reader.native_rate, 16000)
+        self.assertAlmostEqual(reader.duration, 3.0)
+        self.assertEqual(reader.total_samples, len(self.signal))
+        self.assertTrue(all(len(block) <= 4000 for block in blocks))
+        np.testing.assert_allclose(np.concatenate(blocks), self.signal, atol=1e-6)
+
+    def test_output_is_resampled_by_ffmpeg(self):
+        write_fake_container(self.path, _tone(220.0, 2.0, 44100), 44100)
+
+        reader = audio_io.open_audio_reader(self.path)
+
+        self.assertEqual(reader.source_rate, 44100)
+        self.assertEqual(sum(len(block) for block in reader.blocks()), 32000)
+
+    def test_read_segment_seeks(self):
+        write_fake_container(self.path, self.signal, 16000)
+
+        segment = audio_io.open_audio_reader(self.path).read_segment(8000, 1600)
+
+        np.testing.assert_allclose(segment, self.signal[8000:9600], atol=1e-6)
+
+    def test_unknown_length_streams_report_zero(self):
+        write_fake_container(self.path, self.signal, 16000, with_duration=False)
+
+        reader = audio_io.open_audio_reader(self.path)
+
+        self.assertEqual(reader.total_samples, 0)
+        self.assertEqual(sum(len(block) for block in reader.blocks()), len(self.signal))
+
+    def test_abandoned_stream_stops_the_decoder(self):
+        write_fake_container(self.path, _tone(220.0, 30.0, 16000), 16000)
+        reader = audio_io.open_audio_reader(self.path, block_frames=1024)
+
+        blocks = reader.blocks()
+        first = next(blocks)
+        blocks.close()
+
+        self.assertEqual(len(first), 1024)
+
+    def test_undecodable_input_raises(self):
+        with open(self.path, "wb") as out:
+            out.write(b"not audio at all")
+
+        with self.assertRaises(RuntimeError):
+            audio_io.open_audio_reader(self.path)
+
+    def test_missing_ffmpeg_is_reported(self):
+        write_fake_container(self.path, self.signal, 16000)
+
+        with patch.dict(os.environ, {"QWEN_ASR_FFMPEG": "", "FFMPEG_PATH": ""}), patch.object(
+            audio_io.shutil, "which", return_value=None
+        ):
+            with self.assertRaisesRegex(RuntimeError, "install ffmpeg"):
+                audio_io.open_audio_reader(self.path)
+
+
+if __name__ == "__main__":
+    unittest.main()
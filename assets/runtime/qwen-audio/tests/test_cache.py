@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import hashlib
+import os
+import sys
+import tempfile
+import time
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+
+RUNTIME_DIR = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(RUNTIME_DIR))
+
+import cache  # noqa: E402
+
+
+class HashFileTests(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.temp_dir.cleanup)
+        self.path = os.path.join(self.temp_dir.name, "audio.bin")
+
+    def test_streamed_hash_matches_whole_file_hash(self):
+        data = os.urandom(3 * cache.HASH_BLOCK_SIZE + 123)
+        with open(self.path, "wb") as dst:
+            dst.write(data)
+
+        self.assertEqual(cache.hash_file(self.path), hashlib.sha256(data).hexdigest())
+
+    def test_unchanged_file_is_hashed_once(self):
+        with open(self.path, "wb") as dst:
+            dst.write(b"abc")
+        cache.hash_file(self.path)
+
+        with patch.object(cache.hashlib, "sha256") as sha256:
+            cache.hash_file(self.path)
+
+        sha256.assert_not_called()
+
+    def test_modified_file_is_rehashed(self):
+        with open(self.path, "wb") as dst:
+            dst.write(b"abc")
+        before = cache.hash_file(self.path)
+        with open(self.path, "wb") as dst:
+            dst.write(b"abcd")
+
+        self.assertNotEqual(cache.hash_file(self.path), before)
+
+
+class DiskLRUCacheTests(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.temp_dir.cleanup)
+
+    def _cache(self, max_bytes):
+        return cache.DiskLRUCache(self.temp_dir.name, max_bytes, suffix=".json")
+
+    def _age(self, store, key, seconds):
+        stamp = time.time() - seconds
+        os.utime(store.path_for(key), (stamp, stamp))
+
+    def test_json_round_trip(self):
+        store = self._cache(1 << 20)
+        key = cache.cache_key({"audio": "x", "language": None})
+
+        store.put_json(key, {"text": "你好", "items": [{"text": "你好"}]})
+
+        self.assertEqual(store.get_json(key), {"text": "你好", "items": [{"text": "你好"}]})
+        self.assertIsNone(store.get_json(cache.cache_key({"audio": "y"})))
+        self.assertEqual(store.stats()["hits"], 1)
+        self.assertEqual(store.stats()["misses"], 1)
+
+    def test_evicts_least_recently_used_entries(self):
+        store = self._cache(250)
+        store.put_bytes("a", b"a" * 100)
+        self._age(store, "a", 30)
+        store.put_bytes("b", b"b" * 100)
+        self._age(store, "b", 20)
+        # Reading "a" makes "b" the oldest entry.
+        self.assertIsNotNone(store.get_path("a"))
+
+        store.put_bytes("c", b"c" * 100)
+
+        self.assertIsNotNone(store.get_path("a"))
+        self.assertIsNone(store.get_path("b"))
+        self.assertIsNotNone(store.get_path("c"))
+        self.assertEqual(store.stats()["evictions"], 1)
+
+    def test_abandoned_temporary_files_are_swept_on_creation(self):
+        names = [".tmp-old", ".tmp-old.wav.commit", "old.commit", ".tmp-fresh", "entry.json"]
+        for name in names:
+            path = os.path.join(self.temp_dir.name, name)
+            with open(path, "wb") as dst:
+                dst.write(b"x")
+            if "old" in name or name == "entry.json":
+                stamp = time.time() - cache.TEMP_FILE_GRACE_SEC - 60
+                os.utime(path, (stamp, stamp))
+
+        store = self._cache(1 << 20)
+
+        self.assertEqual(
+            sorted(os.listdir(self.temp_dir.name)), [".tmp-fresh", "entry.json"]
+        )
+        self.assertEqual(store.stats()["swept"], 3)
+
+    def test_missing_directory_sweeps_nothing(self):
+        store = cache.DiskLRUCache(os.path.join(self.temp_dir.name, "absent"), 1 << 20)
+
+        self.assertEqual(store.stats()["swept"], 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import os
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+
+RUNTIME_DIR = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(RUNTIME_DIR))
+
+from cache import DiskLRUCache  # noqa: E402
+from checkpoint import ChunkCheckpoint  # noqa: E402
+
+
+class ChunkCheckpointTests(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.temp_dir.cleanup)
+        self.store = DiskLRUCache(self.temp_dir.name, max_bytes=1 << 20, suffix=".jsonl")
+
+    def test_records_survive_a_new_instance(self):
+        first = ChunkCheckpoint(self.store, "abc")
+        self.assertEqual(first.resume(), {})
+        first.append({"index": 0, "text": "one"})
+        first.append({"index": 1, "text": "two"})
+        first.append({"index": 1, "text": "two again"})
+
+        records = ChunkCheckpoint(self.store, "abc").resume()
+
+        self.assertEqual(sorted(records), [0, 1])
+        self.assertEqual(records[1]["text"], "two again")
+
+    def test_torn_last_line_is_dropped_and_compacted(self):
+        checkpoint = ChunkCheckpoint(self.store, "abc")
+        checkpoint.resume()
+        checkpoint.append({"index": 0, "text": "one"})
+        with open(checkpoint.path, "a", encoding="utf-8") as dst:
+            dst.write('{"index": 1, "te')
+
+        self.assertEqual(sorted(checkpoint.resume()), [0])
+        checkpoint.append({"index": 1, "text": "two"})
+        self.assertEqual(sorted(checkpoint.resume()), [0, 1])
+
+    def test_file_for_another_key_is_ignored(self):
+        ChunkCheckpoint(self.store, "abc").resume()
+        ChunkCheckpoint(self.store, "abc").append({"index": 0, "text": "one"})
+        os.replace(self.store.path_for("abc"), self.store.path_for("xyz"))
+
+        self.assertEqual(ChunkCheckpoint(self.store, "xyz").resume(), {})
+
+    def test_discard_removes_the_file(self):
+        checkpoint = ChunkCheckpoint(self.store, "abc")
+        checkpoint.resume()
+        checkpoint.discard()
+
+        self.assertFalse(os.path.exists(checkpoint.path))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import sys
+import threading
+import unittest
+from pathlib import Path
+
+import numpy as np
+
+
+RUNTIME_DIR = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(RUNTIME_DIR))
+
+import audio_io  # noqa: E402
+import chunking  # noqa: E402
+
+SR = 16000
+
+
+def _speech_with_pauses(seconds, pauses):
+    """Noise bursts with silent ``(start_sec, end_sec)`` pauses."""
+    rng = np.random.default_rng(0)
+    signal = (0.2 * rng.standard_normal(int(seconds * SR))).astype(np.float32)
+    signal += (0.001 * rng.standard_normal(len(signal))).astype(np.float32)
+    for start, end in pauses:
+        signal[int(start * SR) : int(end * SR)] *= 0.001
+    return signal
+
+
+def _plan(signal, **kwargs):
+    params = {
+        "max_chunk_sec": 10.0,
+        "min_silence_sec": 0.2,
+        "tail_silence_window_sec": 3.0,
+        "merge_tail_sec": 2.0,
+    }
+    params.update(kwargs)
+    window = audio_io.AudioWindow(
+        signal[i : i + 4000] for i in range(0, len(signal), 4000)
+    )
+    return list(chunking.plan_chunks(window, sample_rate=SR, **params))
+
+
+class PlanChunksTests(unittest.TestCase):
+    def test_cuts_land_inside_pauses(self):
+        signal = _speech_with_pauses(25.0, [(8.5, 8.9), (17.2, 17.6)])
+
+        chunks = _plan(signal)
+
+        self.assertEqual(len(chunks), 3)
+        self.assertTrue(8.5 * SR < chunks[0].end < 8.9 * SR)
+        self.assertTrue(17.2 * SR < chunks[1].end < 17.6 * SR)
+
+    def test_every_sample_is_planned_exactly_once(self):
+        signal = _speech_with_pauses(37.0, [(4.0, 4.5), (21.0, 21.3)])
+
+        chunks = _plan(signal)
+
+        self.assertEqual(chunks[0].start, 0)
+        for prev, cur in zip(chunks, chunks[1:]):
+            self.assertEqual(prev.end, cur.start)
+        self.assertEqual(chunks[-1].end, len(signal))
+        self.assertTrue(chunks[-1].is_last)
+        np.testing.assert_array_equal(
+            np.concatenate([chunk.samples for chunk in chunks]), signal
+        )
+        self.assertTrue(all(len(c.samples) <= 12 * SR for c in chunks))
+
+    def test_short_remainder_is_merged_into_last_chunk(self):
+        signal = _speech_with_pauses(11.5, [(5.0, 5.5)])
+
+        chunks = _plan(signal)
+
+        self.assertEqual(len(chunks), 1)
+        self.assertEqual(chunks[0].end, len(signal))
+
+    def test_without_pause_cuts_at_quietest_tail_frame(self):
+        signal = _speech_with_pauses(15.0, [])
+        signal[int(8.5 * SR) : int(8.52 * SR)] *= 0.01
+
+        chunks = _plan(signal, min_silence_sec=1.0)
+
+        self.assertTrue(8.5 * SR <= chunks[0].end <= 8.52 * SR)
+
+    def test_silent_input_is_cut_near_maximum_length(self):
+        chunks = _plan(np.zeros(25 * SR, dtype=np.float32))
+
+        self.assertGreater(chunks[0].end, 8 * SR)
+        self.assertLessEqual(chunks[0].end, 10 * SR)
+
+
+class HasSpeechTests(unittest.TestCase):
+    def _energy(self, signal):
+        return chunking.frame_energy_db(signal, int(chunking.FRAME_SEC * SR))
+
+    def test_pauses_between_loud_stretches_are_speech(self):
+        self.assertTrue(chunking.has_speech(self._energy(_speech_with_pauses(3, [(1, 2)]))))
+
+    def test_silence_and_steady_noise_are_not_speech(self):
+        steady = (0.2 * np.random.default_rng(1).standard_normal(3 * SR)).astype(np.float32)
+
+        self.assertFalse(chunking.has_speech(self._energy(np.zeros(3 * SR, dtype=np.float32))))
+        self.assertFalse(chunking.has_speech(self._energy(steady)))
+        self.assertFalse(chunking.has_speech(self._energy(np.zeros(10, dtype=np.float32))))
+
+
+class RunPipelinedTests(unittest.TestCase):
+    def _chunks(self, count):
+        return [
+            chunking.PlannedChunk(i, i * 10, i * 10 + 10, np.zeros(10), i == count - 1)
+            for i in range(count)
+        ]
+
+    def test_first_stage_runs_ahead_of_second_stage(self):
+        second_chunk_started = threading.Event()
+
+        def first_stage(chunk):
+            if chunk.index == 1:
+                second_chunk_started.set()
+            return f"text-{chunk.index}"
+
+        def second_stage(chunk, text):
+            if chunk.index == 0:
+                # Only returns quickly when chunk 1 is already being transcribed.
+                return second_chunk_started.wait(5)
+            return True
+
+        results = list(
+            chunking.run_pipelined(self._chunks(3), first_stage, second_stage, depth=1)
+        )
+
+        self.assertEqual([chunk.index for chunk, _, _ in results], [0, 1, 2])
+        self.assertEqual([text for _, text, _ in results], ["text-0", "text-1", "text-2"])
+        self.assertTrue(all(ok for _, _, ok in results))
+
+    def test_first_stage_errors_reach_the_caller(self):
+        def first_stage(chunk):
+            if chunk.index == 1:
+                raise RuntimeError("asr failed")
+            return chunk.index
+
+        with self.assertRaisesRegex(RuntimeError, "asr failed"):
+            list(
+                chunking.run_pipelined(
+                    self._chunks(3), first_stage, lambda chunk, first: first
+                )
+            )
+
+    def test_depth_zero_runs_sequentially(self):
+        calls = []
+
+        list(
+            chunking.run_pipelined(
+                self._chunks(2),
+                lambda chunk: calls.append(("asr", chunk.index)),
+                lambda chunk, first: calls.append(("align", chunk.index)),
+                depth=0,
+            )
+        )
+
+        self.assertEqual(calls, [("asr", 0), ("align", 0), ("asr", 1), ("align", 1)])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import sys
+import unittest
+from pathlib import Path
+
+import numpy as np
+
+
+RUNTIME_DIR = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(RUNTIME_DIR))
+
+from confidence import repetition_ratio, speech_seconds, transcript_confidence  # noqa: E402
+
+SR = 16000
+
+
+def _words(count, word_sec=0.3, gap_sec=0.2):
+    t = np.arange(int(word_sec * SR)) / float(SR)
+    word = (0.3 * np.sin(2 * np.pi * 220.0 * t)).astype(np.float32)
+    gap = np.zeros(int(gap_sec * SR), dtype=np.float32)
+    return np.concatenate([np.concatenate([word, gap]) for _ in range(count)])
+
+
+class ConfidenceTests(unittest.TestCase):
+    def test_speech_seconds_counts_voiced_frames_only(self):
+        self.assertAlmostEqual(speech_seconds(_words(4), SR), 1.2, places=1)
+        self.assertEqual(speech_seconds(np.zeros(SR, dtype=np.float32), SR), 0.0)
+        # A steady tone has no pauses to tell it from noise.
+        steady = np.sin(2 * np.pi * 220.0 * np.arange(SR) / SR).astype(np.float32)
+        self.assertEqual(speech_seconds(steady, SR), 0.0)
+
+    def test_plausible_transcript_is_confident(self):
+        score = transcript_confidence(
+            "the quick brown fox jumps", _words(5), SR, "English", "English"
+        )
+
+        self.assertEqual(score, 1.0)
+
+    def test_repetition_loop_is_not_confident(self):
+        text = " ".join(["thank you so much"] * 8)
+
+        self.assertGreater(repetition_ratio(text.split()), 0.8)
+        self.assertLess(transcript_confidence(text, _words(20), SR), 0.3)
+
+    def test_text_over_silence_and_silence_over_speech(self):
+        silence = np.zeros(2 * SR, dtype=np.float32)
+
+        self.assertEqual(transcript_confidence("hello", silence, SR), 0.0)
+        self.assertEqual(transcript_confidence("", silence, SR), 1.0)
+        self.assertEqual(transcript_confidence("", _words(4), SR), 0.0)
+
+    def test_runaway_rate_lowers_confidence(self):
+        text = "".join(chr(0x4E00 + i) for i in range(60))
+
+        self.assertLess(transcript_confidence(text, _words(4), SR), 0.5)
+
+    def test_language_disagreeing_with_pinned_one(self):
+        speech = _words(2)
+
+        self.assertEqual(
+            transcript_confidence("hello there", speech, SR, "Chinese,English", "English"), 0.0
+        )
+        self.assertEqual(
+            transcript_confidence("hello there", speech, SR, "English,Chinese", "english"), 1.0
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import sys
+import threading
+import unittest
+from pathlib import Path
+
+
+RUNTIME_DIR = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(RUNTIME_DIR))
+
+import dispatcher  # noqa: E402
+
+
+class RequestDispatcherTests(unittest.TestCase):
+    def _make(self, **lane_workers):
+        workers = {
+            dispatcher.STT_LANE: 1,
+            dispatcher.TTS_LANE: 1,
+            dispatcher.CONTROL_LANE: 1,
+        }
+        workers.update(lane_workers)
+        instance = dispatcher.RequestDispatcher(lane_workers=workers, max_pending=2)
+        self.addCleanup(instance.shutdown, True)
+        return instance
+
+    def test_methods_route_to_their_lanes(self):
+        instance = self._make()
+        self.assertEqual(instance.lane_for("predict"), dispatcher.STT_LANE)
+        self.assertEqual(instance.lane_for("tts"), dispatcher.TTS_LANE)
+        self.assertEqual(instance.lane_for("ping"), dispatcher.CONTROL_LANE)
+        self.assertEqual(instance.lane_for("unknown"), dispatcher.CONTROL_LANE)
+        self.assertEqual(instance.lane_for(None), dispatcher.CONTROL_LANE)
+
+    def test_ping_completes_while_predict_is_running(self):
+        instance = self._make()
+        release = threading.Event()
+        ping_done = threading.Event()
+        order = []
+
+        def slow_predict():
+            release.wait(5)
+            order.append("predict")
+
+        def ping():
+            order.append("ping")
+            ping_done.set()
+
+        instance.submit("predict", slow_predict)
+        instance.submit("ping", ping)
+
+        self.assertTrue(ping_done.wait(5))
+        release.set()
+        instance.shutdown(wait=True)
+        self.assertEqual(order, ["ping", "predict"])
+
+    def test_lane_concurrency_is_configurable(self):
+        instance = self._make(tts=2)
+        both_running = threading.Barrier(2, timeout=5)
+        results = []
+
+        def synth():
+            both_running.wait()
+            results.append("done")
+
+        instance.submit("tts", synth)
+        instance.submit("tts", synth)
+        instance.shutdown(wait=True)
+        self.assertEqual(results, ["done", "done"])
+
+    def test_full_lane_rejects_new_requests(self):
+        instance = self._make()
+        release = threading.Event()
+        instance.submit("predict", lambda: release.wait(5))
+        instance.submit("predict", lambda: release.wait(5))
+
+        with self.assertRaises(dispatcher.LaneFullError):
+            instance.submit("predict", lambda: None)
+
+        release.set()
+        instance.shutdown(wait=True)
+        self.assertEqual(instance.status()["stt"]["pending"], 0)
+        self.assertEqual(instance.status()["stt"]["completed"], 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
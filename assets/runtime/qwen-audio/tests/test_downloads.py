@@ -0,0 +1,252 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import os
+import sys
+import tempfile
+import threading
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+
+RUNTIME_DIR = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(RUNTIME_DIR))
+
+from downloads import AudioDownloader  # noqa: E402
+
+
+class _AudioHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def setup(self):
+        super().setup()
+        self.server.connections += 1
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        server = self.server
+        server.requests.append((self.path, dict(self.headers)))
+        entry = server.files.get(self.path)
+        if entry is None:
+            self.send_response(404)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        body, etag = entry
+        if etag and self.headers.get("If-None-Match") == etag:
+            self.send_response(304)
+            self.send_header("ETag", etag)
+            self.end_headers()
+            return
+        self.send_response(200)
+        if etag:
+            self.send_header("ETag", etag)
+        self.send_header("Content-Length", str(len(body) + server.missing_bytes))
+        self.end_headers()
+        half = len(body) // 2
+        self.wfile.write(body[:half])
+        self.wfile.flush()
+        # Tests hold the second half back to read a download in flight.
+        server.gate.wait(10)
+        self.wfile.write(body[half:])
+        server.bodies_sent += 1
+        if server.missing_bytes:
+            self.close_connection = True
+
+
+class AudioServer(ThreadingHTTPServer):
+    """Local stand-in for an audio host: serves ``files`` with optional ETags."""
+
+    daemon_threads = True
+
+    def __init__(self):
+        super().__init__(("127.0.0.1", 0), _AudioHandler)
+        self.files = {}
+        self.requests = []
+        self.connections = 0
+        self.bodies_sent = 0
+        self.missing_bytes = 0
+        self.gate = threading.Event()
+        self.gate.set()
+        threading.Thread(
+            target=self.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True
+        ).start()
+
+    def url(self, path):
+        return f"http://127.0.0.1:{self.server_address[1]}{path}"
+
+    def stop(self):
+        self.gate.set()
+        self.shutdown()
+        self.server_close()
+
+
+class AudioDownloaderTests(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.temp_dir.cleanup)
+        self.server = AudioServer()
+        self.addCleanup(self.server.stop)
+        self.cache_dir = os.path.join(self.temp_dir.name, "downloads")
+        self.downloader = AudioDownloader(self.cache_dir, max_bytes=1 << 20, timeout=10)
+        self.addCleanup(self.downloader.pool.close)
+        self.body = bytes(range(256)) * 40
+
+    def _read(self, download):
+        with open(download.wait(), "rb") as src:
+            return src.read()
+
+    def test_repeat_url_is_revalidated_not_downloaded(self):
+        self.server.files["/a.wav"] = (self.body, '"v1"')
+
+        first = self.downloader.fetch(self.server.url("/a.wav"))
+        self.assertEqual(self._read(first), self.body)
+        first.release()
+        second = self.downloader.fetch(self.server.url("/a.wav"))
+
+        self.assertFalse(second.temporary)
+        self.assertEqual(os.path.dirname(second.path), self.cache_dir)
+        self.assertEqual(second.identity, first.identity)
+        self.assertEqual(self._read(second), self.body)
+        self.assertEqual(self.server.requests[-1][1].get("If-None-Match"), '"v1"')
+        self.assertEqual(self.downloader.stats()["revalidated"], 1)
+        self.assertEqual(self.downloader.stats()["downloaded"], 1)
+
+    def test_changed_validator_downloads_again(self):
+        self.server.files["/a.wav"] = (self.body, '"v1"')
+        first = self.downloader.fetch(self.server.url("/a.wav"))
+        first.wait()
+
+        self.server.files["/a.wav"] = (self.body[::-1], '"v2"')
+        second = self.downloader.fetch(self.server.url("/a.wav"))
+
+        self.assertNotEqual(second.identity, first.identity)
+        self.assertEqual(self._read(second), self.body[::-1])
+
+    def test_connections_are_kept_alive(self):
+        for name in ("a", "b", "c"):
+            self.server.files[f"/{name}.wav"] = (self.body, f'"{name}"')
+            self.downloader.fetch(self.server.url(f"/{name}.wav")).wait()
+        self.downloader.fetch(self.server.url("/a.wav")).wait()
+
+        self.assertEqual(self.server.connections, 1)
+        self.assertEqual(self.downloader.pool.stats()["reused"], 3)
+
+    def test_body_is_readable_before_it_completes(self):
+        self.server.files["/a.wav"] = (self.body, '"v1"')
+        self.server.gate.clear()
+
+        download = self.downloader.fetch(self.server.url("/a.wav"))
+        with download.open() as src:
+            head = src.read(len(self.body) // 2)
+            self.assertFalse(download.done)
+            self.server.gate.set()
+            rest = src.read()
+
+        self.assertEqual(head + rest, self.body)
+
+    def test_end_seek_uses_the_announced_length(self):
+        self.server.files["/a.wav"] = (self.body, '"v1"')
+        self.server.gate.clear()
+
+        download = self.downloader.fetch(self.server.url("/a.wav"))
+        with download.open() as src:
+            self.assertEqual(src.seek(0, os.SEEK_END), len(self.body))
+            self.assertFalse(download.done)
+        self.server.gate.set()
+
+    def test_body_in_flight_survives_cache_eviction(self):
+        downloader = AudioDownloader(self.cache_dir, max_bytes=2 * len(self.body), timeout=10)
+        self.addCleanup(downloader.pool.close)
+        self.server.files["/a.wav"] = (self.body, '"v1"')
+        self.server.gate.clear()
+
+        download = downloader.fetch(self.server.url("/a.wav"))
+        self.assertTrue(os.path.basename(download.path).startswith(".tmp-"))
+        # Other caches sharing the budget evict everything they can.
+        for name in ("x", "y", "z"):
+            downloader.cache.put_bytes(name, self.body)
+        self.server.gate.set()
+
+        self.assertEqual(self._read(download), self.body)
+        self.assertIsNotNone(downloader.cache.get_path(f"{download.identity}.wav"))
+        download.release()
+        self.assertFalse(os.path.exists(download.path))
+        names = os.listdir(self.cache_dir)
+        self.assertFalse([name for name in names if name.startswith(".tmp-")])
+
+    def test_shared_body_is_kept_until_every_caller_releases(self):
+        self.server.files["/a.wav"] = (self.body, '"v1"')
+        self.server.gate.clear()
+
+        first = self.downloader.fetch(self.server.url("/a.wav"))
+        second = self.downloader.fetch(self.server.url("/a.wav"))
+        self.assertIs(second, first)
+        first.release()
+        self.server.gate.set()
+
+        self.assertEqual(self._read(second), self.body)
+        second.release()
+        self.assertFalse(os.path.exists(first.path))
+
+    def test_bodies_abandoned_by_a_dead_process_are_swept(self):
+        os.makedirs(self.cache_dir, exist_ok=True)
+        stale = os.path.join(self.cache_dir, ".tmp-abandoned.wav")
+        with open(stale, "wb") as dst:
+            dst.write(self.body)
+        os.utime(stale, (0, 0))
+
+        downloader = AudioDownloader(self.cache_dir, max_bytes=1 << 20, timeout=10)
+        self.addCleanup(downloader.pool.close)
+
+        self.assertFalse(os.path.exists(stale))
+        self.assertEqual(downloader.stats()["swept"], 1)
+
+    def test_unvalidated_body_is_a_temporary_file(self):
+        self.server.files["/a.wav"] = (self.body, None)
+
+        download = self.downloader.fetch(self.server.url("/a.wav"))
+
+        self.assertTrue(download.temporary)
+        self.assertIsNone(download.identity)
+        self.assertEqual(self._read(download), self.body)
+        download.release()
+        self.assertFalse(os.path.exists(download.path))
+        self.assertFalse(os.path.isdir(self.cache_dir) and os.listdir(self.cache_dir))
+
+    def test_truncated_body_fails_readers(self):
+        self.server.files["/a.wav"] = (self.body, '"v1"')
+        self.server.missing_bytes = 100
+
+        download = self.downloader.fetch(self.server.url("/a.wav"))
+
+        with self.assertRaises(RuntimeError):
+            download.wait()
+        self.assertFalse(os.path.exists(download.path))
+        # Nothing was cached, so the next fetch downloads from scratch.
+        self.server.missing_bytes = 0
+        self.assertEqual(self._read(self.downloader.fetch(self.server.url("/a.wav"))), self.body)
+
+    def test_http_errors_raise(self):
+        with self.assertRaisesRegex(RuntimeError, "HTTP 404"):
+            self.downloader.fetch(self.server.url("/missing.wav"))
+
+    def test_cache_is_size_bounded(self):
+        downloader = AudioDownloader(self.cache_dir, max_bytes=3 * len(self.body), timeout=10)
+        self.addCleanup(downloader.pool.close)
+        for name in ("a", "b", "c", "d"):
+            self.server.files[f"/{name}.wav"] = (self.body, f'"{name}"')
+            download = downloader.fetch(self.server.url(f"/{name}.wav"))
+            download.wait()
+            download.release()
+
+        sizes = [entry.stat().st_size for entry in os.scandir(self.cache_dir)]
+        self.assertLessEqual(sum(sizes), 3 * len(self.body))
+        self.assertGreater(downloader.cache.stats()["evictions"], 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import os
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+import numpy as np
+import soundfile as sf
+
+
+RUNTIME_DIR = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(RUNTIME_DIR))
+
+import frontend  # noqa: E402
+from audio_io import resample  # noqa: E402
+from frontend import (  # noqa: E402
+    DecodeCache,
+    DecodedAudio,
+    audio_digest,
+    decode_audio,
+    decode_scope,
+)
+
+
+def _tone(seconds, sample_rate):
+    t = np.arange(int(seconds * sample_rate)) / float(sample_rate)
+    return (0.1 * np.sin(2 * np.pi * 220.0 * t)).astype(np.float32)
+
+
+class DecodeAudioTests(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.temp_dir.cleanup)
+        frontend.decode_cache.clear()
+
+    def _count_decodes(self):
+        calls = []
+        real_decode = frontend._decode
+
+        def _decode(source, sample_rate):
+            calls.append(sample_rate)
+            return real_decode(source, sample_rate)
+
+        patcher = patch.object(frontend, "_decode", side_effect=_decode)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        return calls
+
+    def test_file_is_decoded_to_mono_at_the_model_rate(self):
+        path = os.path.join(self.temp_dir.name, "stereo.wav")
+        signal = _tone(1.0, 48000)
+        sf.write(path, np.stack([signal, signal], axis=1), 48000, subtype="FLOAT")
+
+        decoded = decode_audio(path, 16000)
+
+        self.assertEqual((decoded.sample_rate, decoded.source_rate), (16000, 48000))
+        self.assertAlmostEqual(decoded.duration, 1.0)
+        np.testing.assert_allclose(decoded.samples, resample(signal, 48000, 16000), atol=1e-6)
+
+    def test_repeat_decodes_are_served_from_memory(self):
+        calls = self._count_decodes()
+        pcm = (_tone(0.5, 8000), 8000)
+
+        with decode_scope():
+            first = decode_audio(pcm, 16000)
+            self.assertIs(decode_audio(pcm, 16000), first)
+        # A new request with the same content hits the shared cache.
+        copy = (pcm[0].copy(), 8000)
+        self.assertIs(decode_audio(copy, 16000), first)
+        decode_audio(copy, 24000)
+
+        self.assertEqual(calls, [16000, 24000])
+
+    def test_scope_memoizes_pcm_digests(self):
+        samples = _tone(0.5, 16000)
+        with decode_scope() as memo:
+            digest = audio_digest((samples, 16000))
+            samples[:] = 0.0
+            self.assertEqual(audio_digest((samples, 16000)), digest)
+            self.assertEqual(len(memo), 1)
+        self.assertNotEqual(audio_digest((samples, 16000)), digest)
+
+    def test_disabled_cache_still_decodes(self):
+        calls = self._count_decodes()
+        with patch.object(frontend, "decode_cache", DecodeCache(0)):
+            decode_audio((_tone(0.1, 16000), 16000), 16000)
+            decode_audio((_tone(0.1, 16000), 16000), 16000)
+
+        self.assertEqual(len(calls), 2)
+
+
+class DecodeCacheTests(unittest.TestCase):
+    def _entry(self, frames):
+        return DecodedAudio(np.zeros(frames, dtype=np.float32), 16000, 16000, frames / 16000.0)
+
+    def test_evicts_least_recently_used_over_budget(self):
+        cache = DecodeCache(max_bytes=4 * 250)
+        cache.put(("a", 16000), self._entry(100))
+        cache.put(("b", 16000), self._entry(100))
+        cache.get(("a", 16000))
+        cache.put(("c", 16000), self._entry(100))
+
+        self.assertIsNotNone(cache.get(("a", 16000)))
+        self.assertIsNone(cache.get(("b", 16000)))
+        self.assertEqual(cache.stats()["bytes"], 800)
+
+    def test_oversized_entries_are_not_kept(self):
+        cache = DecodeCache(max_bytes=100)
+        cache.put(("a", 16000), self._entry(1000))
+
+        self.assertEqual(cache.stats()["entries"], 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import sys
+import unittest
+from pathlib import Path
+
+
+RUNTIME_DIR = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(RUNTIME_DIR))
+
+import idle  # noqa: E402
+
+
+class IdlePolicyTests(unittest.TestCase):
+    def setUp(self):
+        self.actions = []
+        self.models = True
+        self.available = None
+
+    def _policy(self, min_available_bytes=0):
+        def _unload():
+            self.actions.append("unload")
+            self.models = False
+
+        return idle.IdlePolicy(
+            release_after=60,
+            unload_after=600,
+            exit_after=3600,
+            min_available_bytes=min_available_bytes,
+            release=lambda: self.actions.append("release"),
+            unload=_unload,
+            has_models=lambda: self.models,
+            available_memory=lambda: self.available,
+        )
+
+    def test_tiers_fire_once_in_order(self):
+        policy = self._policy()
+        stages = [policy.tick(sec) for sec in (10, 60, 61, 600, 601, 3599)]
+
+        self.assertEqual(
+            stages,
+            [
+                idle.STAGE_ACTIVE,
+                idle.STAGE_CACHES_RELEASED,
+                idle.STAGE_CACHES_RELEASED,
+                idle.STAGE_MODELS_UNLOADED,
+                idle.STAGE_MODELS_UNLOADED,
+                idle.STAGE_MODELS_UNLOADED,
+            ],
+        )
+        self.assertEqual(self.actions, ["release", "unload", "release"])
+        self.assertEqual(policy.tick(3600), idle.STAGE_EXIT)
+
+    def test_reset_starts_a_new_idle_period(self):
+        policy = self._policy()
+        policy.tick(60)
+        policy.reset()
+
+        self.assertEqual(policy.tick(60), idle.STAGE_CACHES_RELEASED)
+        self.assertEqual(self.actions, ["release", "release"])
+
+    def test_request_between_ticks_starts_a_new_idle_period(self):
+        policy = self._policy()
+        self.assertEqual(policy.tick(600, last_active=100.0), idle.STAGE_MODELS_UNLOADED)
+
+        # A request loads a model and finishes before the next tick, which
+        # already sees more than a second of idle time.
+        self.models = True
+        self.assertEqual(policy.tick(2, last_active=200.0), idle.STAGE_ACTIVE)
+        self.assertEqual(policy.tick(600, last_active=200.0), idle.STAGE_MODELS_UNLOADED)
+
+        self.assertEqual(self.actions, ["unload", "release", "unload", "release"])
+        self.assertFalse(self.models)
+
+    def test_disabled_exit_tier_never_exits(self):
+        policy = self._policy()
+        policy.exit_after = 0
+
+        self.assertEqual(policy.tick(10 ** 6), idle.STAGE_MODELS_UNLOADED)
+
+    def test_memory_pressure_unloads_then_exits(self):
+        policy = self._policy(min_available_bytes=1000)
+        self.available = 10
+
+        self.assertEqual(policy.tick(60), idle.STAGE_MODELS_UNLOADED)
+        self.assertEqual(self.actions, ["unload", "release"])
+        self.assertEqual(policy.tick(61), idle.STAGE_EXIT)
+        self.assertEqual(policy.status()["reason"], "memory_pressure")
+
+    def test_recently_used_model_survives_memory_pressure(self):
+        policy = self._policy(min_available_bytes=1000)
+        self.available = 10
+
+        self.assertEqual(policy.tick(1), idle.STAGE_ACTIVE)
+        self.assertEqual(policy.tick(59), idle.STAGE_ACTIVE)
+        self.assertEqual(self.actions, [])
+        self.assertTrue(self.models)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import sys
+import threading
+import unittest
+from pathlib import Path
+
+
+RUNTIME_DIR = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(RUNTIME_DIR))
+
+import jobs  # noqa: E402
+
+
+class JobManagerTests(unittest.TestCase):
+    def setUp(self):
+        self.started = []
+        self.finished = []
+        self.manager = jobs.JobManager(
+            on_start=lambda: self.started.append(1),
+            on_finish=lambda: self.finished.append(1),
+        )
+        self.addCleanup(self.manager.shutdown)
+
+    def test_submit_returns_before_the_job_finishes(self):
+        release = threading.Event()
+
+        job = self.manager.submit("load", lambda: release.wait(5) and "loaded")
+
+        self.assertIn(job["status"], {jobs.JOB_QUEUED, jobs.JOB_RUNNING})
+        release.set()
+        done = self.manager.wait(job["job_id"], timeout=5)
+        self.assertEqual(done["status"], jobs.JOB_DONE)
+        self.assertEqual(done["result"], "loaded")
+        self.assertEqual((len(self.started), len(self.finished)), (1, 1))
+
+    def test_failures_are_reported_in_the_job(self):
+        def _fail():
+            raise RuntimeError("model not found")
+
+        job = self.manager.submit("load", _fail)
+        done = self.manager.wait(job["job_id"], timeout=5)
+
+        self.assertEqual(done["status"], jobs.JOB_ERROR)
+        self.assertEqual(done["error"], "model not found")
+        self.assertEqual(len(self.finished), 1)
+
+    def test_unknown_job_id_raises(self):
+        with self.assertRaises(ValueError):
+            self.manager.status("missing")
+
+    def test_finished_jobs_are_trimmed_to_history(self):
+        manager = jobs.JobManager(history=2)
+        self.addCleanup(manager.shutdown)
+        ids = [manager.submit("load", lambda: None)["job_id"] for _ in range(4)]
+        for job_id in ids[-2:]:
+            manager.wait(job_id, timeout=5)
+        manager.submit("load", lambda: None)
+
+        self.assertLessEqual(len(manager.jobs()), 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import sys
+import threading
+import time
+import unittest
+from pathlib import Path
+
+
+RUNTIME_DIR = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(RUNTIME_DIR))
+
+import metrics  # noqa: E402
+
+
+class StageTimingTests(unittest.TestCase):
+    def test_nested_stages_report_self_time(self):
+        with metrics.recording() as timings:
+            with metrics.stage("synth"):
+                time.sleep(0.02)
+                with metrics.stage("load"):
+                    time.sleep(0.05)
+
+        self.assertGreaterEqual(timings.stages["load"], 0.05)
+        self.assertLess(timings.stages["synth"], 0.05)
+
+    def test_stages_outside_a_recording_are_ignored(self):
+        with metrics.stage("asr"):
+            pass
+
+        self.assertIsNone(metrics.current())
+
+    def test_iterator_consumed_on_another_thread_records_into_request(self):
+        def _blocks():
+            for _ in range(3):
+                time.sleep(0.01)
+                yield b""
+
+        with metrics.recording() as timings:
+            blocks = metrics.timed_iter("decode", _blocks())
+            worker = threading.Thread(target=lambda: list(blocks))
+            worker.start()
+            worker.join()
+
+        self.assertGreaterEqual(timings.stages["decode"], 0.03)
+
+    def test_as_dict_reports_real_time_factor(self):
+        with metrics.recording() as timings:
+            pass
+
+        out = timings.as_dict(audio_sec=10.0)
+
+        self.assertAlmostEqual(out["rtf"], out["total_sec"] / 10.0, places=3)
+        self.assertNotIn("peak_rss_bytes", out)
+
+
+class LatencyStatsTests(unittest.TestCase):
+    def test_snapshot_groups_by_method_and_model(self):
+        stats = metrics.LatencyStats(window=3)
+        for total in (0.04, 0.2, 0.3, 2.0):
+            stats.observe("predict", "asr-1.7b", {"total_sec": total, "asr_sec": total / 2})
+        stats.observe("predict", "asr-1.7b", {}, ok=False)
+        stats.observe("tts", None, {"total_sec": 1.0})
+
+        snapshot = stats.snapshot()
+
+        predict = snapshot["predict"]["asr-1.7b"]
+        self.assertEqual((predict["count"], predict["errors"], predict["window"]), (5, 1, 3))
+        self.assertEqual(predict["p50_ms"], 300.0)
+        self.assertEqual(predict["max_ms"], 2000.0)
+        buckets = {b["le_ms"]: b["count"] for b in predict["histogram"]}
+        self.assertEqual((buckets[250], buckets[500], buckets[None]), (1, 2, 3))
+        self.assertAlmostEqual(predict["mean_stage_sec"]["asr_sec"], 2.5 / 6, places=3)
+        self.assertEqual(snapshot["tts"]["-"]["count"], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
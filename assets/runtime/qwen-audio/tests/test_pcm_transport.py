@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import os
+import sys
+import tempfile
+import unittest
+from multiprocessing import shared_memory
+from pathlib import Path
+
+import numpy as np
+
+
+RUNTIME_DIR = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(RUNTIME_DIR))
+
+import pcm_transport  # noqa: E402
+
+
+class PcmFileTests(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.temp_dir.cleanup)
+        self.path = os.path.join(self.temp_dir.name, "buffer.pcm")
+
+    def test_reads_interleaved_int16_as_mono_float(self):
+        stereo = np.array([[16384, 0], [-16384, -16384], [0, 32767]], dtype="<i2")
+        stereo.tofile(self.path)
+
+        samples, sample_rate = pcm_transport.read_pcm(
+            {"path": self.path, "dtype": "int16", "channels": 2, "sample_rate": 8000}
+        )
+
+        self.assertEqual(sample_rate, 8000)
+        self.assertEqual(samples.dtype, np.float32)
+        np.testing.assert_allclose(samples, [0.25, -0.5, 0.5], atol=1e-4)
+
+    def test_offset_and_frames_select_a_window(self):
+        np.arange(10, dtype="<f4").tofile(self.path)
+
+        samples, _ = pcm_transport.read_pcm(
+            {"path": self.path, "dtype": "float32", "sample_rate": 16000, "offset": 8, "frames": 3}
+        )
+
+        np.testing.assert_array_equal(samples, [2.0, 3.0, 4.0])
+        with self.assertRaises(ValueError):
+            pcm_transport.read_pcm(
+                {"path": self.path, "dtype": "float32", "sample_rate": 16000, "frames": 11}
+            )
+
+    def test_write_resamples_and_describes_the_buffer(self):
+        samples = np.full(24000, 0.5, dtype=np.float32)
+
+        written = pcm_transport.write_pcm(
+            {"path": self.path, "dtype": "int16", "sample_rate": 16000}, samples, 24000
+        )
+
+        self.assertEqual(written["frames"], 16000)
+        self.assertEqual(os.path.getsize(self.path), 16000 * 2)
+        read_back, sample_rate = pcm_transport.read_pcm(written)
+        self.assertEqual(sample_rate, 16000)
+        np.testing.assert_allclose(read_back[100:-100], 0.5, atol=1e-3)
+
+    def test_rejects_bad_descriptors(self):
+        with self.assertRaises(ValueError):
+            pcm_transport.read_pcm({"sample_rate": 16000})
+        with self.assertRaises(ValueError):
+            pcm_transport.read_pcm({"path": self.path, "dtype": "int8", "sample_rate": 16000})
+        with self.assertRaises(FileNotFoundError):
+            pcm_transport.read_pcm({"path": self.path, "sample_rate": 16000})
+
+
+class SharedMemoryTests(unittest.TestCase):
+    def setUp(self):
+        self.block = shared_memory.SharedMemory(create=True, size=4 * 1000)
+        self.addCleanup(self.block.unlink)
+        self.addCleanup(self.block.close)
+
+    def test_round_trip_through_a_named_block(self):
+        samples = np.linspace(-0.5, 0.5, 1000, dtype=np.float32)
+        spec = {"name": self.block.name, "dtype": "float32", "sample_rate": 16000}
+
+        written = pcm_transport.write_pcm(spec, samples, 16000)
+        read_back, _ = pcm_transport.read_pcm(written)
+
+        np.testing.assert_array_equal(read_back, samples)
+        np.testing.assert_array_equal(
+            np.frombuffer(self.block.buf, dtype="<f4", count=1000), samples
+        )
+
+    def test_write_refuses_to_overflow_the_block(self):
+        with self.assertRaises(ValueError):
+            pcm_transport.write_pcm(
+                {"name": self.block.name, "dtype": "float32"},
+                np.zeros(2000, dtype=np.float32),
+                16000,
+            )
+
+
+if __name__ == "__main__":
+    unittest.main()
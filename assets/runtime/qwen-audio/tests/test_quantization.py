@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import sys
+import unittest
+from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import patch
+
+
+RUNTIME_DIR = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(RUNTIME_DIR))
+
+import quantization  # noqa: E402
+from benchmarks.quantize_cpu import word_error_rate  # noqa: E402
+from quantization import INT8_DYNAMIC, load_dtype, quantize_model, resolve_quantize  # noqa: E402
+
+
+class FakeModule:
+    pass
+
+
+class FakeTorch:
+    """The bits of ``torch`` that ``quantize_model`` touches."""
+
+    def __init__(self):
+        self.quantized = []
+        self.nn = SimpleNamespace(Module=FakeModule, Linear="Linear")
+        self.qint8 = "qint8"
+        self.ao = SimpleNamespace(quantization=SimpleNamespace(quantize_dynamic=self._quantize))
+
+    def _quantize(self, module, layers, dtype, inplace):
+        self.quantized.append((module, layers, dtype, inplace))
+        return module
+
+
+class ResolveQuantizeTests(unittest.TestCase):
+    def test_aliases_and_off_values(self):
+        self.assertEqual(resolve_quantize("int8", "cpu"), INT8_DYNAMIC)
+        self.assertEqual(resolve_quantize("INT8_dynamic", "cpu"), INT8_DYNAMIC)
+        self.assertIsNone(resolve_quantize("none", "cuda:0"))
+        with self.assertRaises(ValueError):
+            resolve_quantize("int4", "cpu")
+
+    def test_explicit_request_needs_cpu(self):
+        with self.assertRaises(ValueError):
+            resolve_quantize("int8-dynamic", "cuda:0")
+
+    def test_default_only_applies_on_cpu(self):
+        with patch.object(quantization, "DEFAULT_QUANTIZE", "int8-dynamic"):
+            self.assertEqual(resolve_quantize(None, "cpu"), INT8_DYNAMIC)
+            self.assertIsNone(resolve_quantize(None, "mps"))
+            self.assertIsNone(resolve_quantize("", "cpu"))
+
+
+class QuantizeModelTests(unittest.TestCase):
+    def test_quantizes_the_wrapped_module_in_place(self):
+        torch = FakeTorch()
+        wrapper = SimpleNamespace(model=FakeModule())
+
+        self.assertIs(quantize_model(wrapper, INT8_DYNAMIC, torch), wrapper)
+        self.assertEqual(torch.quantized, [(wrapper.model, {"Linear"}, "qint8", True)])
+        self.assertEqual(load_dtype(INT8_DYNAMIC, "bf16"), "float32")
+
+    def test_no_mode_leaves_the_model_alone(self):
+        torch = FakeTorch()
+
+        quantize_model(SimpleNamespace(), None, torch)
+
+        self.assertEqual(torch.quantized, [])
+        self.assertEqual(load_dtype(None, "bf16"), "bf16")
+
+    def test_model_without_torch_module_is_rejected(self):
+        with self.assertRaises(RuntimeError):
+            quantize_model(SimpleNamespace(model=None), INT8_DYNAMIC, FakeTorch())
+
+
+class WordErrorRateTests(unittest.TestCase):
+    def test_counts_edits_per_reference_word(self):
+        self.assertEqual(word_error_rate("The cat sat.", "the cat sat"), 0.0)
+        self.assertAlmostEqual(word_error_rate("the cat sat down", "the bat sat"), 0.5)
+        self.assertAlmostEqual(word_error_rate("你好世界", "你好地界"), 0.25)
+
+
+if __name__ == "__main__":
+    unittest.main()
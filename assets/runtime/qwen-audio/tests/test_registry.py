@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import sys
+import threading
+import unittest
+from pathlib import Path
+
+
+RUNTIME_DIR = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(RUNTIME_DIR))
+
+import registry  # noqa: E402
+
+
+class FakeTensor:
+    def __init__(self, count, itemsize=4):
+        self.count = count
+        self.itemsize = itemsize
+
+    def numel(self):
+        return self.count
+
+    def element_size(self):
+        return self.itemsize
+
+
+class FakeTorchModule:
+    def __init__(self, count):
+        self.weight = FakeTensor(count)
+
+    def named_parameters(self):
+        return [("weight", self.weight)]
+
+    def parameters(self):
+        return [self.weight]
+
+    def buffers(self):
+        return []
+
+
+class FakeWrapper:
+    def __init__(self, count):
+        self.model = FakeTorchModule(count)
+
+
+class FakeQuantizedModule(FakeTorchModule):
+    """Float bias plus int8 packed weights visible only through state_dict()."""
+
+    def __init__(self, count):
+        super().__init__(count)
+        self.packed = (FakeTensor(count * 4, itemsize=1), FakeTensor(count))
+
+    def state_dict(self, keep_vars=False):
+        return {"weight": self.weight, "linear._packed_params._packed_params": self.packed}
+
+
+class EstimateModelBytesTests(unittest.TestCase):
+    def test_counts_quantized_packed_weights(self):
+        self.assertEqual(registry.estimate_model_bytes(FakeQuantizedModule(10)), 40 + 40 + 40)
+
+    def test_walks_nested_wrappers_and_counts_shared_modules_once(self):
+        shared = FakeTorchModule(10)
+        outer = FakeWrapper(0)
+        outer.model = None
+        outer.parts = {"asr": [FakeWrapper(5)], "aligner": shared}
+        outer.inner = type("Inner", (), {})()
+        outer.inner.deeper = type("Deeper", (), {})()
+        outer.inner.deeper.model = shared
+
+        self.assertEqual(registry.estimate_model_bytes(outer), 5 * 4 + 10 * 4)
+
+
+class ModelRegistryTests(unittest.TestCase):
+    def _loader(self, count, loads):
+        def _load():
+            loads.append(count)
+            return FakeWrapper(count)
+
+        return _load
+
+    def test_hit_does_not_reload(self):
+        models = registry.ModelRegistry()
+        loads = []
+
+        first = models.get("a", self._loader(10, loads), kind="tts")
+        second = models.get("a", self._loader(10, loads), kind="tts")
+
+        self.assertIs(first, second)
+        self.assertEqual(loads, [10])
+        stats = models.stats()
+        self.assertEqual((stats["loads"], stats["hits"]), (1, 1))
+        self.assertEqual(stats["models"][0]["bytes"], 40)
+
+    def test_switching_models_keeps_them_resident_within_budget(self):
+        models = registry.ModelRegistry(budget_bytes=1000)
+        loads = []
+
+        for key in ("base", "custom", "design", "base", "custom"):
+            models.get(key, self._loader(50, loads), kind="tts")
+
+        self.assertEqual(len(loads), 3)
+        self.assertEqual(models.keys("tts"), ["custom", "base", "design"])
+
+    def test_evicts_least_recently_used_over_budget(self):
+        models = registry.ModelRegistry(budget_bytes=500)
+        loads = []
+        models.get("a", self._loader(50, loads))
+        models.get("b", self._loader(50, loads))
+        models.get("a", self._loader(50, loads))
+
+        models.get("c", self._loader(50, loads))
+
+        self.assertEqual(models.keys(), ["c", "a"])
+        self.assertEqual(models.stats()["evictions"], 1)
+
+    def test_models_in_use_are_not_evicted(self):
+        models = registry.ModelRegistry(max_models=1)
+        loads = []
+        in_use = threading.Event()
+        finish = threading.Event()
+
+        def _request():
+            with models.request_scope():
+                models.get("a", self._loader(10, loads))
+                in_use.set()
+                finish.wait(5)
+
+        worker = threading.Thread(target=_request)
+        worker.start()
+        self.assertTrue(in_use.wait(5))
+        models.get("b", self._loader(10, loads))
+
+        self.assertEqual(sorted(models.keys()), ["a", "b"])
+        self.assertEqual(models.stats()["models"][1]["refs"], 1)
+
+        finish.set()
+        worker.join()
+        self.assertEqual(models.keys(), ["b"])
+
+    def test_retained_model_outlives_its_request(self):
+        models = registry.ModelRegistry(max_models=1)
+        loads = []
+        with models.request_scope():
+            release = models.retain(models.get("a", self._loader(10, loads)))
+
+        self.assertEqual(models.evict(), [])
+        models.get("b", self._loader(10, loads))
+        self.assertEqual(sorted(models.keys()), ["a", "b"])
+
+        release()
+        release()
+        self.assertEqual(models.keys(), ["b"])
+        self.assertEqual(models.retain(object())(), None)
+
+    def test_evict_by_kind_skips_pinned_models(self):
+        models = registry.ModelRegistry()
+        loads = []
+        models.get("asr", self._loader(10, loads), kind="stt")
+        models.get("voice", self._loader(10, loads), kind="tts")
+
+        with models.request_scope():
+            models.get("voice", self._loader(10, loads), kind="tts")
+            self.assertEqual(models.evict(kind="tts"), [])
+
+        self.assertEqual(models.evict(kind="tts"), ["voice"])
+        self.assertEqual(models.keys(), ["asr"])
+
+
+if __name__ == "__main__":
+    unittest.main()
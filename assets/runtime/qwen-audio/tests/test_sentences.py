@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import sys
+import unittest
+from pathlib import Path
+
+
+RUNTIME_DIR = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(RUNTIME_DIR))
+
+from sentences import split_sentences  # noqa: E402
+from textutil import tokenize  # noqa: E402
+
+
+def _squash(text):
+    return "".join(text.split())
+
+
+class SplitSentencesTests(unittest.TestCase):
+    def test_cjk_sentences_split_on_full_width_marks(self):
+        segments = split_sentences("今天天气很好。我们去公园散步吧！你觉得怎么样？")
+
+        self.assertEqual(segments, ["今天天气很好。", "我们去公园散步吧！", "你觉得怎么样？"])
+
+    def test_ascii_marks_only_split_before_whitespace(self):
+        segments = split_sentences(
+            "The rate rose 3.5 percent this year. Prices at store.example.com followed."
+        )
+
+        self.assertEqual(
+            segments,
+            ["The rate rose 3.5 percent this year.", "Prices at store.example.com followed."],
+        )
+
+    def test_closing_quotes_stay_with_their_sentence(self):
+        segments = split_sentences("他说：“我们明天出发。”然后离开了房间。")
+
+        self.assertEqual(segments, ["他说：“我们明天出发。”", "然后离开了房间。"])
+
+    def test_short_fragments_join_the_next_sentence(self):
+        segments = split_sentences("Yes. I will be there before the talk starts.")
+
+        self.assertEqual(segments, ["Yes. I will be there before the talk starts."])
+
+    def test_short_fragment_stays_alone_before_a_full_sentence(self):
+        full = " ".join(f"w{i}" for i in range(10)) + "."
+        segments = split_sentences(f"Yes. {full}", max_tokens=10)
+
+        self.assertEqual(segments, ["Yes.", full])
+        self.assertTrue(all(len(tokenize(s)) <= 10 for s in segments))
+
+    def test_long_sentences_are_cut_at_clauses_then_words(self):
+        text = "第一部分的内容比较长，" * 6 + "最后结束。"
+        segments = split_sentences(text, max_tokens=24)
+
+        self.assertGreater(len(segments), 1)
+        self.assertTrue(all(len(tokenize(s)) <= 24 for s in segments))
+        self.assertTrue(all(s.endswith(("，", "。")) for s in segments))
+
+        words = split_sentences("word " * 100, max_tokens=30)
+        self.assertTrue(all(len(tokenize(s)) <= 30 for s in words))
+
+    def test_text_is_preserved_in_order(self):
+        text = "Hello there!  这是第二句，带有逗号。\nA third line without a stop"
+
+        self.assertEqual(_squash("".join(split_sentences(text))), _squash(text))
+
+    def test_blank_text_has_no_segments(self):
+        self.assertEqual(split_sentences("  \n "), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
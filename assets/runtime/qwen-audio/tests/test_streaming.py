@@ -0,0 +1,223 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import base64
+import sys
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+import numpy as np
+
+
+RUNTIME_DIR = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(RUNTIME_DIR))
+
+import streaming  # noqa: E402
+import stt  # noqa: E402
+from streaming import StreamSession, agreed_prefix  # noqa: E402
+
+SR = 16000
+
+
+def _words(count, sample_rate=SR, word_sec=0.3, gap_sec=0.2):
+    """``count`` tone bursts separated by short gaps, like spoken words."""
+    t = np.arange(int(word_sec * sample_rate)) / float(sample_rate)
+    word = (0.5 * np.sin(2 * np.pi * 220.0 * t)).astype(np.float32)
+    gap = _silence(gap_sec, sample_rate)
+    return np.concatenate([np.concatenate([word, gap]) for _ in range(count)])
+
+
+def _silence(seconds, sample_rate=SR):
+    rng = np.random.default_rng(0)
+    return (1e-4 * rng.standard_normal(int(seconds * sample_rate))).astype(np.float32)
+
+
+class BurstTranscriber:
+    """Transcribes each complete tone burst as ``w0``, ``w1``, ..."""
+
+    def __init__(self, language="English"):
+        self.calls = []
+        self.language = language
+
+    def __call__(self, samples, language):
+        self.calls.append({"seconds": len(samples) / float(SR), "language": language})
+        frames = len(samples) // 160
+        loud = np.sqrt(np.mean(samples[: frames * 160].reshape(frames, 160) ** 2, axis=1)) > 0.01
+        # A burst still sounding at the end of the buffer is not a word yet.
+        edges = np.flatnonzero(np.diff(np.concatenate(([0], loud.astype(np.int8), [0]))) == -1)
+        count = int(np.sum(edges < frames))
+        return " ".join(f"w{index}" for index in range(count)), self.language
+
+
+def _push(session, samples, block_sec=0.25, sample_rate=SR):
+    events = []
+    block = int(block_sec * sample_rate)
+    for start in range(0, len(samples), block):
+        events.extend(session.push(samples[start : start + block]))
+    return events
+
+
+class TokenTests(unittest.TestCase):
+    def test_agreed_prefix_ignores_case_and_spacing(self):
+        self.assertEqual(agreed_prefix(["Hello", " there"], ["hello", " there", " you"]), 2)
+        self.assertEqual(agreed_prefix(["a", " b"], ["a", " c"]), 1)
+
+
+class StreamSessionTests(unittest.TestCase):
+    def _session(self, **kwargs):
+        self.transcriber = BurstTranscriber()
+        return StreamSession(self.transcriber, **kwargs)
+
+    def test_partials_report_agreed_words_as_stable(self):
+        session = self._session(language=None)
+
+        events = _push(session, _words(6))
+
+        partials = [payload for name, payload in events if name == "partial"]
+        self.assertEqual(len(partials), 3)
+        self.assertEqual(partials[0]["stable"], "")
+        self.assertEqual(partials[0]["unstable"], "w0 w1")
+        self.assertEqual(partials[1]["stable"], "w0 w1")
+        self.assertEqual(partials[1]["unstable"], "w2 w3")
+        self.assertEqual(partials[2]["stable"], "w0 w1 w2 w3")
+        self.assertEqual(session.language, "English")
+        self.assertEqual(self.transcriber.calls[-1]["language"], "English")
+
+    def test_pause_finalizes_the_buffer(self):
+        session = self._session()
+
+        events = _push(session, np.concatenate([_words(4), _silence(1.0)]))
+
+        finals = [payload for name, payload in events if name == "final"]
+        self.assertEqual(len(finals), 1)
+        self.assertEqual(finals[0]["text"], "w0 w1 w2 w3")
+        self.assertEqual(finals[0]["start"], 0.0)
+        self.assertGreater(finals[0]["end"], 1.8)
+        self.assertLess(finals[0]["end"], 2.5)
+        self.assertEqual(session.snapshot()["stable"], "")
+
+    def test_silence_is_never_decoded(self):
+        session = self._session()
+
+        events = _push(session, _silence(5.0))
+
+        self.assertEqual(events, [])
+        self.assertEqual(self.transcriber.calls, [])
+        self.assertLessEqual(session.snapshot()["buffered_sec"], 1.0)
+
+    def test_long_speech_is_cut_at_a_pause(self):
+        session = self._session(max_buffer_sec=3.0)
+
+        events = _push(session, _words(10))
+
+        finals = [payload for name, payload in events if name == "final"]
+        self.assertTrue(finals)
+        self.assertLessEqual(finals[0]["end"], 3.0)
+        self.assertTrue(finals[0]["text"].startswith("w0"))
+
+    def test_close_finalizes_remaining_audio(self):
+        session = self._session()
+        _push(session, np.concatenate([_words(2), _silence(1.0), _words(3)]))
+
+        events, result = session.close()
+
+        self.assertEqual([payload["text"] for name, payload in events if name == "final"], ["w0 w1 w2"])
+        self.assertEqual(result["text"], "w0 w1 w0 w1 w2")
+        self.assertEqual([segment["index"] for segment in result["segments"]], [0, 1])
+        self.assertAlmostEqual(result["duration"], 3.5, places=2)
+        with self.assertRaises(RuntimeError):
+            session.push(_silence(0.1))
+
+
+class StreamProtocolTests(unittest.TestCase):
+    def setUp(self):
+        self.transcriber = BurstTranscriber()
+        self.closed = []
+        info = {"backend": "transformers", "model": "fake", "sample_rate": SR}
+        patcher = patch.object(
+            stt,
+            "open_stream_transcriber",
+            return_value=(self.transcriber, lambda: self.closed.append(True), info),
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_open_push_close_with_resampled_int16(self):
+        opened = streaming.method_stream_open({"sample_rate": 48000, "channels": 2})
+        stereo = np.repeat(_words(4, sample_rate=48000)[:, None], 2, axis=1)
+        pcm = base64.b64encode((stereo * 32767).astype("<i2").tobytes()).decode("ascii")
+        events = []
+
+        pushed = streaming.method_stream_push(
+            {"session_id": opened["session_id"], "pcm": pcm},
+            emit=lambda name, payload: events.append((name, payload)),
+        )
+        result = streaming.method_stream_close(
+            {"session_id": opened["session_id"]},
+            emit=lambda name, payload: events.append((name, payload)),
+        )
+
+        self.assertEqual(opened["input_sample_rate"], 48000)
+        self.assertAlmostEqual(pushed["received_sec"], 2.0, places=2)
+        self.assertIn("partial", [name for name, _ in events])
+        self.assertEqual(result["text"], "w0 w1 w2 w3")
+        self.assertEqual(self.closed, [True])
+        with self.assertRaises(ValueError):
+            streaming.method_stream_push({"session_id": opened["session_id"], "pcm": pcm})
+
+    def test_idle_sessions_expire(self):
+        opened = streaming.method_stream_open({})
+        session = streaming.stream_manager.get(opened["session_id"])
+        session.last_active -= streaming.stream_manager.ttl_sec + 1
+
+        self.assertEqual(streaming.stream_manager.expire(), [opened["session_id"]])
+        self.assertEqual(self.closed, [True])
+
+    def test_push_drops_abandoned_sessions(self):
+        abandoned = streaming.method_stream_open({})
+        live = streaming.method_stream_open({})
+        self.addCleanup(streaming.method_stream_close, {"session_id": live["session_id"]})
+        session = streaming.stream_manager.get(abandoned["session_id"])
+        session.push(_words(2))
+        session.last_active -= streaming.stream_manager.ttl_sec + 1
+        calls = len(self.transcriber.calls)
+
+        streaming.method_stream_push({"session_id": live["session_id"], "pcm": ""})
+
+        # The abandoned audio is freed without being decoded.
+        self.assertEqual(self.closed, [True])
+        self.assertEqual(len(self.transcriber.calls), calls)
+        with self.assertRaises(ValueError):
+            streaming.stream_manager.get(abandoned["session_id"])
+
+    def test_rejects_unknown_pcm_dtype(self):
+        with self.assertRaises(ValueError):
+            streaming.decode_pcm("", dtype="int8")
+
+
+
+class StreamModelPinTests(unittest.TestCase):
+    def test_session_pins_its_model_until_closed(self):
+        key = "test:stream-model"
+        registry = stt.model_registry
+        self.addCleanup(registry.evict, key)
+
+        def _get_model(_name):
+            return registry.get(key, lambda: object(), kind=stt.STT_MODEL_KIND)
+
+        def _refs():
+            return next(m["refs"] for m in registry.stats()["models"] if m["key"] == key)
+
+        with patch.object(stt, "get_mlx_asr_model", side_effect=_get_model):
+            with registry.request_scope():
+                _, close, _ = stt.open_stream_transcriber({"backend": "mlx-audio"})
+
+        self.assertEqual(_refs(), 1)
+        self.assertEqual(registry.evict(key), [])
+        close()
+        self.assertEqual(_refs(), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import os
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import numpy as np
+import soundfile as sf
+
+
+RUNTIME_DIR = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(RUNTIME_DIR))
+
+import stt  # noqa: E402
+from cache import DiskLRUCache  # noqa: E402
+
+
+def _name(audio):
+    """A file by its name, decoded samples by their duration."""
+    if isinstance(audio, str):
+        return Path(audio).stem
+    samples, sample_rate = audio
+    return f"{len(samples) / sample_rate:g}s"
+
+
+class FakeQwenModel:
+    """Stands in for ``Qwen3ASRModel``; transcribes audio to its name."""
+
+    def __init__(self, fail_on=None):
+        self.calls = []
+        self.fail_on = fail_on
+
+    def transcribe(self, audio, language=None, return_time_stamps=False, **kwargs):
+        audio = audio if isinstance(audio, list) else [audio]
+        names = [_name(item) for item in audio]
+        self.calls.append({"audio": names, "language": language})
+        if self.fail_on in names:
+            raise RuntimeError(f"cannot decode {self.fail_on}")
+        return [
+            SimpleNamespace(language="English", text=f" {name} ", time_stamps=None)
+            for name in names
+        ]
+
+
+def _write_silence(path, seconds, sample_rate=16000):
+    sf.write(path, np.zeros(int(seconds * sample_rate), dtype=np.float32), sample_rate)
+
+
+class PlanBatchesTests(unittest.TestCase):
+    def test_sorts_by_duration_and_caps_batch_size(self):
+        batches = stt._plan_batches([9.0, 1.0, 2.0, 1.5, 8.0], max_batch=2, max_ratio=0)
+
+        self.assertEqual(batches, [[1, 3], [2, 4], [0]])
+
+    def test_closes_batch_when_durations_diverge(self):
+        batches = stt._plan_batches([10.0, 3.0, 30.0, 4.0], max_batch=8, max_ratio=2.0)
+
+        self.assertEqual(batches, [[1, 3], [0], [2]])
+
+    def test_unknown_durations_are_batched_last(self):
+        batches = stt._plan_batches([None, 2.0, None], max_batch=4, max_ratio=2.0)
+
+        self.assertEqual(batches, [[1], [0, 2]])
+
+
+class QwenPredictBatchTests(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.temp_dir.cleanup)
+        self.model = FakeQwenModel()
+        patcher = patch.object(stt, "get_qwen_model", side_effect=lambda **_: self.model)
+        self.get_model = patcher.start()
+        self.addCleanup(patcher.stop)
+        # torch is not needed to resolve dtypes for the fake model.
+        patcher = patch.object(stt, "_resolve_dtype", side_effect=lambda dtype: dtype)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        cache = DiskLRUCache(
+            os.path.join(self.temp_dir.name, "cache"), max_bytes=1 << 20, suffix=".json"
+        )
+        patcher = patch.object(stt, "get_transcript_cache", return_value=cache)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        checkpoints = DiskLRUCache(
+            os.path.join(self.temp_dir.name, "checkpoints"), max_bytes=1 << 20, suffix=".jsonl"
+        )
+        patcher = patch.object(stt, "get_checkpoint_store", return_value=checkpoints)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def _files(self, durations):
+        paths = []
+        for index, seconds in enumerate(durations):
+            path = os.path.join(self.temp_dir.name, f"memo{index}.wav")
+            _write_silence(path, seconds)
+            paths.append(path)
+        return paths
+
+    def _predict_batch(self, inputs, **params):
+        events = []
+        result = stt.method_predict_batch(
+            {
+                "backend": "transformers",
+                "inputs": inputs,
+                "max_inference_batch_size": 2,
+                **params,
+            },
+            emit=lambda event, payload: events.append((event, payload)),
+        )
+        return result, events
+
+    def test_batches_by_duration_and_keeps_input_order(self):
+        paths = self._files([6.0, 1.0, 5.0, 1.2])
+
+        result, _ = self._predict_batch(paths)
+
+        self.assertEqual(result["batches"], 2)
+        # Inputs are decoded once and handed to the model as samples.
+        self.assertEqual(
+            [call["audio"] for call in self.model.calls],
+            [["1s", "1.2s"], ["5s", "6s"]],
+        )
+        self.assertEqual(self.get_model.call_count, 1)
+        self.assertEqual(
+            [item["text"] for item in result["results"]],
+            ["6s", "1s", "5s", "1.2s"],
+        )
+        self.assertEqual([item["index"] for item in result["results"]], [0, 1, 2, 3])
+        self.assertEqual(result["errors"], 0)
+        self.assertAlmostEqual(result["duration"], 13.2, places=3)
+
+    def test_failed_batch_is_retried_per_input(self):
+        paths = self._files([1.0, 1.1])
+        self.model.fail_on = "1.1s"
+
+        result, _ = self._predict_batch(paths + [os.path.join(self.temp_dir.name, "gone.wav")])
+
+        ok = [item["ok"] for item in result["results"]]
+        self.assertEqual(ok, [True, False, False])
+        self.assertIn("1.1s", result["results"][1]["error"])
+        self.assertIn("audio not found", result["results"][2]["error"])
+        self.assertEqual(result["errors"], 2)
+
+    def test_cached_inputs_skip_the_model(self):
+        paths = self._files([1.0, 1.5, 2.0])
+        self._predict_batch(paths[:2])
+        self.model.calls.clear()
+
+        result, _ = self._predict_batch(paths)
+
+        self.assertEqual([item["cache"] for item in result["results"]], ["hit", "hit", "miss"])
+        self.assertEqual([call["audio"] for call in self.model.calls], [["2s"]])
+
+    def test_per_input_language_and_item_events(self):
+        paths = self._files([1.0, 1.0])
+
+        result, events = self._predict_batch(
+            [{"audio_path": paths[0], "language": "Chinese"}, paths[1]],
+            language="English",
+            stream=True,
+        )
+
+        self.assertEqual(self.model.calls[0]["language"], ["Chinese", "English"])
+        self.assertEqual([event for event, _ in events], ["item", "item"])
+        self.assertEqual(result["results"][0]["audio_path"], paths[0])
+
+    def test_requires_inputs(self):
+        with self.assertRaises(ValueError):
+            stt.method_predict_batch({"backend": "transformers", "inputs": []})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,681 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import os
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import numpy as np
+import soundfile as sf
+
+
+RUNTIME_DIR = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(RUNTIME_DIR))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+import downloads  # noqa: E402
+import frontend  # noqa: E402
+import metrics  # noqa: E402
+import stt  # noqa: E402
+from cache import DiskLRUCache  # noqa: E402
+from test_audio_io import write_fake_container, write_fake_ffmpeg  # noqa: E402
+from test_downloads import AudioServer  # noqa: E402
+
+
+class FakeAsrModel:
+    def __init__(self):
+        self.calls = []
+        self.inputs = []
+
+    def generate(self, audio, **kwargs):
+        self.calls.append(kwargs)
+        self.inputs.append(audio)
+        return SimpleNamespace(text="hello world.")
+
+
+class PathOnlyAsrModel(FakeAsrModel):
+    def generate(self, audio, **kwargs):
+        if not isinstance(audio, str):
+            raise TypeError("audio must be a path")
+        self.chunk_seconds = sf.info(audio).duration
+        return super().generate(audio, **kwargs)
+
+
+class FakeAlignerModel:
+    def __init__(self):
+        self.calls = []
+
+    def generate(self, audio, text, **kwargs):
+        self.calls.append(text)
+        return [
+            {"start_time": 0.1, "end_time": 0.5, "text": "hello"},
+            {"start_time": 0.6, "end_time": 1.0, "text": "world"},
+        ]
+
+
+def _write_tone(path, seconds, sample_rate=16000):
+    t = np.arange(int(seconds * sample_rate)) / float(sample_rate)
+    sf.write(path, 0.1 * np.sin(2 * np.pi * 220.0 * t), sample_rate)
+
+
+class MlxPredictTestCase(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.temp_dir.cleanup)
+        self.audio_path = os.path.join(self.temp_dir.name, "speech.wav")
+        self.asr_model = FakeAsrModel()
+        self.aligner_model = FakeAlignerModel()
+        self.get_asr = self._patch("get_mlx_asr_model", self.asr_model)
+        self.get_aligner = self._patch("get_mlx_aligner_model", self.aligner_model)
+        self.transcript_cache = DiskLRUCache(
+            os.path.join(self.temp_dir.name, "cache"), max_bytes=1 << 20, suffix=".json"
+        )
+        self._patch("get_transcript_cache", self.transcript_cache)
+        self.checkpoints = DiskLRUCache(
+            os.path.join(self.temp_dir.name, "checkpoints"), max_bytes=1 << 20, suffix=".jsonl"
+        )
+        self._patch("get_checkpoint_store", self.checkpoints)
+
+    def _patch(self, name, model):
+        patcher = patch.object(stt, name, return_value=model)
+        mock = patcher.start()
+        self.addCleanup(patcher.stop)
+        return mock
+
+    def _predict(self, seconds, **params):
+        _write_tone(self.audio_path, seconds)
+        events = []
+        result = stt.method_predict(
+            {
+                "backend": "mlx-audio",
+                "audio_path": self.audio_path,
+                "return_time_stamps": True,
+                **params,
+            },
+            emit=lambda event, payload: events.append((event, payload)),
+        )
+        return result, events
+
+
+class MlxChunkingTests(MlxPredictTestCase):
+    def test_shared_pcm_buffer_is_fed_without_files(self):
+        t = np.arange(3 * 48000) / 48000.0
+        pcm = (0.1 * np.sin(2 * np.pi * 220.0 * t) * 32767).astype("<i2")
+        pcm_path = os.path.join(self.temp_dir.name, "speech.pcm")
+        pcm.tofile(pcm_path)
+
+        result = stt.method_predict(
+            {
+                "backend": "mlx-audio",
+                "audio_pcm": {"path": pcm_path, "dtype": "int16", "sample_rate": 48000},
+                "language": "English",
+            }
+        )
+
+        self.assertEqual(len(self.asr_model.inputs), 1)
+        self.assertEqual(len(self.asr_model.inputs[0]), 3 * 16000)
+        self.assertEqual(result["text"], "hello world.")
+        self.assertAlmostEqual(result["duration"], 3.0)
+        self.assertEqual(result["sample_rate"], 48000)
+
+    def test_stream_emits_one_partial_per_chunk(self):
+        result, events = self._predict(
+            5.0,
+            stream=True,
+            max_chunk_sec=2.0,
+            merge_tail_sec=0.5,
+        )
+
+        self.assertGreater(len(events), 1)
+        self.assertTrue(all(name == "partial" for name, _ in events))
+        indexes = [payload["index"] for _, payload in events]
+        self.assertEqual(indexes, list(range(len(events))))
+        processed = [payload["processed_sec"] for _, payload in events]
+        self.assertEqual(processed, sorted(processed))
+        self.assertAlmostEqual(processed[-1], 5.0)
+        self.assertTrue(all(payload["total_sec"] == 5.0 for _, payload in events))
+        self.assertTrue(events[0][1]["segments"])
+        self.assertTrue(result["text"])
+
+    def test_short_file_emits_single_partial(self):
+        _, events = self._predict(1.5, stream=True)
+
+        self.assertEqual(len(events), 1)
+        name, payload = events[0]
+        self.assertEqual(name, "partial")
+        self.assertEqual(payload["text"], "hello world.")
+        self.assertEqual(payload["segments"][0]["time_stamps"], [0.1, 1.0])
+
+    def test_chunks_are_fed_as_in_memory_samples(self):
+        self._predict(5.0, max_chunk_sec=2.0, merge_tail_sec=0.5, language_probes=0)
+
+        self.assertGreater(len(self.asr_model.inputs), 1)
+        for audio in self.asr_model.inputs:
+            self.assertIsInstance(audio, np.ndarray)
+            self.assertEqual(audio.dtype, np.float32)
+            self.assertEqual(audio.ndim, 1)
+            self.assertLessEqual(len(audio), 2.5 * 16000)
+
+    def test_each_sample_is_transcribed_once(self):
+        result, _ = self._predict(
+            7.0, max_chunk_sec=2.0, merge_tail_sec=0.5, language_probes=0
+        )
+
+        fed = sum(len(audio) for audio in self.asr_model.inputs)
+        self.assertEqual(fed, 7 * 16000)
+        self.assertEqual(len(self.aligner_model.calls), len(self.asr_model.inputs))
+        self.assertAlmostEqual(result["duration"], 7.0)
+
+    def test_path_only_models_fall_back_to_chunk_files(self):
+        path_only = PathOnlyAsrModel()
+        self.addCleanup(stt._path_only_model_types.discard, PathOnlyAsrModel)
+        with patch.object(stt, "get_mlx_asr_model", return_value=path_only):
+            result = self._predict(5.0, max_chunk_sec=2.0, merge_tail_sec=0.5)[0]
+
+        self.assertTrue(result["text"])
+        self.assertTrue(all(isinstance(audio, str) for audio in path_only.inputs))
+        self.assertFalse(any(os.path.exists(audio) for audio in path_only.inputs))
+        self.assertLessEqual(path_only.chunk_seconds, 2.5)
+
+    def test_generate_errors_do_not_downgrade_to_chunk_files(self):
+        def _broken(audio, **kwargs):
+            self.asr_model.inputs.append(audio)
+            raise ValueError("bad decoding options")
+
+        self.asr_model.generate = _broken
+        with self.assertRaisesRegex(ValueError, "bad decoding options") as caught:
+            self._predict(1.5, language_probes=0)
+
+        self.assertTrue(caught.exception.__suppress_context__)
+
+        self.assertNotIn(FakeAsrModel, stt._path_only_model_types)
+        self.assertEqual(len(self.asr_model.inputs), 2)
+
+    def test_text_only_request_skips_the_aligner(self):
+        self.asr_model.generate = lambda audio, **kwargs: SimpleNamespace(
+            text="First sentence. Second one, 3.5 percent!"
+        )
+
+        result, events = self._predict(
+            1.5, stream=True, return_time_stamps=False
+        )
+
+        self.get_aligner.assert_not_called()
+        self.assertEqual(self.aligner_model.calls, [])
+        self.assertEqual(
+            result["items"],
+            [
+                {"text": "First sentence."},
+                {"text": "Second one,"},
+                {"text": "3.5 percent!"},
+            ],
+        )
+        self.assertEqual(events[0][1]["segments"], result["items"])
+
+    def test_stages_are_recorded_across_the_pipeline_thread(self):
+        with metrics.recording() as timings:
+            self._predict(5.0, max_chunk_sec=2.0, merge_tail_sec=0.5, cache=False)
+
+        for name in ("download", "decode", "asr", "align", "segment"):
+            self.assertIn(name, timings.stages)
+
+    def test_no_events_without_stream_flag(self):
+        _, events = self._predict(5.0, max_chunk_sec=2.0, merge_tail_sec=0.5)
+
+        self.assertEqual(events, [])
+
+    def test_unknown_length_container_is_streamed_through_ffmpeg(self):
+        ffmpeg = write_fake_ffmpeg(self.temp_dir.name)
+        webm = os.path.join(self.temp_dir.name, "recording.webm")
+        t = np.arange(5 * 48000) / 48000.0
+        write_fake_container(webm, 0.1 * np.sin(2 * np.pi * 220.0 * t), 48000, False)
+        events = []
+
+        with patch.dict(os.environ, {"QWEN_ASR_FFMPEG": ffmpeg}):
+            result = stt.method_predict(
+                {
+                    "backend": "mlx-audio",
+                    "audio_path": webm,
+                    "stream": True,
+                    "max_chunk_sec": 2.0,
+                    "merge_tail_sec": 0.5,
+                },
+                emit=lambda event, payload: events.append((event, payload)),
+            )
+
+        self.assertGreater(len(self.asr_model.inputs), 1)
+        self.assertTrue(all(isinstance(audio, np.ndarray) for audio in self.asr_model.inputs))
+        self.assertTrue(all(payload["total_sec"] is None for _, payload in events))
+        self.assertAlmostEqual(events[-1][1]["processed_sec"], 5.0)
+        self.assertAlmostEqual(result["duration"], 5.0)
+        self.assertEqual(result["sample_rate"], 48000)
+
+
+class LanguageAsrModel(FakeAsrModel):
+    """Reports the scripted languages in turn unless a language is forced."""
+
+    def __init__(self, languages):
+        super().__init__()
+        self.languages = list(languages)
+
+    def generate(self, audio, **kwargs):
+        result = super().generate(audio, **kwargs)
+        result.language = kwargs.get("language") or self.languages.pop(0)
+        return result
+
+
+class LanguageDetectionTests(MlxPredictTestCase):
+    def _use(self, model):
+        patcher = patch.object(stt, "get_mlx_asr_model", return_value=model)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        aligner_languages = []
+        original = self.aligner_model.generate
+
+        def _generate(audio, text, **kwargs):
+            aligner_languages.append(kwargs.get("language"))
+            return original(audio, text, **kwargs)
+
+        self.aligner_model.generate = _generate
+        return aligner_languages
+
+    def test_first_chunk_language_is_pinned(self):
+        model = LanguageAsrModel(["English", "Chinese", "Chinese"])
+        aligner_languages = self._use(model)
+
+        result, _ = self._predict(5.0, max_chunk_sec=2.0, merge_tail_sec=0.5, language_probes=0)
+
+        self.assertGreater(len(model.calls), 1)
+        self.assertNotIn("language", model.calls[0])
+        self.assertTrue(all(call["language"] == "English" for call in model.calls[1:]))
+        self.assertEqual(set(aligner_languages), {"English"})
+        self.assertEqual(
+            result["language_detection"],
+            {"language": "English", "source": "first_chunk", "confidence": None},
+        )
+
+    def test_long_files_are_probed_before_chunking(self):
+        model = LanguageAsrModel(["Chinese", "English", "Chinese"])
+        aligner_languages = self._use(model)
+
+        result, _ = self._predict(5.0, max_chunk_sec=2.0, merge_tail_sec=0.5)
+
+        probes, chunks = model.calls[:3], model.calls[3:]
+        self.assertTrue(all("language" not in call for call in probes))
+        self.assertTrue(chunks)
+        self.assertTrue(all(call["language"] == "Chinese" for call in chunks))
+        self.assertEqual(set(aligner_languages), {"Chinese"})
+        self.assertEqual(result["language"], "Chinese")
+        self.assertEqual(result["language_detection"]["source"], "probes")
+        self.assertAlmostEqual(result["language_detection"]["confidence"], 0.667)
+
+    def test_requested_language_skips_detection(self):
+        model = LanguageAsrModel([])
+        self._use(model)
+
+        result, _ = self._predict(5.0, max_chunk_sec=2.0, merge_tail_sec=0.5, language="German")
+
+        self.assertTrue(all(call["language"] == "German" for call in model.calls))
+        self.assertEqual(result["language_detection"]["source"], "request")
+
+
+class CrashingAsrModel(FakeAsrModel):
+    def __init__(self, crash_on_call):
+        super().__init__()
+        self.crash_on_call = crash_on_call
+
+    def generate(self, audio, **kwargs):
+        if len(self.calls) == self.crash_on_call:
+            raise RuntimeError("killed")
+        return super().generate(audio, **kwargs)
+
+
+class CheckpointResumeTests(MlxPredictTestCase):
+    PARAMS = {"max_chunk_sec": 2.0, "merge_tail_sec": 0.5, "language_probes": 0}
+
+    def test_rerun_resumes_after_the_last_finished_chunk(self):
+        crashing = CrashingAsrModel(crash_on_call=2)
+        with patch.object(stt, "get_mlx_asr_model", return_value=crashing):
+            with self.assertRaises(RuntimeError):
+                self._predict(7.0, **self.PARAMS)
+        self.assertEqual(len(os.listdir(self.checkpoints.directory)), 1)
+
+        result = self._predict(7.0, **self.PARAMS)[0]
+        resumed_calls = len(self.asr_model.inputs)
+
+        fresh = FakeAsrModel()
+        with patch.object(stt, "get_mlx_asr_model", return_value=fresh):
+            expected = self._predict(7.0, cache=False, **self.PARAMS)[0]
+        self.assertEqual(resumed_calls, len(fresh.inputs) - 2)
+        self.assertEqual(result["text"], expected["text"])
+        self.assertEqual(result["items"], expected["items"])
+        # The finished transcription no longer needs its checkpoint.
+        self.assertEqual(os.listdir(self.checkpoints.directory), [])
+
+    def test_single_chunk_input_never_touches_the_checkpoint_store(self):
+        store = self._patch("get_checkpoint_store", self.checkpoints)
+
+        result = self._predict(2.0, **self.PARAMS)[0]
+
+        self.assertTrue(result["text"])
+        store.assert_not_called()
+        self.assertFalse(os.path.exists(self.checkpoints.directory))
+
+    def test_checkpoint_can_be_disabled(self):
+        crashing = CrashingAsrModel(crash_on_call=2)
+        with patch.object(stt, "get_mlx_asr_model", return_value=crashing):
+            with self.assertRaises(RuntimeError):
+                self._predict(7.0, checkpoint=False, **self.PARAMS)
+
+        self.assertFalse(os.path.exists(self.checkpoints.directory))
+
+
+class FakeQwenAligner:
+    def __init__(self):
+        self.calls = []
+
+    def align(self, audio, text, language):
+        self.calls.append(language)
+        items = [SimpleNamespace(start_time=0.1, end_time=1.0, text=text)]
+        return [SimpleNamespace(items=items)]
+
+
+class FakeQwenModel:
+    """Stands in for ``Qwen3ASRModel``, which aligns inside ``transcribe``."""
+
+    def __init__(self):
+        self.inputs = []
+        self.forced_aligner = FakeQwenAligner()
+
+    def transcribe(self, audio, language=None, return_time_stamps=False, **kwargs):
+        self.inputs.append(audio)
+        items = [
+            SimpleNamespace(start_time=0.1, end_time=0.5, text="hello"),
+            SimpleNamespace(start_time=0.6, end_time=1.0, text="world"),
+        ]
+        return [
+            SimpleNamespace(
+                language="English",
+                text="hello world.",
+                time_stamps=SimpleNamespace(items=items) if return_time_stamps else None,
+            )
+        ]
+
+
+class QwenChunkingTests(MlxPredictTestCase):
+    def setUp(self):
+        super().setUp()
+        self.qwen_model = FakeQwenModel()
+        self.get_qwen = self._patch("get_qwen_model", self.qwen_model)
+        patcher = patch.object(stt, "_resolve_dtype", side_effect=lambda dtype: dtype)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_long_file_is_transcribed_in_chunks(self):
+        result, events = self._predict(
+            5.0,
+            backend="transformers",
+            stream=True,
+            max_chunk_sec=2.0,
+            merge_tail_sec=0.5,
+            language="English",
+        )
+
+        self.assertGreater(len(self.qwen_model.inputs), 1)
+        for samples, sample_rate in self.qwen_model.inputs:
+            self.assertEqual(sample_rate, 16000)
+            self.assertLessEqual(len(samples), 2.5 * 16000)
+        fed = sum(len(samples) for samples, _ in self.qwen_model.inputs)
+        self.assertEqual(fed, 5 * 16000)
+        self.assertEqual(len(events), len(self.qwen_model.inputs))
+        self.assertEqual(result["backend"], "transformers")
+        self.assertEqual(result["language"], "English")
+        self.assertAlmostEqual(result["duration"], 5.0)
+        # Alignment of later chunks is shifted to file time.
+        starts = [item["start"] for item in result["items"]]
+        self.assertEqual(starts, sorted(starts))
+        self.assertGreater(starts[-1], 2.0)
+
+    def test_short_file_is_decoded_once(self):
+        _write_tone(self.audio_path, 1.5, sample_rate=44100)
+        frontend.decode_cache.clear()
+        decode_calls = []
+        real_decode = frontend._decode
+
+        def _decode(source, sample_rate):
+            decode_calls.append(source)
+            return real_decode(source, sample_rate)
+
+        with patch.object(frontend, "_decode", side_effect=_decode):
+            result = stt.method_predict(
+                {
+                    "backend": "transformers",
+                    "audio_path": self.audio_path,
+                    "return_time_stamps": True,
+                    "cache": False,
+                }
+            )
+            stt.method_predict({"backend": "transformers", "audio_path": self.audio_path})
+
+        # The model gets the front-end's samples, not the file to decode again.
+        fed, sample_rate = self.qwen_model.inputs[0]
+        self.assertEqual((len(fed), sample_rate), (24000, 16000))
+        self.assertEqual(decode_calls, [self.audio_path])
+        self.assertEqual(result["items"][0]["time_stamps"], [0.1, 1.0])
+        self.assertEqual(result["sample_rate"], 44100)
+
+    def test_quantized_model_is_a_separate_cache_entry(self):
+        plain, _ = self._predict(1.5, backend="transformers", device="cpu")
+        quantized, _ = self._predict(1.5, backend="transformers", device="cpu", quantize="int8")
+
+        self.assertEqual(self.get_qwen.call_args.kwargs["quantize"], "int8-dynamic")
+        self.assertEqual((plain["quantize"], quantized["quantize"]), (None, "int8-dynamic"))
+        self.assertEqual(quantized["cache"], "miss")
+
+    def test_in_memory_pcm_is_transcribed_without_files(self):
+        samples = np.zeros(48000, dtype=np.float32)
+        params = {"backend": "transformers", "audio": (samples, 48000), "return_time_stamps": False}
+
+        result = stt.method_predict(params)
+        repeat = stt.method_predict(params)
+
+        self.assertEqual(len(self.qwen_model.inputs), 1)
+        fed, sample_rate = self.qwen_model.inputs[0]
+        self.assertEqual((len(fed), sample_rate), (16000, 16000))
+        self.assertEqual(result["items"], [{"text": "hello world."}])
+        self.assertEqual((result["cache"], repeat["cache"]), ("miss", "hit"))
+        self.assertAlmostEqual(result["duration"], 1.0)
+
+
+def _write_words(path, seconds, sample_rate=16000):
+    """Tone bursts with short pauses, which the confidence check takes for speech."""
+    t = np.arange(int(seconds * sample_rate)) / float(sample_rate)
+    bursts = np.where((t % 0.5) < 0.3, 0.1, 0.001)
+    sf.write(path, bursts * np.sin(2 * np.pi * 220.0 * t), sample_rate)
+
+
+class LoopingAsrModel(FakeAsrModel):
+    """Gets stuck repeating itself on the second chunk."""
+
+    def generate(self, audio, **kwargs):
+        result = super().generate(audio, **kwargs)
+        if len(self.calls) == 2:
+            result.text = " ".join(["thank you so much"] * 10)
+        return result
+
+
+class CascadeTests(MlxPredictTestCase):
+    PARAMS = {"max_chunk_sec": 2.0, "merge_tail_sec": 0.5, "language": "English"}
+
+    def setUp(self):
+        super().setUp()
+        self.draft_model = LoopingAsrModel()
+        self.get_asr.side_effect = lambda name: (
+            self.draft_model if name == "draft" else self.asr_model
+        )
+
+    def _predict_words(self, seconds, **params):
+        _write_words(self.audio_path, seconds)
+        return stt.method_predict(
+            {"backend": "mlx-audio", "audio_path": self.audio_path, **self.PARAMS, **params}
+        )
+
+    def test_only_unsure_chunks_reach_the_full_model(self):
+        result = self._predict_words(6.0, draft_model="draft", return_time_stamps=True)
+
+        chunks = len(self.draft_model.inputs)
+        self.assertGreater(chunks, 2)
+        self.assertEqual(len(self.asr_model.inputs), 1)
+        self.assertEqual(
+            result["cascade"],
+            {"draft_model": "draft", "min_confidence": 0.6, "chunks": chunks, "escalated": 1},
+        )
+        self.assertNotIn("thank you", result["text"])
+        self.assertEqual(len(self.aligner_model.calls), chunks)
+
+    def test_cascade_is_part_of_the_cache_key(self):
+        plain = self._predict_words(3.0)
+        cascaded = self._predict_words(3.0, draft_model="draft")
+        disabled = self._predict_words(3.0, draft_model="draft", cascade=False)
+
+        self.assertEqual((plain["cache"], cascaded["cache"]), ("miss", "miss"))
+        self.assertIsNone(plain["cascade"])
+        self.assertEqual(disabled["cache"], "hit")
+
+    def test_qwen_draft_is_aligned_by_the_full_model(self):
+        full = FakeQwenModel()
+        draft = FakeQwenModel()
+        patcher = patch.object(
+            stt,
+            "get_qwen_model",
+            side_effect=lambda **kwargs: draft if kwargs["model_name"] == "draft" else full,
+        )
+        get_qwen = patcher.start()
+        self.addCleanup(patcher.stop)
+        patcher = patch.object(stt, "_resolve_dtype", side_effect=lambda dtype: dtype)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        result = self._predict_words(
+            6.0, backend="transformers", draft_model="draft", return_time_stamps=True
+        )
+
+        draft_kwargs = [
+            kwargs for _, kwargs in get_qwen.call_args_list if kwargs["model_name"] == "draft"
+        ]
+        self.assertIsNone(draft_kwargs[0]["forced_aligner"])
+        self.assertEqual(full.inputs, [])
+        self.assertEqual(len(full.forced_aligner.calls), len(draft.inputs))
+        self.assertEqual(result["cascade"]["escalated"], 0)
+        starts = [item["start"] for item in result["items"]]
+        self.assertEqual(starts, sorted(starts))
+
+
+class TranscriptCacheTests(MlxPredictTestCase):
+    def _predict_twice(self, **params):
+        first = self._predict(1.5, **params)[0]
+        calls = len(self.asr_model.calls)
+        second = stt.method_predict(
+            {
+                "backend": "mlx-audio",
+                "audio_path": self.audio_path,
+                "return_time_stamps": True,
+                **params,
+            }
+        )
+        return first, second, len(self.asr_model.calls) - calls
+
+    def test_repeat_request_is_served_from_cache(self):
+        first, second, extra_calls = self._predict_twice()
+
+        self.assertEqual(first["cache"], "miss")
+        self.assertEqual(second["cache"], "hit")
+        self.assertEqual(extra_calls, 0)
+        for key in ("text", "items", "duration"):
+            self.assertEqual(second[key], first[key])
+
+    def test_cache_key_includes_decoding_params(self):
+        self._predict(1.5)
+        result = self._predict(1.5, language="English")[0]
+
+        self.assertEqual(result["cache"], "miss")
+
+    def test_cache_can_be_disabled_per_request(self):
+        first, second, extra_calls = self._predict_twice(cache=False)
+
+        self.assertEqual(first["cache"], "off")
+        self.assertEqual(second["cache"], "off")
+        self.assertGreater(extra_calls, 0)
+
+
+class GatedAsrModel(FakeAsrModel):
+    """Records whether the server had sent the whole body, then lets it finish."""
+
+    def __init__(self, server):
+        super().__init__()
+        self.server = server
+        self.body_complete = []
+
+    def generate(self, audio, **kwargs):
+        self.body_complete.append(self.server.bodies_sent > 0)
+        self.server.gate.set()
+        return super().generate(audio, **kwargs)
+
+
+class AudioUrlTests(MlxPredictTestCase):
+    def setUp(self):
+        super().setUp()
+        self.server = AudioServer()
+        self.addCleanup(self.server.stop)
+        downloader = downloads.AudioDownloader(
+            os.path.join(self.temp_dir.name, "downloads"), max_bytes=1 << 24, timeout=10
+        )
+        self.addCleanup(downloader.pool.close)
+        patcher = patch.object(downloads, "_downloader", downloader)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        _write_tone(self.audio_path, 20.0)
+        with open(self.audio_path, "rb") as src:
+            self.server.files["/speech.wav"] = (src.read(), '"v1"')
+
+    def _predict_url(self):
+        return stt.method_predict(
+            {
+                "backend": "mlx-audio",
+                "audio_url": self.server.url("/speech.wav"),
+                "language": "English",
+                "max_chunk_sec": 2.0,
+                "merge_tail_sec": 0.5,
+                "tail_silence_window_sec": 0.5,
+            }
+        )
+
+    def test_chunks_are_transcribed_while_downloading(self):
+        self.asr_model = GatedAsrModel(self.server)
+        self._patch("get_mlx_asr_model", self.asr_model)
+        self.server.gate.clear()
+
+        result = self._predict_url()
+
+        self.assertFalse(self.asr_model.body_complete[0])
+        self.assertGreater(len(self.asr_model.inputs), 2)
+        self.assertAlmostEqual(result["duration"], 20.0)
+
+    def test_repeat_url_is_revalidated_and_served_from_cache(self):
+        first = self._predict_url()
+        calls = len(self.asr_model.calls)
+        second = self._predict_url()
+
+        self.assertEqual(first["cache"], "miss")
+        self.assertEqual(second["cache"], "hit")
+        self.assertEqual(len(self.asr_model.calls), calls)
+        self.assertEqual(self.server.bodies_sent, 1)
+        self.assertEqual(self.server.connections, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,24 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import sys
+import unittest
+from pathlib import Path
+
+
+RUNTIME_DIR = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(RUNTIME_DIR))
+
+from textutil import tokenize  # noqa: E402
+
+
+class TokenizeTests(unittest.TestCase):
+    def test_tokenize_splits_cjk_per_character(self):
+        self.assertEqual(tokenize("hello 你好 world"), ["hello", " 你", "好", " world"])
+
+    def test_tokens_join_back_into_the_text(self):
+        self.assertEqual("".join(tokenize("a  b")), "a  b")
+
+
+if __name__ == "__main__":
+    unittest.main()
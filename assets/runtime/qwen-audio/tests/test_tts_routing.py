@@ -1,12 +1,17 @@
 #!/usr/bin/env python3
 # -*- coding: utf-8 -*-
 
+import os
 import sys
+import tempfile
 import unittest
 from pathlib import Path
 from types import SimpleNamespace
 from unittest.mock import patch
 
+import numpy as np
+import soundfile as sf
+
 
 RUNTIME_DIR = Path(__file__).resolve().parents[1]
 sys.path.insert(0, str(RUNTIME_DIR))
@@ -259,6 +264,155 @@ class TtsRoutingTests(unittest.TestCase):
             ],
         )
 
+    def test_preload_resolves_the_variant_a_request_would_use(self):
+        with (
+            patch.object(tts, "IS_DARWIN", True),
+            patch.object(tts, "get_mlx_tts_model") as get_model,
+        ):
+            for params, variant in (
+                ({"voice": "Vivian"}, "CustomVoice"),
+                ({"instruct": "A calm voice"}, "VoiceDesign"),
+                ({}, "Base"),
+                ({"variant": "VoiceDesign"}, "VoiceDesign"),
+            ):
+                result = tts.preload_tts_model(
+                    {"model": "mlx-community/Qwen3-TTS-0.6B", **params}
+                )
+                expected = f"mlx-community/Qwen3-TTS-12Hz-0.6B-{variant}-bf16"
+                self.assertEqual(result, {"backend": "mlx-audio", "model": expected})
+                get_model.assert_called_with(expected)
+
+    def test_preload_skips_remote_backends(self):
+        result = tts.preload_tts_model({"model": "voxtral-mini-tts-2603"})
+
+        self.assertTrue(result["remote"])
+
+    def test_synthesized_audio_can_be_written_to_a_pcm_buffer(self):
+        model = SimpleNamespace(
+            generate=lambda **kwargs: iter(
+                [SimpleNamespace(audio=np.full(2400, 0.25, dtype=np.float32), sample_rate=24000)]
+            )
+        )
+        with tempfile.TemporaryDirectory() as temp_dir:
+            pcm_path = os.path.join(temp_dir, "speech.pcm")
+            with (
+                patch.object(tts, "IS_DARWIN", True),
+                patch.object(tts, "get_mlx_tts_model", return_value=model),
+            ):
+                result = tts.method_tts(
+                    {
+                        "text": "hello",
+                        "model": "mlx-community/Qwen3-TTS-0.6B",
+                        "output_pcm": {"path": pcm_path, "dtype": "int16", "sample_rate": 16000},
+                    }
+                )
+            size = os.path.getsize(pcm_path)
+
+        self.assertNotIn("output_path", result)
+        self.assertEqual(result["output_pcm"]["frames"], 1600)
+        self.assertEqual(result["output_pcm"]["sample_rate"], 16000)
+        self.assertEqual(size, 1600 * 2)
+        self.assertAlmostEqual(result["duration"], 0.1)
+
+
+class LengthModel:
+    """Fake MLX TTS model: 0.01 s of audio per character of text."""
+
+    sample_rate = 24000
+
+    def __init__(self):
+        self.texts = []
+
+    def generate(self, **kwargs):
+        self.texts.append(kwargs["text"])
+        frames = 240 * len(kwargs["text"])
+        yield SimpleNamespace(audio=np.full(frames, 0.25, dtype=np.float32), sample_rate=24000)
+
+
+class StreamingTtsTests(unittest.TestCase):
+    text = "今天天气很好。我们去公园散步吧！你觉得怎么样？"
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.temp_dir.cleanup)
+        self.model = LengthModel()
+        for patcher in (
+            patch.object(tts, "IS_DARWIN", True),
+            patch.object(tts, "get_mlx_tts_model", return_value=self.model),
+        ):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def _tts(self, on_event=None, **params):
+        events = []
+
+        def emit(event, payload):
+            events.append((event, payload))
+            if on_event is not None:
+                on_event(payload)
+
+        result = tts.method_tts(
+            {
+                "text": self.text,
+                "model": "mlx-community/Qwen3-TTS-0.6B",
+                "stream": True,
+                **params,
+            },
+            emit=emit,
+        )
+        return result, events
+
+    def test_each_sentence_is_appended_and_announced(self):
+        path = os.path.join(self.temp_dir.name, "speech.wav")
+        frames_at_event = []
+
+        result, events = self._tts(
+            on_event=lambda payload: frames_at_event.append(sf.info(path).frames),
+            output_path=path,
+        )
+
+        self.assertEqual(self.model.texts, ["今天天气很好。", "我们去公园散步吧！", "你觉得怎么样？"])
+        self.assertEqual([name for name, _ in events], ["segment"] * 3)
+        payloads = [payload for _, payload in events]
+        self.assertEqual([p["index"] for p in payloads], [0, 1, 2])
+        self.assertEqual([p["samples"] for p in payloads], [240 * 7, 240 * 9, 240 * 7])
+        self.assertEqual([p["sample_offset"] for p in payloads], [0, 240 * 7, 240 * 16])
+        # The file is a valid WAV of everything synthesized so far at each event.
+        self.assertEqual(frames_at_event, [240 * 7, 240 * 16, 240 * 23])
+        self.assertEqual([p["byte_offset"] for p in payloads], [44, 44 + 480 * 7, 44 + 480 * 16])
+        self.assertEqual(result["segments"], 3)
+        self.assertEqual(result["output_path"], path)
+        self.assertAlmostEqual(result["duration"], 240 * 23 / 24000.0)
+        self.assertEqual(sf.info(path).frames, 240 * 23)
+
+    def test_segments_fill_a_pcm_buffer_in_place(self):
+        pcm_path = os.path.join(self.temp_dir.name, "speech.pcm")
+
+        result, events = self._tts(
+            output_pcm={"path": pcm_path, "dtype": "int16", "sample_rate": 16000, "offset": 8}
+        )
+
+        payloads = [payload for _, payload in events]
+        self.assertEqual([p["samples"] for p in payloads], [160 * 7, 160 * 9, 160 * 7])
+        self.assertEqual([p["byte_offset"] for p in payloads], [8, 8 + 320 * 7, 8 + 320 * 16])
+        self.assertEqual(result["output_pcm"]["frames"], 160 * 23)
+        self.assertEqual(os.path.getsize(pcm_path), 8 + 320 * 23)
+        pcm = np.fromfile(pcm_path, dtype="<i2", offset=8)
+        for p in payloads:
+            start = (p["byte_offset"] - 8) // 2 + 20
+            middle = pcm[start : start + p["samples"] - 40]
+            # Only the resampling filter's edges differ from the constant level.
+            np.testing.assert_array_equal(middle, 8192)
+
+    def test_without_stream_the_text_is_one_call(self):
+        path = os.path.join(self.temp_dir.name, "speech.wav")
+
+        result, events = self._tts(output_path=path, stream=False)
+
+        self.assertEqual(self.model.texts, [self.text])
+        self.assertEqual(events, [])
+        self.assertNotIn("segments", result)
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,22 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Text helpers shared by transcription, confidence scoring and synthesis.
+
+Transcript lengths are counted in tokens rather than characters or
+whitespace-separated words so that CJK text, written without spaces, is
+measured on the same scale as alphabetic text.
+"""
+
+import re
+from typing import List
+
+# One token per CJK character, otherwise one per word; leading whitespace
+# stays with its token so tokens join back into the original text.
+_CJK = "぀-ヿ㐀-䶿一-鿿가-힯豈-﫿"
+_TOKEN_RE = re.compile(rf"\s*(?:[{_CJK}]|[^\s{_CJK}]+)")
+
+
+def tokenize(text: str) -> List[str]:
+    return _TOKEN_RE.findall(text)
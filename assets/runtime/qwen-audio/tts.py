@@ -2,16 +2,18 @@
 # -*- coding: utf-8 -*-
 
 import base64
+import io
 import json
 import logging
 import os
 import re
 import sys
-import threading
+import tempfile
 import urllib.error
 import urllib.request
+import wave
 from pathlib import Path
-from typing import Any, Dict, Optional, Tuple
+from typing import Any, Callable, Dict, Optional, Tuple, Union
 
 import soundfile as sf
 
@@ -30,18 +32,28 @@ from config import (
     DEFAULT_VOXTRAL_TTS_VOICE,
     DEFAULT_VOXTRAL_TTS_VOICE_ID,
     IS_DARWIN,
+    TTS_SEGMENT_MAX_TOKENS,
 )
+import metrics
+from audio_io import resample
 from mlx_runtime import ensure_mlx_audio, load_mlx_model_with_modelscope_fallback
+from pcm_transport import PCM_DTYPES, write_pcm
+from quantization import load_dtype, quantize_model, resolve_quantize
+from registry import model_registry
+from sentences import split_sentences
 
-# ---------- MLX TTS model management ----------
-_mlx_tts_model = None
-_mlx_tts_model_key: Optional[str] = None
-_mlx_tts_model_lock = threading.Lock()
+# Loaded TTS models live in the shared registry (registry.py), so switching
+# between Base, CustomVoice and VoiceDesign variants does not reload them.
+TTS_MODEL_KIND = "tts"
+
+# Where synthesized audio goes: a file path, or a host PCM buffer descriptor
+# (see pcm_transport.py) so short clips never touch the disk.
+AudioTarget = Union[str, Dict[str, Any], "_Captured"]
+
+# (event, payload) callback for progress events, as in stt.py.
+EventEmitter = Callable[[str, Dict[str, Any]], None]
 
 # ---------- Qwen TTS model management ----------
-_qwen_tts_model = None
-_qwen_tts_model_key: Optional[str] = None
-_qwen_tts_model_lock = threading.Lock()
 _qwen_tts_backend_ready = False
 _Qwen3TTSModel = None
 _qwen_tts_torch = None
@@ -49,9 +61,6 @@ _qwen_tts_torch = None
 # ---------- VoxCPM2 (PyTorch) model management ----------
 # Used on Windows/Linux where the MLX backend is unavailable. Backed by the
 # official `voxcpm` package (https://github.com/OpenBMB/VoxCPM).
-_voxcpm2_torch_model = None
-_voxcpm2_torch_model_key: Optional[str] = None
-_voxcpm2_torch_model_lock = threading.Lock()
 _voxcpm2_torch_backend_ready = False
 _VoxCPM = None
 
@@ -81,12 +90,146 @@ def _get_audio(result: Any) -> Any:
     return result
 
 
+class _Captured:
+    """Output target that keeps the synthesized samples instead of writing them."""
+
+    def __init__(self) -> None:
+        self.samples: Any = None
+        self.sample_rate = 0
+
+
+def _write_audio(output: AudioTarget, audio_np: Any, sample_rate: int) -> Dict[str, Any]:
+    """Write synthesized samples; returns the response fields saying where."""
+    if isinstance(output, _Captured):
+        output.samples, output.sample_rate = audio_np, int(sample_rate)
+        return {}
+    with metrics.stage("write"):
+        if isinstance(output, dict):
+            return {"output_pcm": write_pcm(output, audio_np, sample_rate)}
+        sf.write(output, audio_np, sample_rate)
+    return {"output_path": output}
+
+
+class SegmentWriter:
+    """Append synthesized segments to ``output`` as they are ready.
+
+    A ``.wav`` path is written as 16-bit PCM whose header is patched after
+    every segment, so the file is always a playable WAV of the audio so far;
+    other extensions go through soundfile. A PCM buffer (see
+    pcm_transport.py) is filled segment after segment. :meth:`append`
+    reports where each segment landed, in frames of the output rate and, for
+    WAV and PCM, in bytes from the start of the file or buffer.
+    """
+
+    def __init__(self, output: AudioTarget) -> None:
+        self.output = output
+        self.sample_rate = 0
+        self.frames = 0
+        self._wav: Optional[wave.Wave_write] = None
+        self._file: Any = None
+        self._sound_file: Any = None
+        # Byte offset of the first frame and bytes per frame of a PCM buffer.
+        self._pcm_base = 0
+        self._pcm_itemsize = 0
+
+    @property
+    def duration(self) -> float:
+        return self.frames / float(self.sample_rate) if self.sample_rate else 0.0
+
+    def _open(self, sample_rate: int) -> None:
+        import numpy as np  # type: ignore
+
+        output = self.output
+        if isinstance(output, dict):
+            self.sample_rate = int(output.get("sample_rate") or sample_rate)
+            self._pcm_base = int(output.get("offset", 0))
+            dtype = PCM_DTYPES.get(output.get("dtype") or "int16")
+            self._pcm_itemsize = np.dtype(dtype[0]).itemsize if dtype else 2
+            return
+        self.sample_rate = int(sample_rate)
+        if str(output).lower().endswith(".wav"):
+            self._file = open(output, "wb")
+            self._wav = wave.open(self._file, "wb")
+            self._wav.setnchannels(1)
+            self._wav.setsampwidth(2)
+            self._wav.setframerate(self.sample_rate)
+        else:
+            self._sound_file = sf.SoundFile(
+                output, "w", samplerate=self.sample_rate, channels=1
+            )
+
+    def append(self, samples: Any, sample_rate: int) -> Dict[str, Any]:
+        import numpy as np  # type: ignore
+
+        if not self.sample_rate:
+            self._open(int(sample_rate))
+        audio = resample(
+            np.asarray(samples, dtype=np.float32).reshape(-1), int(sample_rate), self.sample_rate
+        )
+        start = self.frames
+        byte_offset: Optional[int] = None
+        byte_count: Optional[int] = None
+        with metrics.stage("write"):
+            if isinstance(self.output, dict):
+                byte_offset = self._pcm_base + start * self._pcm_itemsize
+                written = write_pcm(
+                    {**self.output, "offset": byte_offset},
+                    audio,
+                    self.sample_rate,
+                    truncate=start == 0,
+                )
+                count = int(written["frames"])
+                byte_count = count * self._pcm_itemsize
+            elif self._wav is not None:
+                pcm = np.clip(np.round(audio * 32768.0), -32768, 32767).astype("<i2")
+                data = pcm.tobytes()
+                self._wav.writeframes(data)
+                self._file.flush()
+                count = len(pcm)
+                byte_count = len(data)
+                byte_offset = self._file.tell() - byte_count
+            else:
+                self._sound_file.write(audio)
+                self._sound_file.flush()
+                count = len(audio)
+        self.frames += count
+        return {
+            "sample_rate": self.sample_rate,
+            "sample_offset": start,
+            "samples": count,
+            "start": start / float(self.sample_rate),
+            "duration": count / float(self.sample_rate),
+            "byte_offset": byte_offset,
+            "bytes": byte_count,
+        }
+
+    def close(self) -> Dict[str, Any]:
+        """Finish the output; returns the response fields saying where it went."""
+        if self._wav is not None:
+            self._wav.close()
+            self._file.close()
+        if self._sound_file is not None:
+            self._sound_file.close()
+        if isinstance(self.output, dict):
+            spec = self.output
+            out: Dict[str, Any] = {
+                "dtype": spec.get("dtype") or "int16",
+                "sample_rate": self.sample_rate,
+                "channels": 1,
+                "frames": self.frames,
+                "offset": self._pcm_base,
+            }
+            out["name" if spec.get("name") else "path"] = spec.get("name") or spec["path"]
+            return {"output_pcm": out}
+        return {"output_path": self.output}
+
+
 def _write_generation_result(
     *,
-    output_path: str,
+    output: AudioTarget,
     result: Any,
     model: Any,
-) -> Tuple[int, float]:
+) -> Dict[str, Any]:
     import numpy as np  # type: ignore
 
     sample_rate = _get_sample_rate(result, model)
@@ -94,28 +237,23 @@ def _write_generation_result(
     if audio_np.ndim > 1:
         audio_np = audio_np.reshape(-1)
     duration = float(len(audio_np)) / float(sample_rate) if sample_rate else 0.0
-    sf.write(output_path, audio_np, sample_rate)
-    return sample_rate, duration
+    return {
+        **_write_audio(output, audio_np, sample_rate),
+        "sample_rate": sample_rate,
+        "duration": duration,
+    }
 
 
 def get_mlx_tts_model(model_name: str) -> Any:
-    global _mlx_tts_model, _mlx_tts_model_key
-
     model_name = (model_name or DEFAULT_QWEN_TTS_MODEL).strip()
-    key = model_name
-
-    with _mlx_tts_model_lock:
-        if _mlx_tts_model is not None and _mlx_tts_model_key == key:
-            return _mlx_tts_model
 
+    def _load() -> Any:
         ensure_mlx_audio(require_voxcpm2=_is_voxcpm2_model(model_name))
         from mlx_audio.tts.utils import load_model as load_tts_model  # type: ignore
 
-        _mlx_tts_model = load_mlx_model_with_modelscope_fallback(
-            load_tts_model, model_name
-        )
-        _mlx_tts_model_key = key
-        return _mlx_tts_model
+        return load_mlx_model_with_modelscope_fallback(load_tts_model, model_name)
+
+    return model_registry.get(f"mlx:{model_name}", _load, kind=TTS_MODEL_KIND)
 
 
 def _ensure_qwen_tts_backend() -> Tuple[Any, Any]:
@@ -167,57 +305,55 @@ def get_qwen_tts_model(
     model_name: Optional[str],
     device: Optional[str] = None,
     dtype: Optional[str] = None,
+    quantize: Optional[str] = None,
 ) -> Any:
-    global _qwen_tts_model, _qwen_tts_model_key
-
     torch, Qwen3TTSModel = _ensure_qwen_tts_backend()
     resolved_model_name = (model_name or DEFAULT_QWEN_TTS_MODEL).strip()
     resolved_device = _normalize_tts_device(device or DEFAULT_DEVICE)
     resolved_dtype = (dtype or DEFAULT_DTYPE).strip()
+    quantize_mode = resolve_quantize(quantize, resolved_device)
     key = json.dumps(
         {
             "model": resolved_model_name,
             "device": resolved_device,
             "dtype": resolved_dtype,
+            "quantize": quantize_mode,
         },
         sort_keys=True,
         ensure_ascii=False,
     )
 
-    with _qwen_tts_model_lock:
-        if _qwen_tts_model is not None and _qwen_tts_model_key == key:
-            return _qwen_tts_model
-
-        def _load(name: str) -> Any:
-            load_kwargs: Dict[str, Any] = {
-                "device_map": resolved_device,
-                "dtype": _resolve_torch_dtype(resolved_dtype, torch),
-            }
-            # When loading from a local directory (cache hit or ModelScope
-            # fallback) force offline so transformers never tries to reach
-            # Hugging Face again.
-            if os.path.isdir(name):
-                load_kwargs["local_files_only"] = True
-
-            # Flash attention is optional. If unavailable, retry without it.
-            if resolved_device.startswith("cuda"):
-                load_kwargs["attn_implementation"] = "flash_attention_2"
-            logging.info(
-                f"Loading qwen-tts model from {name} with kwargs {load_kwargs}"
-            )
-            try:
-                return Qwen3TTSModel.from_pretrained(name, **load_kwargs)
-            except Exception:
-                if "attn_implementation" not in load_kwargs:
-                    raise
-                load_kwargs.pop("attn_implementation", None)
-                return Qwen3TTSModel.from_pretrained(name, **load_kwargs)
-
-        _qwen_tts_model = load_mlx_model_with_modelscope_fallback(
-            _load, resolved_model_name
+    def _load(name: str) -> Any:
+        load_kwargs: Dict[str, Any] = {
+            "device_map": resolved_device,
+            "dtype": _resolve_torch_dtype(load_dtype(quantize_mode, resolved_dtype), torch),
+        }
+        # When loading from a local directory (cache hit or ModelScope
+        # fallback) force offline so transformers never tries to reach
+        # Hugging Face again.
+        if os.path.isdir(name):
+            load_kwargs["local_files_only"] = True
+
+        # Flash attention is optional. If unavailable, retry without it.
+        if resolved_device.startswith("cuda"):
+            load_kwargs["attn_implementation"] = "flash_attention_2"
+        logging.info(
+            f"Loading qwen-tts model from {name} with kwargs {load_kwargs}"
         )
-        _qwen_tts_model_key = key
-        return _qwen_tts_model
+        try:
+            model = Qwen3TTSModel.from_pretrained(name, **load_kwargs)
+        except Exception:
+            if "attn_implementation" not in load_kwargs:
+                raise
+            load_kwargs.pop("attn_implementation", None)
+            model = Qwen3TTSModel.from_pretrained(name, **load_kwargs)
+        return quantize_model(model, quantize_mode, torch)
+
+    return model_registry.get(
+        f"transformers:{key}",
+        lambda: load_mlx_model_with_modelscope_fallback(_load, resolved_model_name),
+        kind=TTS_MODEL_KIND,
+    )
 
 
 _QWEN_TTS_VARIANT_DEFAULTS = {
@@ -272,7 +408,7 @@ def _default_qwen_speaker(language: Optional[str]) -> str:
 def _run_mlx_tts(
     text: str,
     language: str,
-    output_path: str,
+    output: AudioTarget,
     model_name: Optional[str] = None,
     voice: Optional[str] = None,
     instruct: Optional[str] = None,
@@ -291,7 +427,7 @@ def _run_mlx_tts(
     if _is_voxcpm2_model(model_name):
         return _run_voxcpm2_tts(
             text=text,
-            output_path=output_path,
+            output=output,
             model_name=model_name,
             instruct=instruct,
             ref_audio=ref_audio,
@@ -355,23 +491,19 @@ def _run_mlx_tts(
     if not results:
         raise RuntimeError("TTS generation failed: no audio output returned")
 
-    sample_rate, duration = _write_generation_result(
-        output_path=output_path,
-        result=results[0],
-        model=model,
-    )
-
     return {
-        "output_path": output_path,
-        "sample_rate": sample_rate,
-        "duration": duration,
+        **_write_generation_result(
+            output=output,
+            result=results[0],
+            model=model,
+        ),
         "model": effective_model,
     }
 
 
 def _run_voxcpm2_tts(
     text: str,
-    output_path: str,
+    output: AudioTarget,
     model_name: Optional[str] = None,
     instruct: Optional[str] = None,
     ref_audio: Optional[str] = None,
@@ -426,15 +558,12 @@ def _run_voxcpm2_tts(
     if not results:
         raise RuntimeError("TTS generation failed: no audio output returned")
 
-    sample_rate, duration = _write_generation_result(
-        output_path=output_path,
-        result=results[0],
-        model=model,
-    )
     return {
-        "output_path": output_path,
-        "sample_rate": sample_rate,
-        "duration": duration,
+        **_write_generation_result(
+            output=output,
+            result=results[0],
+            model=model,
+        ),
         "model": effective_model,
     }
 
@@ -467,8 +596,6 @@ def get_voxcpm2_torch_model(
     model_name: Optional[str],
     device: Optional[str] = None,
 ) -> Any:
-    global _voxcpm2_torch_model, _voxcpm2_torch_model_key
-
     VoxCPM = _ensure_voxcpm2_torch_backend()
     resolved_model_name = (model_name or DEFAULT_VOXCPM2_TTS_MODEL).strip()
     resolved_device = _normalize_tts_device(device or DEFAULT_DEVICE)
@@ -478,34 +605,30 @@ def get_voxcpm2_torch_model(
         ensure_ascii=False,
     )
 
-    with _voxcpm2_torch_model_lock:
-        if _voxcpm2_torch_model is not None and _voxcpm2_torch_model_key == key:
-            return _voxcpm2_torch_model
-
-        def _load(name: str) -> Any:
-            # `name` is a local directory when resolved from cache or downloaded
-            # via the ModelScope fallback; in that case force offline loading so
-            # VoxCPM/huggingface_hub never tries to reach Hugging Face again.
-            is_local_dir = os.path.isdir(name)
-            logging.info(
-                "Loading VoxCPM2 (torch) model from %s on device %s (local=%s)",
-                name,
-                resolved_device,
-                is_local_dir,
-            )
-            load_kwargs: Dict[str, Any] = {
-                "load_denoiser": False,
-                "device": resolved_device,
-            }
-            if is_local_dir:
-                load_kwargs["local_files_only"] = True
-            return VoxCPM.from_pretrained(name, **load_kwargs)
-
-        _voxcpm2_torch_model = load_mlx_model_with_modelscope_fallback(
-            _load, resolved_model_name
+    def _load(name: str) -> Any:
+        # `name` is a local directory when resolved from cache or downloaded
+        # via the ModelScope fallback; in that case force offline loading so
+        # VoxCPM/huggingface_hub never tries to reach Hugging Face again.
+        is_local_dir = os.path.isdir(name)
+        logging.info(
+            "Loading VoxCPM2 (torch) model from %s on device %s (local=%s)",
+            name,
+            resolved_device,
+            is_local_dir,
         )
-        _voxcpm2_torch_model_key = key
-        return _voxcpm2_torch_model
+        load_kwargs: Dict[str, Any] = {
+            "load_denoiser": False,
+            "device": resolved_device,
+        }
+        if is_local_dir:
+            load_kwargs["local_files_only"] = True
+        return VoxCPM.from_pretrained(name, **load_kwargs)
+
+    return model_registry.get(
+        f"voxcpm2:{key}",
+        lambda: load_mlx_model_with_modelscope_fallback(_load, resolved_model_name),
+        kind=TTS_MODEL_KIND,
+    )
 
 
 def _apply_voxcpm2_instruct(text: str, instruct: Optional[str]) -> str:
@@ -523,7 +646,7 @@ def _apply_voxcpm2_instruct(text: str, instruct: Optional[str]) -> str:
 
 def _run_voxcpm2_torch_tts(
     text: str,
-    output_path: str,
+    output: AudioTarget,
     model_name: Optional[str] = None,
     instruct: Optional[str] = None,
     ref_audio: Optional[str] = None,
@@ -589,10 +712,8 @@ def _run_voxcpm2_torch_tts(
         audio_np = audio_np.reshape(-1)
     duration = float(len(audio_np)) / float(sample_rate) if sample_rate else 0.0
 
-    sf.write(output_path, audio_np, sample_rate)
-
     return {
-        "output_path": output_path,
+        **_write_audio(output, audio_np, sample_rate),
         "sample_rate": sample_rate,
         "duration": duration,
         "model": effective_model,
@@ -603,15 +724,15 @@ def _run_voxcpm2_torch_tts(
 def _run_qwen_tts(
     text: str,
     language: str,
-    output_path: str,
+    output: AudioTarget,
     model_name: Optional[str] = None,
     voice: Optional[str] = None,
     instruct: Optional[str] = None,
     ref_audio: Optional[str] = None,
     ref_text: Optional[str] = None,
+    quantize: Optional[str] = None,
 ) -> Dict[str, Any]:
     import numpy as np  # type: ignore
-    import soundfile as sf  # type: ignore
 
     lang = language if language else "English"
 
@@ -623,7 +744,7 @@ def _run_qwen_tts(
     logging.info(f"Running qwen-tts with voice {voice}, instruct {instruct}, ref_audio {ref_audio}, ref_text {ref_text}")
     if voice:
         effective_model = _resolve_qwen_tts_repo(model_name, "CustomVoice")
-        model = get_qwen_tts_model(effective_model)
+        model = get_qwen_tts_model(effective_model, quantize=quantize)
         kwargs: Dict[str, Any] = {
             "text": text,
             "language": lang,
@@ -634,7 +755,7 @@ def _run_qwen_tts(
         wavs, sample_rate = model.generate_custom_voice(**kwargs)
     elif instruct:
         effective_model = _resolve_qwen_tts_repo(model_name, "VoiceDesign")
-        model = get_qwen_tts_model(effective_model)
+        model = get_qwen_tts_model(effective_model, quantize=quantize)
         wavs, sample_rate = model.generate_voice_design(
             text=text,
             language=lang,
@@ -644,7 +765,7 @@ def _run_qwen_tts(
         if not ref_audio or not ref_text:
             raise ValueError("ref_audio and ref_text must be provided together")
         effective_model = _resolve_qwen_tts_repo(model_name, "Base")
-        model = get_qwen_tts_model(effective_model)
+        model = get_qwen_tts_model(effective_model, quantize=quantize)
         wavs, sample_rate = model.generate_voice_clone(
             text=text,
             language=lang,
@@ -653,7 +774,7 @@ def _run_qwen_tts(
         )
     else:
         effective_model = _resolve_qwen_tts_repo(model_name, "CustomVoice")
-        model = get_qwen_tts_model(effective_model)
+        model = get_qwen_tts_model(effective_model, quantize=quantize)
         wavs, sample_rate = model.generate_custom_voice(
             text=text,
             language=lang,
@@ -676,10 +797,8 @@ def _run_qwen_tts(
     sample_rate = int(sample_rate) if sample_rate else 24000
     duration = float(len(audio_np)) / float(sample_rate) if sample_rate else 0.0
 
-    sf.write(output_path, audio_np, sample_rate)
-
     return {
-        "output_path": output_path,
+        **_write_audio(output, audio_np, sample_rate),
         "sample_rate": sample_rate,
         "duration": duration,
         "model": effective_model,
@@ -828,7 +947,7 @@ def _audio_file_info(path: str) -> Tuple[int, float]:
 
 def _run_voxtral_tts(
     text: str,
-    output_path: str,
+    output: AudioTarget,
     backend: str,
     model_name: Optional[str] = None,
     voice: Optional[str] = None,
@@ -845,7 +964,11 @@ def _run_voxtral_tts(
         if backend == "voxtral-vllm"
         else DEFAULT_VOXTRAL_TTS_MODEL
     )
-    effective_format = response_format or _response_format_from_path(output_path)
+    if not isinstance(output, str):
+        # PCM buffers are filled from decoded samples, so ask for plain WAV.
+        effective_format = "wav"
+    else:
+        effective_format = response_format or _response_format_from_path(output)
     effective_base_url = base_url or (
         DEFAULT_VOXTRAL_TTS_VLLM_BASE_URL
         if backend == "voxtral-vllm"
@@ -866,12 +989,20 @@ def _run_voxtral_tts(
         api_key=api_key or os.environ.get("VOXTRAL_TTS_API_KEY"),
     )
 
-    with open(output_path, "wb") as dst:
-        dst.write(audio_bytes)
-
-    sample_rate, duration = _audio_file_info(output_path)
+    if not isinstance(output, str):
+        with metrics.stage("decode"):
+            audio_np, sample_rate = sf.read(io.BytesIO(audio_bytes), dtype="float32")
+        if audio_np.ndim > 1:
+            audio_np = audio_np.mean(axis=1)
+        written = _write_audio(output, audio_np, sample_rate)
+        duration = len(audio_np) / float(sample_rate) if sample_rate else 0.0
+    else:
+        with metrics.stage("write"), open(output, "wb") as dst:
+            dst.write(audio_bytes)
+        written = {"output_path": output}
+        sample_rate, duration = _audio_file_info(output)
     return {
-        "output_path": output_path,
+        **written,
         "sample_rate": sample_rate,
         "duration": duration,
         "model": effective_model,
@@ -879,22 +1010,23 @@ def _run_voxtral_tts(
     }
 
 
-def method_tts(params: Dict[str, Any]) -> Dict[str, Any]:
+def method_tts(params: Dict[str, Any], emit: Optional[EventEmitter] = None) -> Dict[str, Any]:
+    """Synthesize ``params.text`` into ``output_path`` or ``output_pcm``.
+
+    With ``params.stream`` (and an ``emit`` callback) the text is split into
+    sentences that are synthesized in order and appended to the output one
+    by one; a ``segment`` event after each says where its audio landed, so
+    playback can start after the first sentence.
+    """
     text = params.get("text")
     if not text:
         raise ValueError("params.text is required for TTS")
 
-    output_path = params.get("output_path")
-    if not output_path:
-        raise ValueError("params.output_path is required for TTS")
+    output: Optional[AudioTarget] = params.get("output_pcm") or params.get("output_path")
+    if not output:
+        raise ValueError("params.output_path or params.output_pcm is required for TTS")
 
-    language = params.get("language", "English")
-    model_name = params.get("model")
-    voice = params.get("voice")
-    instruct = params.get("instruct")
     ref_audio = params.get("ref_audio")
-    ref_text = params.get("ref_text")
-    prompt_text = params.get("prompt_text")
     prompt_audio = params.get("prompt_audio")
     backend = resolve_tts_backend(params)
 
@@ -903,10 +1035,63 @@ def method_tts(params: Dict[str, Any]) -> Dict[str, Any]:
     if prompt_audio and not os.path.exists(prompt_audio):
         raise FileNotFoundError(f"prompt audio not found: {prompt_audio}")
 
+    # Model loads and file writes inside are reported as their own stages.
+    with metrics.stage("synth"):
+        if bool(params.get("stream")) and emit is not None:
+            return _synthesize_segments(params, backend, text, output, emit)
+        return _synthesize(params, backend, text, output)
+
+
+def _synthesize_segments(
+    params: Dict[str, Any],
+    backend: str,
+    text: str,
+    output: AudioTarget,
+    emit: EventEmitter,
+) -> Dict[str, Any]:
+    max_tokens = int(params.get("segment_max_tokens") or TTS_SEGMENT_MAX_TOKENS)
+    segments = split_sentences(text, max_tokens=max_tokens)
+    if not segments:
+        raise ValueError("params.text has nothing to synthesize")
+
+    writer = SegmentWriter(output)
+    result: Dict[str, Any] = {}
+    try:
+        for index, segment in enumerate(segments):
+            captured = _Captured()
+            result = _synthesize(params, backend, segment, captured)
+            if captured.samples is None:
+                raise RuntimeError("TTS generation failed: no audio output returned")
+            placed = writer.append(captured.samples, captured.sample_rate)
+            emit("segment", {"index": index, "count": len(segments), "text": segment, **placed})
+    finally:
+        written = writer.close()
+    return {
+        **result,
+        **written,
+        "sample_rate": writer.sample_rate,
+        "duration": writer.duration,
+        "segments": len(segments),
+    }
+
+
+def _synthesize(
+    params: Dict[str, Any], backend: str, text: str, output: AudioTarget
+) -> Dict[str, Any]:
+    """Run ``backend`` once on ``text``, writing the audio to ``output``."""
+    language = params.get("language", "English")
+    model_name = params.get("model")
+    voice = params.get("voice")
+    instruct = params.get("instruct")
+    ref_audio = params.get("ref_audio")
+    ref_text = params.get("ref_text")
+    prompt_text = params.get("prompt_text")
+    prompt_audio = params.get("prompt_audio")
+
     if backend in {"voxtral-api", "voxtral-vllm"}:
         return _run_voxtral_tts(
             text=text,
-            output_path=output_path,
+            output=output,
             backend=backend,
             model_name=model_name,
             voice=voice,
@@ -919,7 +1104,7 @@ def method_tts(params: Dict[str, Any]) -> Dict[str, Any]:
     if backend == "voxcpm2":
         return _run_voxcpm2_torch_tts(
             text=text,
-            output_path=output_path,
+            output=output,
             model_name=model_name,
             instruct=instruct,
             ref_audio=ref_audio,
@@ -935,7 +1120,7 @@ def method_tts(params: Dict[str, Any]) -> Dict[str, Any]:
         return _run_mlx_tts(
             text=text,
             language=language,
-            output_path=output_path,
+            output=output,
             model_name=model_name,
             voice=voice,
             instruct=instruct,
@@ -953,27 +1138,95 @@ def method_tts(params: Dict[str, Any]) -> Dict[str, Any]:
     return _run_qwen_tts(
         text=text,
         language=language,
-        output_path=output_path,
+        output=output,
         model_name=model_name,
         voice=voice,
         instruct=instruct,
         ref_audio=ref_audio,
         ref_text=ref_text,
+        quantize=params.get("quantize"),
     )
 
 
+def _qwen_tts_variant(params: Dict[str, Any], *, mlx: bool) -> str:
+    """The Qwen3-TTS variant ``method_tts`` would route ``params`` to."""
+    variant = params.get("variant")
+    if variant:
+        if variant not in _QWEN_TTS_VARIANT_DEFAULTS:
+            raise ValueError(f"unsupported TTS variant: {variant}")
+        return variant
+    if params.get("voice"):
+        return "CustomVoice"
+    if params.get("instruct"):
+        return "VoiceDesign"
+    # Without mode params MLX uses the Base model and qwen-tts a default speaker.
+    if mlx or params.get("ref_audio") or params.get("ref_text"):
+        return "Base"
+    return "CustomVoice"
+
+
+def preload_tts_model(params: Dict[str, Any]) -> Dict[str, Any]:
+    """Load the model a ``tts`` request with ``params`` would use.
+
+    ``params.variant`` (Base/CustomVoice/VoiceDesign) selects a Qwen3-TTS
+    variant explicitly; otherwise it is derived like in ``method_tts``.
+    """
+    backend = resolve_tts_backend(params)
+    model_name = params.get("model")
+    if backend in {"voxtral-api", "voxtral-vllm"}:
+        # Served remotely; nothing to load.
+        return {"backend": backend, "model": model_name, "remote": True}
+
+    if backend == "voxcpm2":
+        effective_model = model_name or DEFAULT_VOXCPM2_TTS_MODEL
+        get_voxcpm2_torch_model(effective_model, params.get("device"))
+    elif backend == "mlx-audio":
+        if _is_voxcpm2_model(model_name):
+            effective_model = model_name
+        else:
+            effective_model = _resolve_qwen_tts_repo(
+                model_name, _qwen_tts_variant(params, mlx=True), mlx=True
+            )
+        get_mlx_tts_model(effective_model)
+    else:
+        effective_model = _resolve_qwen_tts_repo(
+            model_name, _qwen_tts_variant(params, mlx=False)
+        )
+        get_qwen_tts_model(effective_model, quantize=params.get("quantize"))
+    return {"backend": backend, "model": effective_model}
+
+
+_WARMUP_TEXT = {"chinese": "你好。", "zh": "你好。"}
+
+
+def warmup_tts(params: Dict[str, Any]) -> Dict[str, Any]:
+    """Synthesize a short phrase so kernels are compiled before real use."""
+    if resolve_tts_backend(params) in {"voxtral-api", "voxtral-vllm"}:
+        return preload_tts_model(params)
+
+    language = params.get("language", "English")
+    fd, output_path = tempfile.mkstemp(prefix="tts_warmup_", suffix=".wav")
+    os.close(fd)
+    try:
+        result = method_tts(
+            {
+                **params,
+                "text": _WARMUP_TEXT.get(str(language).lower(), "Hello."),
+                "language": language,
+                "output_path": output_path,
+            }
+        )
+    finally:
+        if os.path.exists(output_path):
+            os.remove(output_path)
+    return {"backend": resolve_tts_backend(params), "model": result.get("model")}
+
+
 def get_tts_status() -> Dict[str, Any]:
+    tts_keys = model_registry.keys(TTS_MODEL_KIND)
     return {
-        "tts_loaded": (
-            (_mlx_tts_model is not None)
-            or (_qwen_tts_model is not None)
-            or (_voxcpm2_torch_model is not None)
-        ),
-        "tts_model_key": (
-            _mlx_tts_model_key
-            if _mlx_tts_model_key is not None
-            else (_qwen_tts_model_key or _voxcpm2_torch_model_key)
-        ),
+        "tts_loaded": bool(tts_keys),
+        "tts_model_key": tts_keys[0] if tts_keys else None,
         "default_tts_model": DEFAULT_QWEN_TTS_MODEL,
         "default_tts_voicedesign_model": DEFAULT_QWEN_TTS_VOICEDESIGN_MODEL,
         "default_voxcpm2_tts_model": DEFAULT_VOXCPM2_TTS_MODEL,
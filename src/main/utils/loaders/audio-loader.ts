@@ -14,6 +14,8 @@ export type AudioLoaderOptions = {
   backend?: 'transformers' | 'mlx-audio';
   device?: string;
   dtype?: string;
+  // Load-time weight quantization for CPU transformers models.
+  quantize?: 'int8-dynamic' | 'none';
   language?: string | null;
   returnTimeStamps?: boolean;
   outputType?: 'asr' | 'txt';
@@ -28,6 +30,12 @@ export type TTSOptions = {
   ref_text?: string;
   model?: string;
   outputPath: string;
+  /**
+   * Synthesize sentence by sentence; called as each one has been appended to
+   * `outputPath` with its `sample_offset`/`samples` and (for WAV)
+   * `byte_offset`/`bytes`, so playback can start before the whole text is done.
+   */
+  onSegment?: (segment: any) => void;
 };
 
 interface PythonClientOptions {
@@ -40,6 +48,7 @@ interface PythonClientOptions {
 interface PendingRequest {
   resolve: (value: any) => void;
   reject: (reason: Error) => void;
+  onEvent?: (event: any) => void;
   timer?: ReturnType<typeof setTimeout>;
 }
 
@@ -70,6 +79,13 @@ function createPythonClient({ command, args, cwd, env }: PythonClientOptions) {
       }
 
       const id = msg.id;
+      if (msg.event) {
+        // Progress events (e.g. "partial") precede the final ok/error message.
+        if (id && pending.has(id)) {
+          pending.get(id)!.onEvent?.(msg);
+        }
+        return;
+      }
       if (id && pending.has(id)) {
         const { resolve, reject, timer } = pending.get(id)!;
         timer && clearTimeout(timer);
@@ -97,7 +113,7 @@ function createPythonClient({ command, args, cwd, env }: PythonClientOptions) {
   function call(
     method: string,
     params: Record<string, any>,
-
+    onEvent?: (event: any) => void,
   ): Promise<any> {
     start();
     const id = randomUUID();
@@ -109,7 +125,7 @@ function createPythonClient({ command, args, cwd, env }: PythonClientOptions) {
       //   reject(new Error(`timeout: ${method}`));
       // }, timeoutMs);
 
-      pending.set(id, { resolve, reject, timer: undefined });
+      pending.set(id, { resolve, reject, onEvent, timer: undefined });
       proc!.stdin!.write(JSON.stringify(payload) + '\n');
     });
   }
@@ -140,7 +156,11 @@ async function syncQwenAudioRuntime(sourceDir: string, targetDir: string) {
 
   await Promise.all(
     entries.map(async (entry) => {
-      if (entry.name === '__pycache__' || entry.name === 'tests') {
+      if (
+        entry.name === '__pycache__' ||
+        entry.name === 'tests' ||
+        entry.name === '.cache'
+      ) {
         return;
       }
 
@@ -290,6 +310,43 @@ export type QwenAudioService = {
       ext?: string;
     },
   ) => Promise<{ text: string; result: any }>;
+  /**
+   * Transcribe raw PCM without encoding it to an audio file first. The
+   * samples are handed over through a memory-backed temp file.
+   */
+  transcribePcm: (
+    pcm: Buffer,
+    options: AudioLoaderOptions & {
+      sampleRate: number;
+      channels?: number;
+      sampleFormat?: 'int16' | 'float32';
+    },
+  ) => Promise<{ text: string; result: any }>;
+  /**
+   * Transcribe many local files in one request. The runtime batches them by
+   * duration; `result.results` holds one entry per path, in input order.
+   */
+  transcribeBatch: (
+    audioPaths: string[],
+    options?: AudioLoaderOptions,
+  ) => Promise<any>;
+  /**
+   * Live transcription: open a session, push 16-bit PCM as it is captured and
+   * close it for the full transcript. `onEvent` receives the `partial`
+   * (stable/unstable text) and `final` (finished segment) events of a push.
+   */
+  streamOpen: (
+    options?: AudioLoaderOptions & { sampleRate?: number; channels?: number },
+  ) => Promise<{ session_id: string; [key: string]: any }>;
+  streamPush: (
+    sessionId: string,
+    pcm: Buffer,
+    onEvent?: (event: any) => void,
+  ) => Promise<any>;
+  streamClose: (
+    sessionId: string,
+    onEvent?: (event: any) => void,
+  ) => Promise<{ text: string; segments: any[]; [key: string]: any }>;
   synthesize: (options: TTSOptions) => Promise<{
     outputPath: string;
     sampleRate: number;
@@ -297,6 +354,16 @@ export type QwenAudioService = {
     model: string;
   }>;
   ping: () => Promise<any>;
+  /**
+   * Start loading (or warming up) models in the background. Resolves with the
+   * job snapshot right away; poll `jobStatus` with its `job_id`.
+   */
+  preload: (
+    models: Array<{ type: 'stt' | 'tts'; [key: string]: any }>,
+    options?: { warmup?: boolean },
+  ) => Promise<any>;
+  jobStatus: (jobId: string) => Promise<any>;
+  unload: (options?: { keys?: string[]; type?: string }) => Promise<any>;
 };
 
 export async function getQwenAsrPythonService(): Promise<QwenAudioService> {
@@ -327,6 +394,8 @@ export async function getQwenAsrPythonService(): Promise<QwenAudioService> {
     const runtimeDir = path.dirname(runtimeFile);
     const tempDir = path.join(runtimeDir, 'tmp');
     await fs.promises.mkdir(tempDir, { recursive: true });
+    // PCM handoff files live in RAM where the platform offers a tmpfs.
+    const pcmDir = fs.existsSync('/dev/shm') ? '/dev/shm' : tempDir;
 
     const uvBin = uvRuntime.path;
     const isWindows = process.platform === 'win32';
@@ -379,6 +448,7 @@ export async function getQwenAsrPythonService(): Promise<QwenAudioService> {
               process.platform === 'darwin' ? 'mlx-audio' : options.backend,
             device: options.device,
             dtype: options.dtype,
+            quantize: options.quantize,
             language: options.language ?? null,
             return_time_stamps: true,
             output_type: options.outputType ?? 'txt',
@@ -403,6 +473,88 @@ export async function getQwenAsrPythonService(): Promise<QwenAudioService> {
           }
         }
       },
+      transcribePcm: async (pcm, options) => {
+        const pcmPath = path.join(pcmDir, `qwen-audio-${randomUUID()}.pcm`);
+        await fs.promises.writeFile(pcmPath, pcm);
+        try {
+          const response = await pythonClient!.call('predict', {
+            audio_pcm: {
+              path: pcmPath,
+              dtype: options.sampleFormat ?? 'int16',
+              sample_rate: options.sampleRate,
+              channels: options.channels ?? 1,
+            },
+            model: options.model,
+            backend:
+              process.platform === 'darwin' ? 'mlx-audio' : options.backend,
+            device: options.device,
+            dtype: options.dtype,
+            quantize: options.quantize,
+            language: options.language ?? null,
+            return_time_stamps: true,
+          });
+          const result = response.result || {};
+          return { text: result.text || '', result };
+        } finally {
+          await fs.promises.rm(pcmPath, { force: true });
+        }
+      },
+      transcribeBatch: async (
+        audioPaths: string[],
+        options: AudioLoaderOptions = {},
+      ) => {
+        const response = await pythonClient!.call('predict_batch', {
+          inputs: audioPaths,
+          model: options.model,
+          backend:
+            process.platform === 'darwin' ? 'mlx-audio' : options.backend,
+          device: options.device,
+          dtype: options.dtype,
+          quantize: options.quantize,
+          language: options.language ?? null,
+          return_time_stamps: true,
+        });
+        return response.result;
+      },
+      streamOpen: async (
+        options: AudioLoaderOptions & { sampleRate?: number; channels?: number } = {},
+      ) => {
+        const response = await pythonClient!.call('stream_open', {
+          model: options.model,
+          backend:
+            process.platform === 'darwin' ? 'mlx-audio' : options.backend,
+          device: options.device,
+          dtype: options.dtype,
+          quantize: options.quantize,
+          language: options.language ?? null,
+          sample_rate: options.sampleRate ?? 16000,
+          channels: options.channels ?? 1,
+        });
+        return response.result;
+      },
+      streamPush: async (
+        sessionId: string,
+        pcm: Buffer,
+        onEvent?: (event: any) => void,
+      ) => {
+        const response = await pythonClient!.call(
+          'stream_push',
+          { session_id: sessionId, pcm: pcm.toString('base64'), dtype: 'int16' },
+          onEvent,
+        );
+        return response.result;
+      },
+      streamClose: async (
+        sessionId: string,
+        onEvent?: (event: any) => void,
+      ) => {
+        const response = await pythonClient!.call(
+          'stream_close',
+          { session_id: sessionId },
+          onEvent,
+        );
+        return response.result;
+      },
       synthesize: async (
         options: TTSOptions,
       ): Promise<{
@@ -411,16 +563,24 @@ export async function getQwenAsrPythonService(): Promise<QwenAudioService> {
         duration: number;
         model: string;
       }> => {
-        const response = await pythonClient!.call('tts', {
-          text: options.text.replaceAll('\r\n', '\n').replaceAll('\n', ''),
-          language: options.language ?? 'English',
-          voice: options.voice ?? undefined,
-          instruct: options.instruct ?? undefined,
-          ref_audio: options.ref_audio ?? undefined,
-          ref_text: options.ref_text ?? undefined,
-          model: options.model ?? undefined,
-          output_path: options.outputPath,
-        });
+        const onSegment = options.onSegment;
+        const response = await pythonClient!.call(
+          'tts',
+          {
+            text: options.text.replaceAll('\r\n', '\n').replaceAll('\n', ''),
+            language: options.language ?? 'English',
+            voice: options.voice ?? undefined,
+            instruct: options.instruct ?? undefined,
+            ref_audio: options.ref_audio ?? undefined,
+            ref_text: options.ref_text ?? undefined,
+            model: options.model ?? undefined,
+            output_path: options.outputPath,
+            stream: onSegment ? true : undefined,
+          },
+          onSegment
+            ? (event) => event.event === 'segment' && onSegment(event)
+            : undefined,
+        );
 
         const result = response.result || {};
         return {
@@ -434,6 +594,23 @@ export async function getQwenAsrPythonService(): Promise<QwenAudioService> {
         const response = await pythonClient!.call('ping', {});
         return response.result;
       },
+      preload: async (models, options = {}) => {
+        const response = await pythonClient!.call(
+          options.warmup ? 'warmup' : 'load',
+          { models },
+        );
+        return response.result;
+      },
+      jobStatus: async (jobId: string) => {
+        const response = await pythonClient!.call('job_status', {
+          job_id: jobId,
+        });
+        return response.result;
+      },
+      unload: async (options = {}) => {
+        const response = await pythonClient!.call('unload', options);
+        return response.result;
+      },
     };
   })();
 